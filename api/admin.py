@@ -3,10 +3,22 @@ from django.contrib import admin
 
 # Register your models here.
 from api.models import Modality, Level, CurricularArea, PrelationOrder, Prelation, PrelationRequirement 
+from api.functions.prelation_tree import export_prelation_tree
 
 admin.site.register(Modality)
 admin.site.register(Level)
 admin.site.register(CurricularArea)
 admin.site.register(PrelationOrder)
-admin.site.register(Prelation)
+
+
+@admin.register(Prelation)
+class PrelationAdmin(admin.ModelAdmin):
+    actions = ['export_tree']
+
+    @admin.action(description='Exportar árbol de prelaciones (todas las activas) a archivos estáticos')
+    def export_tree(self, request, queryset):
+        snapshot = export_prelation_tree()
+        self.message_user(request, f'Árbol exportado: {len(snapshot["modalities"])} modalidades')
+
+
 admin.site.register(PrelationRequirement)
@@ -0,0 +1,64 @@
+"""
+Enrutamiento de lecturas a una réplica opcional (DATABASE_REPLICA_URL).
+
+``ReplicaRoutingMiddleware`` decide por petición a qué base de datos van las
+lecturas: las peticiones de solo lectura (GET, HEAD, OPTIONS) usan la réplica,
+salvo que el mismo cliente haya escrito hace menos de
+READ_REPLICA_STICKY_SECONDS (lectura de sus propias escrituras). Fuera de una
+petición (comandos, hilos de reportes) se lee del primario, salvo que se use
+``use_replica()`` explícitamente. Las escrituras siempre van al primario.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+REPLICA_DB_ALIAS = 'replica'
+
+read_database = ContextVar('read_database', default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_database(alias):
+    token = read_database.set(alias)
+    try:
+        yield
+    finally:
+        read_database.reset(token)
+
+
+def use_primary():
+    """Lecturas que no toleran el retraso de la réplica (p. ej. el motor de adjudicación)."""
+    return use_database(DEFAULT_DB_ALIAS)
+
+
+def use_replica():
+    return use_database(REPLICA_DB_ALIAS if replica_configured() else DEFAULT_DB_ALIAS)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = read_database.get()
+        if alias == DEFAULT_DB_ALIAS or not replica_configured():
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Relaciones de un objeto: misma base de la que se cargó
+            return instance._state.db
+        return REPLICA_DB_ALIAS if alias == REPLICA_DB_ALIAS else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica contiene los mismos datos que el primario
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
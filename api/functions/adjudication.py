@@ -0,0 +1,340 @@
+"""
+Motor de adjudicación de vacantes para ConvocatoriaAdjudicacion.
+
+Los postulantes se atienden por orden de prelación y, dentro de cada prelación,
+por puesto en el cuadro de mérito. Las vacantes disponibles se cargan una sola
+vez en memoria, agrupadas por (modalidad, nivel, área curricular) en heaps, de
+modo que cada adjudicación cuesta O(log n) sin volver a consultar la tabla de
+vacantes.
+
+- ``run_adjudication`` adjudica automáticamente a todos los pendientes y guarda
+  el resultado con bulk_create/bulk_update en una sola transacción.
+- ``AdjudicationSession`` mantiene el estado de una sesión en vivo por proceso;
+  cada elección se persiste individualmente y la sesión se recarga solo si otro
+  worker modificó las adjudicaciones de la convocatoria.
+
+Todas las operaciones que escriben bloquean la fila de la convocatoria
+(select_for_update), así que las sesiones de distintos workers y la
+adjudicación automática se ejecutan una a la vez. Si aun así la vacante ya fue
+adjudicada (p. ej. en otra convocatoria de la fase), la restricción única lo
+detecta y se responde 409 con la sesión recargada.
+
+Cada cambio confirmado se publica en el canal de eventos de la convocatoria y de
+su fase (ver ``api.functions.events``).
+"""
+import heapq
+from collections import defaultdict, deque
+from threading import Lock
+
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+
+from api.models import Adjudication, AdjudicationCandidate, ConvocatoriaAdjudicacion, Vacancy
+from api.db_router import use_primary
+from api.functions.events import publish_adjudication_change
+
+
+class AdjudicationError(Exception):
+    """Error de negocio de la adjudicación; ``status`` es el código HTTP a responder."""
+    status = 400
+
+
+class AdjudicationConflict(AdjudicationError):
+    """Otro proceso modificó las adjudicaciones al mismo tiempo (409)."""
+    status = 409
+
+
+def bucket_keys(modality_id, level_id, curricular_area_id):
+    """Grupos de vacantes elegibles para un perfil: su área y las vacantes sin área."""
+    return [(modality_id, level_id, curricular_area_id), (modality_id, level_id, None)]
+
+
+class VacancyPool:
+    """
+    Vacantes disponibles agrupadas por (modalidad, nivel, área).
+    Cada grupo es un heap ordenado por código Nexus; las vacantes tomadas se
+    descartan de forma perezosa al llegar a la cima del heap.
+    """
+
+    def __init__(self, rows):
+        self.buckets = defaultdict(list)
+        self.vacancies = {}
+        self.available = set()
+        for vacancy_id, nexus_code, modality_id, level_id, area_id in rows:
+            key = (modality_id, level_id, area_id)
+            self.vacancies[vacancy_id] = (nexus_code, key)
+            self.buckets[key].append((nexus_code, vacancy_id))
+            self.available.add(vacancy_id)
+        for heap in self.buckets.values():
+            heapq.heapify(heap)
+        self.by_nexus = {nexus_code: vacancy_id for vacancy_id, (nexus_code, _) in self.vacancies.items()}
+
+    def _top(self, key):
+        heap = self.buckets.get(key)
+        while heap and heap[0][1] not in self.available:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def is_eligible(self, vacancy_id, keys):
+        return vacancy_id in self.available and self.vacancies[vacancy_id][1] in keys
+
+    def take(self, keys, preferences=()):
+        """Toma la primera preferencia disponible o, si no hay, la primera vacante de los grupos."""
+        for nexus_code in preferences:
+            vacancy_id = self.by_nexus.get(nexus_code)
+            if vacancy_id is not None and self.is_eligible(vacancy_id, keys):
+                self.available.discard(vacancy_id)
+                return vacancy_id
+        tops = [top for top in (self._top(key) for key in keys) if top]
+        if not tops:
+            return None
+        _, vacancy_id = min(tops)
+        self.available.discard(vacancy_id)
+        return vacancy_id
+
+    def take_specific(self, vacancy_id, keys):
+        if not self.is_eligible(vacancy_id, keys):
+            return False
+        self.available.discard(vacancy_id)
+        return True
+
+    def release(self, vacancy_id):
+        if vacancy_id not in self.vacancies or vacancy_id in self.available:
+            return
+        nexus_code, key = self.vacancies[vacancy_id]
+        self.available.add(vacancy_id)
+        heapq.heappush(self.buckets[key], (nexus_code, vacancy_id))
+
+    def available_for(self, keys):
+        # Un heap puede repetir una vacante liberada: se deduplica con un set
+        return sorted({
+            item for key in keys for item in self.buckets.get(key, ())
+            if item[1] in self.available
+        })
+
+
+def load_pool(convocatoria):
+    """Vacantes activas de la fase de la convocatoria que no tienen adjudicación vigente."""
+    if convocatoria.phase_id is None:
+        raise AdjudicationError('La convocatoria no tiene una fase asignada')
+    taken = Adjudication.objects.filter(is_active=True).values('vacancy_id')
+    rows = Vacancy.objects.filter(
+        phase_id=convocatoria.phase_id, is_active=True
+    ).exclude(id__in=taken).values_list('id', 'nexus_code', 'modality_id', 'level_id', 'curricular_area_id')
+    return VacancyPool(rows)
+
+
+def pending_candidates(convocatoria):
+    return list(
+        convocatoria.candidates.filter(status='PENDING').select_related('teacher').order_by(
+            'prelation_order__position', 'prelation_order_id', 'merit_position', 'id'
+        )
+    )
+
+
+def lock_convocatoria(convocatoria_id):
+    """Bloquea la fila de la convocatoria hasta el fin de la transacción."""
+    finalizada = ConvocatoriaAdjudicacion.objects.select_for_update().filter(
+        id=convocatoria_id
+    ).values_list('finalizada', flat=True).first()
+    if finalizada:
+        raise AdjudicationError('La convocatoria ya está finalizada')
+
+
+def candidate_keys(candidate):
+    teacher = candidate.teacher
+    return bucket_keys(teacher.modality_id, teacher.level_id, teacher.curricular_area_id)
+
+
+def run_adjudication(convocatoria_id):
+    """
+    Adjudica automáticamente a todos los postulantes pendientes en orden de
+    prelación y mérito. Devuelve (adjudicados, sin vacante).
+    """
+    try:
+        adjudications, unassigned = _run_adjudication(convocatoria_id)
+    except IntegrityError:
+        # Una vacante se adjudicó en otra convocatoria de la fase mientras tanto
+        raise AdjudicationConflict('Otra adjudicación tomó una de las vacantes; vuelva a ejecutar la adjudicación')
+    finally:
+        forget_session(convocatoria_id)
+    return adjudications, unassigned
+
+
+def _run_adjudication(convocatoria_id):
+    with transaction.atomic():
+        convocatoria = ConvocatoriaAdjudicacion.objects.select_for_update().get(id=convocatoria_id)
+        if convocatoria.finalizada:
+            raise AdjudicationError('La convocatoria ya está finalizada')
+
+        pool = load_pool(convocatoria)
+        now = timezone.now()
+        adjudications = []
+        adjudicated = []
+        unassigned = []
+        for candidate in pending_candidates(convocatoria):
+            vacancy_id = pool.take(candidate_keys(candidate), candidate.preferred_vacancies or ())
+            if vacancy_id is None:
+                unassigned.append(candidate)
+                continue
+            candidate.status = 'ADJUDICATED'
+            candidate.updated_at = now
+            adjudicated.append(candidate)
+            adjudications.append(Adjudication(
+                convocatoria=convocatoria, candidate=candidate, vacancy_id=vacancy_id
+            ))
+
+        Adjudication.objects.bulk_create(adjudications, batch_size=1000)
+        AdjudicationCandidate.objects.bulk_update(adjudicated, ['status', 'updated_at'], batch_size=1000)
+        if adjudications:
+            transaction.on_commit(lambda: publish_adjudication_change(convocatoria))
+    return adjudications, unassigned
+
+
+def adjudication_revision(convocatoria_id):
+    """Sello de adjudicaciones y postulantes de la convocatoria."""
+    adjudications = Adjudication.objects.filter(convocatoria_id=convocatoria_id).aggregate(
+        total=models.Count('id'), last=models.Max('updated_at')
+    )
+    candidates = AdjudicationCandidate.objects.filter(convocatoria_id=convocatoria_id).aggregate(
+        total=models.Count('id'), last=models.Max('updated_at')
+    )
+    return adjudications['total'], adjudications['last'], candidates['total'], candidates['last']
+
+
+class AdjudicationSession:
+    """Estado en memoria de una sesión de adjudicación en vivo."""
+
+    def __init__(self, convocatoria):
+        self.convocatoria = convocatoria
+        self.lock = Lock()
+        self.load()
+
+    def load(self):
+        # El estado de la sesión se lee siempre del primario, nunca de la réplica
+        with use_primary():
+            self.pool = load_pool(self.convocatoria)
+            self.queue = deque(pending_candidates(self.convocatoria))
+            self.revision = adjudication_revision(self.convocatoria.id)
+
+    def sync(self):
+        # Otro worker pudo adjudicar o liberar plazas: recargar solo en ese caso
+        with use_primary():
+            changed = adjudication_revision(self.convocatoria.id) != self.revision
+        if changed:
+            self.load()
+
+    def next_candidate(self):
+        return self.queue[0] if self.queue else None
+
+    def _pop(self, candidate_id):
+        current = self.next_candidate()
+        if current is None or current.id != candidate_id:
+            raise AdjudicationError('Solo se puede atender al siguiente postulante en orden de mérito')
+        return self.queue.popleft()
+
+    def pick(self, candidate_id, vacancy_id=None):
+        """El siguiente postulante elige una vacante (o la primera disponible de su grupo)."""
+        with self.lock:
+            try:
+                with transaction.atomic():
+                    lock_convocatoria(self.convocatoria.id)
+                    self.sync()
+                    candidate = self.next_candidate()
+                    if candidate is None or candidate.id != candidate_id:
+                        raise AdjudicationError('Solo se puede atender al siguiente postulante en orden de mérito')
+                    keys = candidate_keys(candidate)
+                    if vacancy_id is None:
+                        vacancy_id = self.pool.take(keys, candidate.preferred_vacancies or ())
+                        if vacancy_id is None:
+                            raise AdjudicationError('No hay vacantes disponibles para el perfil del postulante')
+                    elif not self.pool.take_specific(vacancy_id, keys):
+                        raise AdjudicationError('La vacante no está disponible para el perfil del postulante')
+
+                    try:
+                        adjudication = Adjudication.objects.create(
+                            convocatoria=self.convocatoria, candidate=candidate, vacancy_id=vacancy_id
+                        )
+                        candidate.status = 'ADJUDICATED'
+                        candidate.save(update_fields=['status', 'updated_at'])
+                    except Exception:
+                        self.pool.release(vacancy_id)
+                        raise
+                    # El sello se toma con la fila aún bloqueada: fuera del bloque
+                    # podría incluir cambios de otro worker que la sesión no cargó
+                    revision = adjudication_revision(self.convocatoria.id)
+                    transaction.on_commit(lambda: publish_adjudication_change(self.convocatoria))
+            except IntegrityError:
+                # La vacante o el postulante ya tienen una adjudicación vigente
+                self.load()
+                raise AdjudicationConflict('La vacante ya fue adjudicada; la sesión se actualizó, vuelva a intentarlo')
+            self._pop(candidate_id)
+            self.revision = revision
+            return adjudication
+
+    def skip(self, candidate_id):
+        """El postulante no se presentó o desistió."""
+        with self.lock:
+            with transaction.atomic():
+                lock_convocatoria(self.convocatoria.id)
+                self.sync()
+                candidate = self.next_candidate()
+                if candidate is None or candidate.id != candidate_id:
+                    raise AdjudicationError('Solo se puede atender al siguiente postulante en orden de mérito')
+                # El estado se vuelve a leer bajo el bloqueo: otra sesión pudo
+                # adjudicar al postulante y no debe quedar como DECLINED
+                status = AdjudicationCandidate.objects.select_for_update().filter(
+                    id=candidate_id
+                ).values_list('status', flat=True).first()
+                if status == 'PENDING':
+                    candidate.status = 'DECLINED'
+                    candidate.save(update_fields=['status', 'updated_at'])
+                    revision = adjudication_revision(self.convocatoria.id)
+            if status != 'PENDING':
+                self.load()
+                raise AdjudicationConflict('El postulante ya fue atendido; la sesión se actualizó, vuelva a intentarlo')
+            self._pop(candidate_id)
+            self.revision = revision
+            return candidate
+
+    def release(self, adjudication_id):
+        """Libera una plaza adjudicada (renuncia); la vacante vuelve a estar disponible."""
+        with self.lock:
+            with transaction.atomic():
+                lock_convocatoria(self.convocatoria.id)
+                self.sync()
+                try:
+                    adjudication = Adjudication.objects.select_related('candidate').get(
+                        id=adjudication_id, convocatoria=self.convocatoria, is_active=True
+                    )
+                except Adjudication.DoesNotExist:
+                    raise AdjudicationError('Adjudicación no encontrada')
+                adjudication.is_active = False
+                adjudication.save(update_fields=['is_active', 'updated_at'])
+                adjudication.candidate.status = 'DECLINED'
+                adjudication.candidate.save(update_fields=['status', 'updated_at'])
+                revision = adjudication_revision(self.convocatoria.id)
+                transaction.on_commit(lambda: publish_adjudication_change(self.convocatoria))
+            self.pool.release(adjudication.vacancy_id)
+            self.revision = revision
+            return adjudication
+
+    def available_vacancy_ids(self, candidate):
+        return [vacancy_id for _, vacancy_id in self.pool.available_for(candidate_keys(candidate))]
+
+
+_sessions = {}
+_sessions_lock = Lock()
+
+
+def get_session(convocatoria):
+    with _sessions_lock:
+        session = _sessions.get(convocatoria.id)
+        if session is None:
+            session = _sessions[convocatoria.id] = AdjudicationSession(convocatoria)
+        return session
+
+
+def forget_session(convocatoria_id):
+    with _sessions_lock:
+        _sessions.pop(convocatoria_id, None)
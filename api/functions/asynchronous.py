@@ -0,0 +1,88 @@
+"""
+Utilidades para las vistas asíncronas (``async def``) servidas bajo ASGI.
+
+Estas vistas no pasan por DRF: la autenticación JWT se resuelve aquí con el
+ORM asíncrono y las respuestas son JsonResponse con el mismo formato de error
+que DRF ({"detail": ...}).
+"""
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import JsonResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, PermissionDenied
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+User = get_user_model()
+
+jwt_authentication = JWTAuthentication()
+
+
+async def authenticate(request, queryset=None):
+    """
+    Usuario del token Bearer de la petición o AnonymousUser si no hay token.
+    Lanza AuthenticationFailed si el token no es válido o el usuario no existe.
+    """
+    header = jwt_authentication.get_header(request)
+    raw_token = jwt_authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return AnonymousUser()
+
+    token = jwt_authentication.get_validated_token(raw_token)
+    try:
+        user_id = token[api_settings.USER_ID_CLAIM]
+    except KeyError:
+        raise InvalidToken(_('Token contained no recognizable user identification'))
+
+    if queryset is None:
+        queryset = User.objects.all()
+    try:
+        user = await queryset.aget(**{api_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        raise AuthenticationFailed(_('User not found'), code='user_not_found')
+    if not user.is_active:
+        raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+    return user
+
+
+def error_response(detail, status, **headers):
+    data = detail if isinstance(detail, dict) else {'detail': detail}
+    response = JsonResponse(data, status=status)
+    for name, value in headers.items():
+        response[name.replace('_', '-')] = value
+    return response
+
+
+def async_api_view(methods=('GET', 'HEAD'), authenticated=False, admin=False, user_queryset=None):
+    """
+    Decorador de vistas asíncronas: valida el método, autentica con JWT y
+    comprueba permisos equivalentes a IsAuthenticated / IsAdminUser.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return error_response(
+                    f'Método "{request.method}" no permitido.', 405, Allow=', '.join(methods)
+                )
+            try:
+                request.user = await authenticate(request, user_queryset)
+            except AuthenticationFailed as error:
+                return error_response(
+                    error.detail, 401, WWW_Authenticate=jwt_authentication.authenticate_header(request)
+                )
+
+            if (authenticated or admin) and not request.user.is_authenticated:
+                return error_response(
+                    str(NotAuthenticated.default_detail), 401,
+                    WWW_Authenticate=jwt_authentication.authenticate_header(request)
+                )
+            if admin and not request.user.is_staff:
+                return error_response(str(PermissionDenied.default_detail), 403)
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
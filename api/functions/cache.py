@@ -0,0 +1,60 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+
+
+def make_cache_key(prefix, *parts):
+    """Construye una clave de caché estable a partir de sus partes."""
+    return f"{prefix}:" + ':'.join(str(part) for part in parts)
+
+
+def make_etag(*parts):
+    """ETag débil derivado de las partes que identifican la representación."""
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/{quote_etag(digest[:20])}'
+
+
+def etag_matches(request, etag):
+    """True si el cliente ya tiene la representación identificada por ``etag``."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    if '*' in etags:
+        return True
+    # Comparación débil: se ignora el prefijo W/
+    target = etag.removeprefix('W/')
+    return any(candidate.removeprefix('W/') == target for candidate in etags)
+
+
+def get_or_compute(key, compute, timeout):
+    """
+    Valor en caché de ``key``; si no está, lo calcula una sola petición a la vez
+    (single-flight). La que obtiene el candado (cache.add) calcula y guarda el
+    valor; las demás esperan hasta CACHE_LOCK_WAIT segundos a que aparezca en
+    vez de repetir la misma consulta. Si el candado se libera sin valor (error)
+    o se agota la espera, cada una lo calcula por su cuenta.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = make_cache_key('lock', key)
+    deadline = time.monotonic() + settings.CACHE_LOCK_WAIT
+    while True:
+        if cache.add(lock_key, 1, settings.CACHE_LOCK_TIMEOUT):
+            try:
+                value = compute()
+                cache.set(key, value, timeout)
+            finally:
+                cache.delete(lock_key)
+            return value
+        if time.monotonic() >= deadline:
+            return compute()
+        time.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
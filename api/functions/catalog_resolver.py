@@ -0,0 +1,80 @@
+"""
+Resolución de valores de catálogo escritos a mano (modalidad, nivel, área).
+
+Las claves se normalizan una sola vez al construir el resolver (sin tildes, en
+minúsculas y con los espacios colapsados), así que "Matematica", "MATEMÁTICA"
+y "Matemática " encuentran la misma fila con una búsqueda en diccionario. Los
+valores que no coinciden reciben sugerencias por similitud ("¿Quiso decir...?").
+
+No importa Django: el resolver se envía a los procesos del pool de importación.
+"""
+import re
+import unicodedata
+from difflib import get_close_matches
+
+
+# Palabras que no cuentan para las siglas ("Educación Básica Regular" -> "ebr")
+ACRONYM_STOPWORDS = {'de', 'del', 'la', 'las', 'los', 'el', 'y', 'e', 'en', 'para', 'con'}
+
+SUGGESTION_CUTOFF = 0.75
+SUGGESTION_LIMIT = 3
+
+
+def normalize(value):
+    """Clave de comparación: sin tildes, casefold y espacios colapsados."""
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.sub(r'\s+', ' ', text).strip().casefold()
+
+
+def acronym(name):
+    words = [word for word in normalize(name).split(' ') if word and word not in ACRONYM_STOPWORDS]
+    return ''.join(word[0] for word in words) if len(words) > 1 else ''
+
+
+class CatalogResolver:
+    """
+    Nombre (o alias) -> id para un catálogo. ``entries`` es una lista de
+    (id, nombre, [alias, ...]); los nombres tienen prioridad sobre los alias y
+    un alias que apunta a dos filas distintas se descarta por ambiguo.
+    """
+
+    def __init__(self, entries):
+        self.keys = {}
+        self.labels = {}
+        aliases = {}
+        for pk, name, entry_aliases in entries:
+            self.keys.setdefault(normalize(name), pk)
+            self.labels[pk] = name
+            for alias in entry_aliases:
+                key = normalize(alias)
+                if key:
+                    aliases.setdefault(key, set()).add(pk)
+        for key, pks in aliases.items():
+            if len(pks) == 1 and key not in self.keys:
+                self.keys[key] = next(iter(pks))
+        self.misses = {}
+
+    def resolve(self, value):
+        """Id de la fila o None."""
+        return self.keys.get(normalize(value))
+
+    def suggest(self, value):
+        """Nombres parecidos a ``value`` (cacheado: los errores suelen repetirse en muchas filas)."""
+        key = normalize(value)
+        if key not in self.misses:
+            matches = get_close_matches(key, self.keys, n=SUGGESTION_LIMIT * 2, cutoff=SUGGESTION_CUTOFF)
+            labels = []
+            for match in matches:
+                label = self.labels[self.keys[match]]
+                if label not in labels:
+                    labels.append(label)
+            self.misses[key] = labels[:SUGGESTION_LIMIT]
+        return self.misses[key]
+
+    def error(self, message, value):
+        """Mensaje de error con la sugerencia, si la hay."""
+        suggestions = self.suggest(value)
+        if suggestions:
+            message += '. ¿Quiso decir ' + ' o '.join(f"'{label}'" for label in suggestions) + '?'
+        return message
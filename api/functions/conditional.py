@@ -0,0 +1,68 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.db_router import use_primary
+from api.functions.cache import etag_matches, get_or_compute, make_cache_key, make_etag
+from api.functions.versions import version_name, versions_of
+
+
+class ConditionalListMixin:
+    """
+    GET condicional para el listado: el ETag débil se deriva de la versión de
+    los modelos de ``version_models`` (y de la ruta, parámetros y formato),
+    sin serializar ni hashear el cuerpo. Si el cliente envía un If-None-Match
+    vigente se responde 304 sin consultar los datos; si no, el cuerpo se lee del
+    primario para que el ETag nuevo nunca acompañe datos de una réplica atrasada.
+    """
+    version_models = ()
+
+    def list_etag(self, request):
+        return make_etag(
+            request.path, request.META.get('QUERY_STRING', ''), request.accepted_renderer.format,
+            *map(version_name, self.version_models), *versions_of(*self.version_models)
+        )
+
+    def list(self, request, *args, **kwargs):
+        etag = self.list_etag(request)
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            with use_primary():
+                response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        # El cliente puede guardar la respuesta pero debe revalidarla siempre
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class CachedListMixin:
+    """
+    Cachea los datos del listado (ya serializados y paginados) por host, ruta,
+    parámetros de consulta y versión de ``version_models``: un cambio en esos
+    modelos invalida todas las páginas sin borrar claves. Solo para listados
+    cuyo contenido no depende del usuario. El recálculo tras expirar es
+    single-flight (ver ``get_or_compute``).
+    """
+    version_models = ()
+
+    def list_cache_key(self, request):
+        params = sorted(
+            (name, value) for name, values in request.query_params.lists() for value in values
+        )
+        return make_cache_key(
+            f'list:{self.basename}', request.get_host(), request.path,
+            urlencode(params), *versions_of(*self.version_models)
+        )
+
+    def list(self, request, *args, **kwargs):
+        def compute():
+            # Del primario: filas de una réplica atrasada quedarían cacheadas con la versión nueva
+            with use_primary():
+                return super(CachedListMixin, self).list(request, *args, **kwargs).data
+
+        data = get_or_compute(self.list_cache_key(request), compute, settings.LIST_CACHE_TIMEOUT)
+        return Response(data)
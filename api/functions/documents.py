@@ -0,0 +1,308 @@
+"""
+Índice y entrega de los documentos obligatorios (ANEXO_*.pdf).
+
+El índice se mantiene en memoria y solo se vuelve a leer el directorio cuando
+cambia su mtime; el hash SHA-256 de cada archivo se calcula una vez por
+(tamaño, mtime) y sirve como ETag. Los archivos se entregan con FileResponse
+(el servidor WSGI puede usar sendfile vía wsgi.file_wrapper), con soporte de
+Range y, opcionalmente, delegando el envío al proxy con X-Accel-Redirect. Bajo
+ASGI se leen en un hilo aparte con ``aiter_file_range``.
+"""
+import asyncio
+import glob
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import zipfile
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+
+from api.functions.cache import etag_matches
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class DocumentEntry:
+    filename: str
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @property
+    def name(self):
+        return os.path.splitext(self.filename)[0].replace('_', ' ')
+
+    @property
+    def etag(self):
+        return f'"{self.sha256[:32]}"'
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentIndex:
+    """Índice en memoria de los PDF de un directorio."""
+
+    def __init__(self, root, extension='.pdf'):
+        self.root = root
+        self.extension = extension
+        self._lock = threading.Lock()
+        self._mtime_ns = None
+        self._entries = {}
+
+    def _build_entry(self, filename, stat):
+        previous = self._entries.get(filename)
+        if previous and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+            return previous
+        path = os.path.join(self.root, filename)
+        return DocumentEntry(filename, path, stat.st_size, stat.st_mtime_ns, file_sha256(path))
+
+    def _refresh(self):
+        try:
+            mtime_ns = os.stat(self.root).st_mtime_ns
+        except FileNotFoundError:
+            self._mtime_ns, self._entries = None, {}
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        entries = {}
+        with os.scandir(self.root) as iterator:
+            for item in iterator:
+                if item.is_file() and item.name.endswith(self.extension):
+                    entries[item.name] = self._build_entry(item.name, item.stat())
+        self._entries = entries
+        self._mtime_ns = mtime_ns
+
+    def _current(self, filename):
+        """
+        Entrada vigente según el stat del archivo. Se verifica en cada consulta
+        para detectar reemplazos en sitio, que no cambian el mtime del directorio.
+        """
+        entry = self._entries[filename]
+        try:
+            stat = os.stat(entry.path)
+        except FileNotFoundError:
+            del self._entries[filename]
+            self._mtime_ns = None
+            return None
+        entry = self._entries[filename] = self._build_entry(filename, stat)
+        return entry
+
+    def entries(self):
+        """Documentos ordenados por nombre de archivo."""
+        with self._lock:
+            self._refresh()
+            entries = [self._current(filename) for filename in sorted(self._entries)]
+            return [entry for entry in entries if entry is not None]
+
+    def get(self, filename):
+        """Entrada de un documento (None si no existe)."""
+        with self._lock:
+            self._refresh()
+            if filename not in self._entries:
+                return None
+            return self._current(filename)
+
+    def fingerprint(self):
+        """Hash del contenido completo del directorio (nombres y hashes de archivos)."""
+        digest = hashlib.sha256()
+        for entry in self.entries():
+            digest.update(f'{entry.filename}:{entry.sha256}\n'.encode('utf-8'))
+        return digest.hexdigest()
+
+
+mandatory_documents = DocumentIndex(settings.MANDATORY_DOCUMENTS_ROOT)
+
+
+def parse_range(header, size):
+    """
+    Devuelve (inicio, fin) inclusivo para un único rango 'bytes=a-b', None si no
+    hay rango utilizable (se responde el archivo completo) o ValueError si el
+    rango no es satisfacible.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # Sufijo: últimos N bytes
+        length = int(end)
+        if length == 0:
+            raise ValueError('Rango vacío')
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError('Rango fuera del archivo')
+    return start, end
+
+
+def iter_file_range(path, start, end):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def aiter_file_range(path, start, end):
+    """Versión asíncrona de iter_file_range: cada lectura se hace en un hilo."""
+    handle = await asyncio.to_thread(open, path, 'rb')
+    try:
+        await asyncio.to_thread(handle.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await asyncio.to_thread(handle.read, min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def serve_document(request, entry, content_type='application/pdf', accel_redirect=None,
+                   disposition='inline', max_age=None, immutable=False, file_iterator=None):
+    """
+    Respuesta de descarga de un documento del índice. Con ``file_iterator``
+    (p. ej. aiter_file_range) el contenido se entrega con ese iterador en lugar
+    de FileResponse.
+    """
+    if accel_redirect is None:
+        accel_redirect = settings.MANDATORY_DOCUMENTS_ACCEL_REDIRECT
+    if etag_matches(request, entry.etag):
+        response = HttpResponse(status=304)
+    elif accel_redirect:
+        # El proxy (nginx) envía el archivo y resuelve los Range
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = accel_redirect.rstrip('/') + '/' + entry.filename
+    else:
+        byte_range = None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if not if_range or if_range == entry.etag:
+            try:
+                byte_range = parse_range(request.META.get('HTTP_RANGE'), entry.size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{entry.size}'
+                return response
+
+        if byte_range is None and file_iterator is None:
+            response = FileResponse(open(entry.path, 'rb'), content_type=content_type)
+        elif byte_range is None:
+            response = StreamingHttpResponse(
+                file_iterator(entry.path, 0, entry.size - 1), content_type=content_type
+            )
+            response['Content-Length'] = str(entry.size)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                (file_iterator or iter_file_range)(entry.path, start, end),
+                status=206,
+                content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{entry.size}'
+            response['Content-Length'] = str(end - start + 1)
+        response['Content-Disposition'] = f'{disposition}; filename={entry.filename}'
+
+    response['ETag'] = entry.etag
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = http_date(entry.mtime_ns / 1e9)
+    if max_age is None:
+        max_age = settings.MANDATORY_DOCUMENTS_MAX_AGE
+    patch_cache_control(response, public=True, max_age=max_age)
+    if immutable:
+        patch_cache_control(response, immutable=True)
+    return response
+
+
+# --- Paquete ZIP de documentos obligatorios ---
+
+BUNDLE_PREFIX = 'documentos_obligatorios'
+# Fecha fija en las entradas del ZIP: mismo contenido -> mismos bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_bundle_lock = threading.Lock()
+
+
+def bundle_sources():
+    """
+    Archivos que forman el paquete: los PDF de mandatory_documents y los
+    archivos subidos en MandatoryDocument, como (nombre en el ZIP, ruta, hash).
+    """
+    from api.models import MandatoryDocument
+
+    sources = {entry.filename: (entry.path, entry.sha256) for entry in mandatory_documents.entries()}
+    for name in MandatoryDocument.objects.exclude(file='').exclude(file__isnull=True).order_by('id').values_list('file', flat=True):
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        arcname = os.path.basename(name)
+        if arcname in sources or not os.path.isfile(path):
+            continue
+        stat = os.stat(path)
+        # Los archivos subidos no cambian en sitio: basta con tamaño y mtime
+        sources[arcname] = (path, f'{stat.st_size}-{stat.st_mtime_ns}')
+    return sorted((arcname, path, digest) for arcname, (path, digest) in sources.items())
+
+
+def bundle_fingerprint(sources):
+    digest = hashlib.sha256()
+    for arcname, _, file_digest in sources:
+        digest.update(f'{arcname}:{file_digest}\n'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def build_bundle(sources, destination):
+    directory = os.path.dirname(destination)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as handle:
+        with zipfile.ZipFile(handle, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for arcname, path, _ in sources:
+                info = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(path, 'rb') as source, archive.open(info, 'w') as target:
+                    for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b''):
+                        target.write(chunk)
+    # Reemplazo atómico: otros workers nunca ven un ZIP a medio escribir
+    os.replace(handle.name, destination)
+
+
+def get_bundle():
+    """
+    Entrada del paquete ZIP vigente. Se genera solo cuando cambia el conjunto de
+    documentos; el nombre del archivo incluye la huella de su contenido.
+    """
+    sources = bundle_sources()
+    fingerprint = bundle_fingerprint(sources)
+    root = settings.MANDATORY_DOCUMENTS_BUNDLE_ROOT
+    filename = f'{BUNDLE_PREFIX}-{fingerprint}.zip'
+    path = os.path.join(root, filename)
+
+    with _bundle_lock:
+        if not os.path.exists(path):
+            os.makedirs(root, exist_ok=True)
+            build_bundle(sources, path)
+            for stale in glob.glob(os.path.join(root, f'{BUNDLE_PREFIX}-*.zip')):
+                if stale != path:
+                    os.remove(stale)
+
+    stat = os.stat(path)
+    return DocumentEntry(filename, path, stat.st_size, stat.st_mtime_ns, fingerprint)
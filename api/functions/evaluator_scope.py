@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from api.db_router import use_primary
+from api.functions.cache import make_cache_key
+
+
+def scope_cache_key(user_id):
+    return make_cache_key('evaluator-scope', user_id)
+
+
+def get_evaluator_scope(profile):
+    """
+    Alcance de un evaluador: ids de modalidades, niveles y áreas curriculares asignadas.
+    
+    El producto cartesiano de las tres listas equivale a filtrar con IN sobre cada
+    columna, así que se guardan las listas (no las combinaciones). Se cachea por
+    evaluador y se invalida desde las señales m2m_changed de EvaluatorProfile.
+    """
+    key = scope_cache_key(profile.pk)
+    scope = cache.get(key)
+    if scope is None:
+        # Del primario: lo que se cachea no debe venir de una réplica atrasada
+        with use_primary():
+            scope = {
+                'modalities': sorted(profile.modalities.values_list('id', flat=True)),
+                'levels': sorted(profile.levels.values_list('id', flat=True)),
+                'curricular_areas': sorted(profile.curricular_areas.values_list('id', flat=True)),
+            }
+        cache.set(key, scope, settings.EVALUATOR_SCOPE_CACHE_TIMEOUT)
+    return scope
+
+
+def invalidate_evaluator_scope(user_id):
+    cache.delete(scope_cache_key(user_id))
+
+
+def scope_is_empty(scope):
+    return not (scope['modalities'] and scope['levels'] and scope['curricular_areas'])
+
+
+def filter_vacancies_by_scope(queryset, scope):
+    """Vacantes dentro del alcance (incluye vacantes sin área curricular)."""
+    if scope_is_empty(scope):
+        return queryset.none()
+    return queryset.filter(
+        modality_id__in=scope['modalities'],
+        level_id__in=scope['levels'],
+    ).filter(
+        Q(curricular_area_id__in=scope['curricular_areas']) |
+        Q(curricular_area__isnull=True)
+    )
+
+
+def filter_teachers_by_scope(queryset, scope):
+    if scope_is_empty(scope):
+        return queryset.none()
+    return queryset.filter(
+        modality_id__in=scope['modalities'],
+        level_id__in=scope['levels'],
+        curricular_area_id__in=scope['curricular_areas'],
+    )
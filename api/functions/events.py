@@ -0,0 +1,220 @@
+"""
+Eventos en vivo (server-sent events) de las adjudicaciones.
+
+La fuente de verdad es la tabla de adjudicaciones: cada conexión consulta los
+cambios posteriores a su cursor (updated_at, id) usando el índice
+(convocatoria, updated_at). updated_at se fija antes del commit, así que una
+transacción que confirma tarde puede dejar filas detrás del cursor: cada sondeo
+vuelve a leer los últimos SSE_OVERLAP_SECONDS y descarta lo ya enviado. Tras
+reconectar con Last-Event-ID pueden repetirse eventos de esa ventana; cada
+evento es el estado actual de la adjudicación, así que repetirlo no cambia nada.
+Dentro de un mismo proceso, ``publish`` despierta de
+inmediato a las conexiones del canal; los cambios hechos en otros workers se
+detectan en el siguiente sondeo (SSE_POLL_INTERVAL).
+
+El stream es un generador asíncrono: bajo ASGI cada conexión espera en el
+event loop (asyncio) sin ocupar un hilo ni un worker. Bajo WSGI (runserver) se
+recorre con un event loop propio por conexión.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.http import StreamingHttpResponse
+
+from api.models import Adjudication
+from api.functions.streaming import is_asgi
+
+
+class Broker:
+    """
+    Publicación/suscripción en proceso: un contador por canal y las esperas
+    asíncronas de cada conexión. ``publish`` se llama desde código síncrono
+    (on_commit) y despierta a cada espera en su propio event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sequences = defaultdict(int)
+        self._waiters = defaultdict(set)
+
+    def publish(self, channel):
+        with self._lock:
+            self._sequences[channel] += 1
+            waiters = list(self._waiters.get(channel, ()))
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # el event loop de esa conexión ya se cerró
+
+    def sequence(self, channel):
+        return self._sequences[channel]
+
+    async def wait(self, channel, sequence, timeout):
+        """Espera hasta que se publique en el canal tras ``sequence`` o venza el tiempo."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            if self._sequences[channel] != sequence:
+                return True
+            self._waiters[channel].add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self._sequences[channel] != sequence
+        finally:
+            with self._lock:
+                self._waiters[channel].discard(waiter)
+                if not self._waiters[channel]:
+                    del self._waiters[channel]
+
+
+broker = Broker()
+
+
+def convocatoria_channel(convocatoria_id):
+    return f'convocatoria:{convocatoria_id}'
+
+
+def phase_channel(phase_id):
+    return f'phase:{phase_id}'
+
+
+def publish_adjudication_change(convocatoria):
+    broker.publish(convocatoria_channel(convocatoria.id))
+    if convocatoria.phase_id:
+        broker.publish(phase_channel(convocatoria.phase_id))
+
+
+def encode_cursor(updated_at, adjudication_id):
+    return f'{updated_at.timestamp():.6f}-{adjudication_id}'
+
+
+def decode_cursor(value):
+    """Cursor enviado como Last-Event-ID; None si no es válido."""
+    try:
+        timestamp, adjudication_id = value.rsplit('-', 1)
+        return datetime.fromtimestamp(float(timestamp), tz=dt_timezone.utc), int(adjudication_id)
+    except (AttributeError, ValueError, OverflowError):
+        return None
+
+
+def format_event(event_id, event, data):
+    return f'id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+EVENT_FIELDS = ('id', 'convocatoria_id', 'candidate_id', 'vacancy_id', 'vacancy__nexus_code', 'is_active', 'updated_at')
+
+
+async def adjudication_events(queryset, channel, last_event_id=None):
+    """
+    Generador SSE con los cambios de estado de las vacantes (taken/released) de
+    las adjudicaciones de ``queryset``. Sin Last-Event-ID empieza desde el último
+    cambio existente: el cliente carga el estado inicial por la API de listados.
+    """
+    overlap = timedelta(seconds=settings.SSE_OVERLAP_SECONDS)
+    # (id, updated_at) ya enviados (o ya existentes al conectar) dentro de la ventana
+    seen = set()
+    cursor = decode_cursor(last_event_id) if last_event_id else None
+    if cursor is None:
+        last = (await queryset.aaggregate(last=Max('updated_at')))['last']
+        cursor = (last or datetime.now(dt_timezone.utc), 0)
+        if last is not None:
+            # Se usa el mayor id en ese instante para no repetir eventos del mismo updated_at
+            last_id = await queryset.filter(updated_at=last).aaggregate(last=Max('id'))
+            cursor = (last, last_id['last'] or 0)
+            window = queryset.filter(updated_at__gt=last - overlap).values_list('id', 'updated_at')
+            seen.update([key async for key in window])
+
+    deadline = time.monotonic() + settings.SSE_MAX_DURATION
+    yield f'retry: {settings.SSE_RETRY_MS}\n\n'
+
+    while time.monotonic() < deadline:
+        sequence = broker.sequence(channel)
+        updated_at, last_id = cursor
+        # Filas confirmadas tarde detrás del cursor: primero solo (id, updated_at)
+        window = queryset.filter(
+            updated_at__gt=updated_at - overlap, updated_at__lte=updated_at
+        ).values_list('id', 'updated_at')
+        late_ids = [change_id async for change_id, changed_at in window if (change_id, changed_at) not in seen]
+        late = []
+        if late_ids:
+            late = [
+                change async for change in
+                queryset.filter(id__in=late_ids).order_by('updated_at', 'id').values(*EVENT_FIELDS)
+            ]
+        changes = queryset.filter(
+            Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=last_id)
+        ).order_by('updated_at', 'id').values(*EVENT_FIELDS)[:settings.SSE_BATCH_SIZE]
+
+        sent = False
+        for change in late + [change async for change in changes]:
+            key = (change['id'], change['updated_at'])
+            if key in seen:
+                continue
+            seen.add(key)
+            cursor = max(cursor, (change['updated_at'], change['id']))
+            sent = True
+            yield format_event(encode_cursor(*cursor), 'vacancy', {
+                'vacancy': change['vacancy_id'],
+                'nexus_code': change['vacancy__nexus_code'],
+                'state': 'taken' if change['is_active'] else 'released',
+                'adjudication': change['id'],
+                'candidate': change['candidate_id'],
+                'convocatoria': change['convocatoria_id'],
+            })
+        limit = cursor[0] - overlap
+        seen = {key for key in seen if key[1] > limit}
+
+        timeout = min(settings.SSE_POLL_INTERVAL, deadline - time.monotonic())
+        if not sent and not await broker.wait(channel, sequence, max(timeout, 0)):
+            # Comentario SSE para mantener viva la conexión a través de proxies
+            yield ': keepalive\n\n'
+
+
+def convocatoria_events(convocatoria, last_event_id=None):
+    queryset = Adjudication.objects.filter(convocatoria_id=convocatoria.id)
+    return adjudication_events(queryset, convocatoria_channel(convocatoria.id), last_event_id)
+
+
+def phase_assignment_events(assignment, last_event_id=None):
+    """Cambios en las vacantes del grupo (modalidad, nivel, área) de una adjudicación de fase."""
+    queryset = Adjudication.objects.filter(
+        vacancy__phase_id=assignment.phase_id,
+        vacancy__modality_id=assignment.modality_id,
+        vacancy__level_id=assignment.level_id,
+    )
+    if assignment.curricular_area_id:
+        queryset = queryset.filter(vacancy__curricular_area_id=assignment.curricular_area_id)
+    return adjudication_events(queryset, phase_channel(assignment.phase_id), last_event_id)
+
+
+def iterate_in_loop(events):
+    """Recorre el generador asíncrono con un event loop propio (peticiones WSGI)."""
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(events.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(events.aclose())
+        loop.close()
+
+
+def event_stream_response(request, events):
+    if not is_asgi(request):
+        # Django acumularía todo el stream asíncrono antes de enviarlo por WSGI
+        events = iterate_in_loop(events)
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Evita que nginx acumule el stream en su buffer
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,197 @@
+"""
+Plantillas Excel de carga masiva.
+
+Cada plantilla se genera una sola vez por versión de catálogos (modalidades,
+niveles, áreas curriculares, órdenes de prelación y roles): los bytes se
+guardan en caché y se sirven con ETag, así que las descargas repetidas no
+vuelven a construir el libro ni consultan los catálogos.
+"""
+import io
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from api.models import Modality, Level, CurricularArea, PrelationOrder, Group, Vacancy
+from api.db_router import use_primary
+from api.functions.cache import make_cache_key, make_etag, etag_matches
+from api.functions.versions import versions_of
+
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CATALOG_SHEET = 'Catalogos'
+# Filas con lista desplegable en cada columna validada
+VALIDATION_ROWS = 5000
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    filename: str
+    sheet: str
+    columns: list
+    example: list
+    # columna -> nombre del catálogo que alimenta su lista desplegable
+    validations: dict = field(default_factory=dict)
+
+
+TEMPLATES = {
+    'vacancies': TemplateSpec(
+        filename='plantilla_vacantes.xlsx',
+        sheet='Vacantes',
+        columns=[
+            'ie_code', 'ie_name', 'modality', 'level', 'nexus_code',
+            'position', 'vacancy_type', 'vacancy_reason', 'curricular_area'
+        ],
+        example=[
+            '0123456', 'I.E. María Auxiliadora', 'EBR', 'Secundaria', 'NEX001',
+            'DOCENTE', 'ORGANICA', 'LICENCIA', 'Matemática'
+        ],
+        validations={
+            'modality': 'modalities',
+            'level': 'levels',
+            'position': 'positions',
+            'vacancy_type': 'vacancy_types',
+            'vacancy_reason': 'vacancy_reasons',
+            'curricular_area': 'curricular_areas',
+        },
+    ),
+    'users': TemplateSpec(
+        filename='plantilla_usuarios.xlsx',
+        sheet='Usuarios',
+        columns=[
+            'username', 'email', 'role',
+            'person_first_name', 'person_paternal_surname', 'person_maternal_surname',
+            'person_dni', 'person_email',
+            'teacher_modality', 'teacher_level', 'teacher_curricular_area'
+        ],
+        example=[
+            'jperez', 'jperez@ugel.gob.pe', 'TEACHER',
+            'Juan', 'Pérez', 'García',
+            '12345678', 'jperez@ugel.gob.pe',
+            'EBR', 'Secundaria', 'Matemática'
+        ],
+        validations={
+            'role': 'roles',
+            'teacher_modality': 'modalities',
+            'teacher_level': 'levels',
+            'teacher_curricular_area': 'curricular_areas',
+        },
+    ),
+    'prelation-requirements': TemplateSpec(
+        filename='plantilla_requisitos_prelacion.xlsx',
+        sheet='Requisitos',
+        columns=['modality', 'curricular_area', 'order', 'text', 'logic_type', 'group'],
+        example=[
+            'EBR', 'Matemática', 'Primera Prelación',
+            'Título de Profesor o Licenciado en Educación en la especialidad', 'AND', 1
+        ],
+        validations={
+            'modality': 'modalities',
+            'curricular_area': 'curricular_areas',
+            'order': 'prelation_orders',
+            'logic_type': 'logic_types',
+        },
+    ),
+}
+
+
+def load_catalogs():
+    """Valores permitidos para las listas desplegables, leídos de las tablas de catálogo."""
+    return {
+        'modalities': [
+            abbreviature or name
+            for abbreviature, name in Modality.objects.filter(is_active=True)
+            .order_by('name').values_list('abbreviature', 'name')
+        ],
+        'levels': list(Level.objects.filter(is_active=True).order_by('name').values_list('name', flat=True)),
+        'curricular_areas': list(
+            CurricularArea.objects.filter(is_active=True).order_by('name').values_list('name', flat=True)
+        ),
+        'prelation_orders': list(PrelationOrder.objects.order_by('position', 'id').values_list('name', flat=True)),
+        'roles': list(Group.objects.order_by('name').values_list('name', flat=True)),
+        'positions': [code for code, _ in Vacancy.POSITION_CHOICES],
+        'vacancy_types': [code for code, _ in Vacancy.VACANCY_TYPE_CHOICES],
+        'vacancy_reasons': [code for code, _ in Vacancy.VACANCY_REASON_CHOICES],
+        'logic_types': ['AND', 'OR'],
+    }
+
+
+def catalog_version():
+    """Versión de los catálogos según el registro de versiones (sin consultar sus tablas)."""
+    return '-'.join(str(version) for version in versions_of(Modality, Level, CurricularArea, PrelationOrder, Group))
+
+
+def build_template(spec, catalogs):
+    """Construye el libro de la plantilla con listas desplegables y devuelve sus bytes."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = spec.sheet
+    sheet.append(spec.columns)
+    sheet.append(spec.example)
+    for index, column in enumerate(spec.columns, start=1):
+        sheet.column_dimensions[get_column_letter(index)].width = max(len(column) + 2, 14)
+
+    # Hoja oculta con los catálogos usados por las validaciones
+    catalog_sheet = workbook.create_sheet(CATALOG_SHEET)
+    catalog_sheet.sheet_state = 'hidden'
+    used_catalogs = sorted(set(spec.validations.values()))
+    ranges = {}
+    for index, name in enumerate(used_catalogs, start=1):
+        values = catalogs[name]
+        letter = get_column_letter(index)
+        catalog_sheet.cell(row=1, column=index, value=name)
+        for row, value in enumerate(values, start=2):
+            catalog_sheet.cell(row=row, column=index, value=value)
+        if values:
+            ranges[name] = f"{CATALOG_SHEET}!${letter}$2:${letter}${len(values) + 1}"
+
+    for column, catalog_name in spec.validations.items():
+        if catalog_name not in ranges:
+            continue
+        letter = get_column_letter(spec.columns.index(column) + 1)
+        validation = DataValidation(type='list', formula1=ranges[catalog_name], allow_blank=True)
+        validation.error = 'Seleccione un valor de la lista'
+        validation.errorTitle = 'Valor no válido'
+        sheet.add_data_validation(validation)
+        validation.add(f'{letter}2:{letter}{VALIDATION_ROWS}')
+
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def get_template(name, version):
+    """
+    Bytes de la plantilla para la versión de catálogos dada. Solo se construye
+    (y se leen los catálogos) si no existe en caché.
+    """
+    key = make_cache_key('excel-template', name, version)
+    content = cache.get(key)
+    if content is None:
+        # Del primario: los catálogos de una réplica atrasada quedarían cacheados con la versión nueva
+        with use_primary():
+            catalogs = load_catalogs()
+        content = build_template(TEMPLATES[name], catalogs)
+        cache.set(key, content, settings.EXCEL_TEMPLATE_CACHE_TIMEOUT)
+    return content
+
+
+def template_response(request, name):
+    """Respuesta de descarga de la plantilla, con soporte de If-None-Match."""
+    spec = TEMPLATES[name]
+    version = catalog_version()
+    etag = make_etag('excel-template', name, version)
+
+    if etag_matches(request, etag):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(get_template(name, version), content_type=XLSX_CONTENT_TYPE)
+        response['Content-Disposition'] = f'attachment; filename={spec.filename}'
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
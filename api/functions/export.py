@@ -0,0 +1,64 @@
+import csv
+import tempfile
+
+from django.conf import settings
+from django.db.models.functions import Coalesce
+from openpyxl import Workbook
+
+from api.models import Vacancy
+
+
+VACANCY_EXPORT_COLUMNS = [
+    'ie_code', 'ie_name', 'modality', 'level', 'nexus_code',
+    'position', 'vacancy_type', 'vacancy_reason', 'curricular_area', 'is_active'
+]
+
+
+def iter_vacancy_rows(phase_id):
+    """
+    Filas de vacantes de una fase con las mismas columnas de la plantilla de carga.
+    
+    Usa values_list + iterator(): en PostgreSQL se lee con un cursor del lado del
+    servidor por bloques, sin instanciar modelos ni cargar toda la fase en memoria.
+    """
+    queryset = Vacancy.objects.filter(phase_id=phase_id).annotate(
+        modality_label=Coalesce('modality__abbreviature', 'modality__name')
+    ).order_by('id').values_list(
+        'educational_institution__code', 'educational_institution__name',
+        'modality_label', 'level__name', 'nexus_code',
+        'position', 'vacancy_type', 'vacancy_reason', 'curricular_area__name', 'is_active'
+    )
+    return queryset.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+class Echo:
+    """Objeto tipo archivo que devuelve lo escrito, para generar CSV en streaming."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, header):
+    writer = csv.writer(Echo())
+    # BOM para que Excel detecte UTF-8 (tildes y ñ)
+    yield '\ufeff' + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(['' if value is None else value for value in row])
+
+
+def write_xlsx(rows, header, sheet_name):
+    """
+    Escribe las filas en un XLSX en modo write-only de openpyxl (las filas se
+    vuelcan a disco a medida que se agregan) y devuelve el archivo temporal
+    posicionado al inicio.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(header)
+    for row in rows:
+        sheet.append(list(row))
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
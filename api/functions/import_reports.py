@@ -0,0 +1,135 @@
+"""
+Reportes de importación de vacantes guardados en la base de datos.
+
+La previsualización, la carga masiva y la importación por hojas guardan cada
+fila (válida o no) con sus errores en ImportReportRow y responden solo con el
+resumen y el id del reporte. Las filas se consultan paginadas y filtradas por
+validez, tipo de error u hoja, o se descargan como Excel anotado con una
+columna de errores, generado en modo write-only.
+"""
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import ImportReport, ImportReportRow, Phase
+from api.functions.export import write_xlsx
+from api.functions.vacancy_sheets import OPTIONAL_COLUMNS, REQUIRED_COLUMNS, clean
+
+
+# Código, descripción y patrón del mensaje (ver vacancy_sheets y vacancy_import);
+# los mensajes que no coinciden son 'other'
+ERROR_TYPES = (
+    ('required', 'Campo obligatorio vacío', re.compile(r"^Campo '.+' vacío")),
+    ('modality', 'Modalidad no encontrada', re.compile(r"^Modalidad '")),
+    ('level', 'Nivel no encontrado', re.compile(r"^Nivel '")),
+    ('curricular_area', 'Área curricular no encontrada', re.compile(r"^Área curricular '")),
+    ('position', 'Cargo no válido', re.compile(r"^Cargo '")),
+    ('vacancy_type', 'Tipo de vacante no válido', re.compile(r"^Tipo de vacante '")),
+    ('vacancy_reason', 'Motivo de vacante no válido', re.compile(r"^Motivo de vacante '")),
+    ('phase', 'Fase faltante o inexistente', re.compile(r"^(No se indicó la fase|La fase |Fase ')")),
+    ('duplicate', 'Código Nexus repetido en el archivo', re.compile(r"^Código Nexus '.*' repetido")),
+    ('registered', 'Código Nexus ya registrado', re.compile(r"^Código Nexus '.*' ya registrado")),
+    ('institution', 'IE con el mismo nombre y otro código', re.compile(r"^La IE '")),
+)
+OTHER_ERROR_TYPE = 'other'
+ERROR_TYPE_LABELS = {code: label for code, label, _ in ERROR_TYPES}
+ERROR_TYPE_LABELS[OTHER_ERROR_TYPE] = 'Otro error'
+
+REPORT_COLUMNS = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+XLSX_HEADER = ['sheet', 'row', *REPORT_COLUMNS, 'errors']
+
+
+def classify_error(message):
+    for code, _, pattern in ERROR_TYPES:
+        if pattern.match(message):
+            return code
+    return OTHER_ERROR_TYPE
+
+
+def remove_expired_reports():
+    limit = timezone.now() - timedelta(seconds=settings.IMPORT_REPORT_EXPIRATION)
+    ImportReport.objects.filter(created_at__lt=limit).delete()
+
+
+def create_report(user, source, rows, filename='', phase_id=None, dry_run=False, created_count=0):
+    """
+    Guarda el reporte y sus filas. ``rows`` es una lista de
+    {"row", "data", "errors", "sheet"?, "suggestions"?} en el orden del archivo.
+    """
+    remove_expired_reports()
+    if phase_id is not None:
+        # La previsualización no exige una fase existente
+        phase_id = Phase.objects.filter(id=phase_id).values_list('id', flat=True).first()
+    report = ImportReport(
+        user=user, source=source, filename=filename[:255], phase_id=phase_id,
+        dry_run=dry_run, created_count=created_count
+    )
+    report_rows = []
+    error_counts = {}
+    for row in rows:
+        types = sorted({classify_error(message) for message in row['errors']})
+        for code in types:
+            error_counts[code] = error_counts.get(code, 0) + 1
+        report_rows.append(ImportReportRow(
+            report=report,
+            sheet=row.get('sheet', '')[:255],
+            row=row['row'],
+            data={column: clean(row['data'].get(column)) for column in REPORT_COLUMNS},
+            errors=row['errors'],
+            suggestions=row.get('suggestions') or {},
+            error_types=f",{','.join(types)}," if types else '',
+            is_valid=not row['errors'],
+        ))
+    report.total = len(report_rows)
+    report.invalid_count = sum(1 for row in report_rows if not row.is_valid)
+    report.valid_count = report.total - report.invalid_count
+    report.error_counts = error_counts
+
+    with transaction.atomic():
+        report.save()
+        ImportReportRow.objects.bulk_create(report_rows, batch_size=settings.IMPORT_BATCH_SIZE)
+    return report
+
+
+def filter_rows(report, valid=None, error_type=None, sheet=None):
+    """
+    Filas del reporte. ``valid`` es 'true'/'false' y ``error_type`` uno de los
+    códigos de ERROR_TYPES (ValueError si no existe).
+    """
+    queryset = report.rows.all()
+    if valid is not None:
+        queryset = queryset.filter(is_valid=str(valid).lower() in ('1', 'true'))
+    if error_type:
+        if error_type not in ERROR_TYPE_LABELS:
+            raise ValueError(f"Tipo de error '{error_type}' no válido. Use: {', '.join(ERROR_TYPE_LABELS)}")
+        queryset = queryset.filter(error_types__contains=f',{error_type},')
+    if sheet:
+        queryset = queryset.filter(sheet=sheet)
+    return queryset
+
+
+def sample_errors(report):
+    """Primeros errores del reporte como texto ("Fila N: ..."), para mostrar en la respuesta."""
+    rows = report.rows.filter(is_valid=False).only('sheet', 'row', 'errors')[:settings.IMPORT_REPORT_SAMPLE_SIZE]
+    return [
+        f"{f'{row.sheet} / ' if row.sheet else ''}Fila {row.row}: {'; '.join(row.errors)}"
+        for row in rows
+    ]
+
+
+def write_report_xlsx(queryset):
+    """
+    Excel con las filas del reporte, sus valores y la columna "errors". Las
+    columnas son las de la plantilla, así que el archivo corregido se puede
+    volver a importar.
+    """
+    rows = (
+        [sheet, row, *(data.get(column, '') for column in REPORT_COLUMNS), '; '.join(errors)]
+        for sheet, row, data, errors in queryset.values_list('sheet', 'row', 'data', 'errors').iterator(
+            chunk_size=settings.EXPORT_CHUNK_SIZE
+        )
+    )
+    return write_xlsx(rows, XLSX_HEADER, 'Reporte')
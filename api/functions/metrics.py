@@ -0,0 +1,194 @@
+"""
+Métricas por petición: número de consultas SQL, tiempo en SQL, tiempo de
+serialización, tiempo de render y tamaño de la respuesta.
+
+``RequestMetricsMiddleware`` (api.middleware) crea un ``RequestMetrics`` por
+petición, lo deja en un contextvar y lo agrega al registro del proceso al
+terminar. El registro se expone en formato de texto de Prometheus en
+/api/_metrics/. Cada worker de gunicorn tiene su propio registro, así que
+Prometheus debe sumar las series de todos los workers/instancias.
+"""
+import bisect
+import logging
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+
+from django.conf import settings
+
+
+logger = logging.getLogger('api.metrics')
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self, record_sql=False, max_statements=0):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+        self.render_time = 0.0
+        self.response_size = 0
+        self.record_sql = record_sql
+        # SQL -> [ejecuciones, duración máxima]; como mucho ``max_statements`` textos
+        # distintos, para acotar la memoria en peticiones con miles de consultas
+        self.max_statements = max_statements
+        self.statements = {}
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def __call__(self, execute, sql, params, many, context):
+        """Envoltorio para ``connection.execute_wrapper``."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.sql_time += duration
+            if self.record_sql:
+                entry = self.statements.get(sql)
+                if entry is not None:
+                    entry[0] += 1
+                    entry[1] = max(entry[1], duration)
+                elif len(self.statements) < self.max_statements:
+                    self.statements[sql] = [1, duration]
+
+    def server_timing(self, total):
+        return ', '.join([
+            f'db;dur={self.sql_time * 1000:.1f};desc="{self.queries} queries"',
+            f'ser;dur={self.serialization_time * 1000:.1f}',
+            f'render;dur={self.render_time * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+    def slow_report(self, limit):
+        """SQL de la petición: las más lentas y las repetidas (posibles N+1)."""
+        repeated = sorted(self.statements.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        lines = [f'  x{count} {sql}' for sql, (count, _) in repeated if count > 1]
+        slowest = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        lines.extend(f'  {duration * 1000:.1f}ms {sql}' for sql, (_, duration) in slowest)
+        return '\n'.join(lines)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+HISTOGRAMS = {
+    'api_request_duration_seconds': (
+        'Duración total de la petición', (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    ),
+    'api_request_sql_seconds': (
+        'Tiempo en consultas SQL por petición', (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+    ),
+    'api_request_queries': (
+        'Consultas SQL por petición', (1, 2, 5, 10, 20, 50, 100, 200, 500)
+    ),
+    'api_request_serialization_seconds': (
+        'Tiempo de serialización (to_representation) por petición', (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+    ),
+    'api_response_size_bytes': (
+        'Tamaño de la respuesta', (512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+    ),
+}
+
+
+class MetricsRegistry:
+    """Histogramas agregados por (vista, método) en memoria del proceso."""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.series = defaultdict(dict)
+
+    def observe(self, view, method, metrics, total):
+        values = {
+            'api_request_duration_seconds': total,
+            'api_request_sql_seconds': metrics.sql_time,
+            'api_request_queries': metrics.queries,
+            'api_request_serialization_seconds': metrics.serialization_time,
+            'api_response_size_bytes': metrics.response_size,
+        }
+        with self.lock:
+            series = self.series[(view, method)]
+            for name, value in values.items():
+                if name not in series:
+                    series[name] = Histogram(HISTOGRAMS[name][1])
+                series[name].observe(value)
+
+    def reset(self):
+        with self.lock:
+            self.series.clear()
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (help_text, buckets) in HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (view, method), series in sorted(self.series.items()):
+                    histogram = series[name]
+                    labels = f'view="{escape_label(view)}",method="{method}"'
+                    cumulative = 0
+                    for bound, count in zip((*buckets, '+Inf'), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.total:.6f}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+def timed_representation(serializer):
+    """Acumula el tiempo de ``to_representation`` del serializer en las métricas de la petición."""
+    to_representation = serializer.to_representation
+
+    @wraps(to_representation)
+    def wrapper(*args, **kwargs):
+        metrics = current_metrics.get()
+        if metrics is None:
+            return to_representation(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return to_representation(*args, **kwargs)
+        finally:
+            metrics.serialization_time += time.perf_counter() - start
+
+    serializer.to_representation = wrapper
+    return serializer
+
+
+class SerializationTimingMixin:
+    """Mide el tiempo de serialización de los serializers creados con ``get_serializer``."""
+
+    def get_serializer(self, *args, **kwargs):
+        return timed_representation(super().get_serializer(*args, **kwargs))
+
+
+def log_slow_request(request, metrics, total):
+    logger.warning(
+        'Petición lenta %s %s: %.0fms, %d consultas (%.0fms SQL), serialización %.0fms\n%s',
+        request.method, request.get_full_path(), total * 1000, metrics.queries,
+        metrics.sql_time * 1000, metrics.serialization_time * 1000,
+        metrics.slow_report(settings.REQUEST_METRICS_SLOW_SQL_LIMIT)
+    )
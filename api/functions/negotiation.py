@@ -0,0 +1,16 @@
+from api.functions.renderers import ORJSONRenderer
+
+
+class FileActionNegotiationMixin:
+    """
+    Las acciones listadas en ``file_actions`` devuelven archivos (CSV, XLSX, PDF,
+    ZIP) o streams (text/event-stream) con su propio Content-Type. Para ellas no se aplica la negociación de
+    DRF: ``?format=`` queda disponible para la vista y un Accept como
+    application/pdf no produce 406. Los errores se siguen devolviendo en JSON.
+    """
+    file_actions = ()
+
+    def perform_content_negotiation(self, request, force=False):
+        if self.action in self.file_actions:
+            return (ORJSONRenderer(), ORJSONRenderer.media_type)
+        return super().perform_content_negotiation(request, force)
@@ -1,6 +1,17 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+class KeysetResultsSetPagination(CursorPagination):
+    """
+    Paginación por clave (keyset): filtra por pk > cursor en lugar de usar
+    OFFSET y no ejecuta COUNT, por lo que el costo por página es constante.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = 'pk'
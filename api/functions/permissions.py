@@ -0,0 +1,13 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsAdminOrAdjudicator(BasePermission):
+    """Administradores (is_staff) o usuarios con rol ADJUDICATOR."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_staff:
+            return True
+        return bool(user.role_id and user.role.name.upper() == 'ADJUDICATOR')
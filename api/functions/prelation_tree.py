@@ -0,0 +1,215 @@
+"""
+Árbol de prelaciones precalculado para servirlo como archivo.
+
+``export_prelation_tree`` arma la jerarquía activa (modalidad → nivel → área
+curricular → prelaciones por orden → requisitos agrupados) y escribe un JSON
+por modalidad más un índice en PRELATION_TREE_ROOT. El nombre de cada archivo
+lleva la huella de su contenido (``ebr.<hash>.json``), así que se sirve con
+caché de larga duración (ver prelation_tree_file) y un cambio de datos produce
+archivos nuevos en lugar de modificar los existentes.
+
+El directorio queda fuera de STATIC_ROOT: WhiteNoise indexa los estáticos al
+arrancar y no sabría que una exportación posterior borró o reemplazó archivos.
+
+``latest.json`` apunta a la última exportación (no se sirve); la API redirige a
+esos archivos (ver PrelationViewSet.tree) y los regenera si la versión de los
+modelos cambió.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+from django.conf import settings
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.text import slugify
+
+from api.models import CurricularArea, Level, Modality, Prelation, PrelationOrder, PrelationRequirement
+from api.db_router import use_primary
+from api.functions.cache import get_or_compute, make_cache_key
+from api.functions.versions import versions_of
+
+
+TREE_MODELS = (Modality, Level, CurricularArea, PrelationOrder, Prelation, PrelationRequirement)
+
+LATEST_FILENAME = 'latest.json'
+
+
+def tree_root():
+    return settings.PRELATION_TREE_ROOT
+
+
+def tree_url(filename):
+    return f'{settings.PRELATION_TREE_URL}{filename}'
+
+
+def requirement_groups(requirements):
+    groups = {}
+    for requirement in sorted(requirements, key=lambda item: (item.group, item.id)):
+        groups.setdefault(requirement.group, []).append({
+            'id': requirement.id,
+            'text': requirement.text,
+            'logic_type': requirement.logic_type,
+        })
+    return [{'group': group, 'requirements': items} for group, items in groups.items()]
+
+
+def build_prelation_tree():
+    """
+    Jerarquía activa por modalidad: {modality_id: {...}} (una consulta por tabla).
+    Una prelación con varios niveles aparece bajo cada uno de ellos.
+    """
+    prelations = Prelation.objects.filter(
+        is_active=True, modality__is_active=True
+    ).select_related('curricular_area', 'order').prefetch_related(
+        Prefetch('level', queryset=Level.objects.filter(is_active=True).order_by('name')),
+        Prefetch('requirements', queryset=PrelationRequirement.objects.filter(is_active=True)),
+    ).order_by('order__position', 'order_id', 'id')
+
+    tree = {
+        modality.id: {
+            'id': modality.id,
+            'name': modality.name,
+            'abbreviature': modality.abbreviature,
+            'levels': {},
+        }
+        for modality in Modality.objects.filter(is_active=True).order_by('name')
+    }
+    for prelation in prelations:
+        area = prelation.curricular_area
+        if area is not None and not area.is_active:
+            continue
+        item = {
+            'id': prelation.id,
+            'order': {'id': prelation.order_id, 'name': prelation.order.name},
+            'description': prelation.description,
+            'requirement_groups': requirement_groups(prelation.requirements.all()),
+        }
+        for level in prelation.level.all():
+            levels = tree[prelation.modality_id]['levels']
+            level_node = levels.setdefault(level.id, {'id': level.id, 'name': level.name, 'curricular_areas': {}})
+            area_key = area.id if area is not None else None
+            area_node = level_node['curricular_areas'].setdefault(area_key, {
+                'id': area_key,
+                'name': area.name if area is not None else None,
+                'prelations': [],
+            })
+            area_node['prelations'].append(item)
+
+    # Diccionarios intermedios -> listas ordenadas por nombre (sin área al final)
+    for modality in tree.values():
+        levels = sorted(modality['levels'].values(), key=lambda node: node['name'])
+        for level in levels:
+            level['curricular_areas'] = sorted(
+                level['curricular_areas'].values(),
+                key=lambda node: (node['name'] is None, node['name'] or '')
+            )
+        modality['levels'] = levels
+    return tree
+
+
+def dump_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def fingerprinted_name(stem, content):
+    # 12 caracteres, igual que ManifestStaticFilesStorage
+    return f'{stem}.{hashlib.md5(content).hexdigest()[:12]}.json'
+
+
+def write_file(root, filename, content):
+    """Escribe el archivo (y su versión .gz) de forma atómica si aún no existe."""
+    path = os.path.join(root, filename)
+    if os.path.exists(path):
+        return
+    for target, data in ((path, content), (f'{path}.gz', gzip.compress(content, mtime=0))):
+        with tempfile.NamedTemporaryFile(dir=root, suffix='.tmp', delete=False) as handle:
+            handle.write(data)
+        os.replace(handle.name, target)
+
+
+def read_latest():
+    try:
+        with open(os.path.join(tree_root(), LATEST_FILENAME), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def remove_stale_files(root, keep):
+    """Borra los archivos que no pertenecen a la exportación actual ni a la anterior."""
+    for filename in os.listdir(root):
+        name = filename.removesuffix('.gz')
+        if filename != LATEST_FILENAME and name not in keep and not filename.endswith('.tmp'):
+            os.remove(os.path.join(root, filename))
+
+
+def snapshot_files(snapshot):
+    return {snapshot['index'], *snapshot['modalities'].values()}
+
+
+def export_prelation_tree():
+    """
+    Escribe el árbol de prelaciones en PRELATION_TREE_ROOT y devuelve la descripción de
+    la exportación: {"index": ..., "modalities": {id: archivo}, "versions": [...]}.
+    """
+    # Versiones antes de leer: si algo cambia durante la exportación, la próxima la repite
+    versions = list(versions_of(*TREE_MODELS))
+    with use_primary():
+        tree = build_prelation_tree()
+
+    root = tree_root()
+    os.makedirs(root, exist_ok=True)
+
+    files = {}
+    index = []
+    for modality_id, modality in tree.items():
+        content = dump_json(modality)
+        stem = slugify(modality['abbreviature'] or modality['name']) or f'modalidad-{modality_id}'
+        filename = files[str(modality_id)] = fingerprinted_name(stem, content)
+        write_file(root, filename, content)
+        index.append({
+            'id': modality_id,
+            'name': modality['name'],
+            'abbreviature': modality['abbreviature'],
+            'url': tree_url(filename),
+        })
+    content = dump_json({'modalities': index})
+    index_filename = fingerprinted_name('index', content)
+    write_file(root, index_filename, content)
+
+    snapshot = {
+        'index': index_filename,
+        'modalities': files,
+        'versions': versions,
+        'generated_at': timezone.now().isoformat(),
+    }
+    previous = read_latest()
+    keep = snapshot_files(snapshot) | (snapshot_files(previous) if previous else set())
+    with tempfile.NamedTemporaryFile('w', dir=root, suffix='.tmp', delete=False, encoding='utf-8') as handle:
+        json.dump(snapshot, handle)
+    os.replace(handle.name, os.path.join(root, LATEST_FILENAME))
+    remove_stale_files(root, keep)
+    return snapshot
+
+
+def current_snapshot():
+    """
+    Exportación vigente para la versión actual de los modelos. Reutiliza la del
+    disco si coincide; si no, la regenera (una sola petición a la vez).
+    """
+    versions = list(versions_of(*TREE_MODELS))
+
+    def load_or_export():
+        snapshot = read_latest()
+        if snapshot is not None and snapshot.get('versions') == versions and all(
+            os.path.exists(os.path.join(tree_root(), filename)) for filename in snapshot_files(snapshot)
+        ):
+            return snapshot
+        return export_prelation_tree()
+
+    return get_or_compute(
+        make_cache_key('prelation-tree', *versions), load_or_export, settings.LIST_CACHE_TIMEOUT
+    )
@@ -0,0 +1,89 @@
+"""
+Renderers y parsers de la API.
+
+- ``ORJSONRenderer`` / ``ORJSONParser``: JSON con orjson. Los tipos que orjson
+  no conoce (Decimal, textos traducibles perezosos de los choices, QuerySet...)
+  y las fechas pasan por el encoder de DRF, y U+2028/U+2029 se escapan como en
+  ``rest_framework.renderers.JSONRenderer``. La salida es JSON equivalente pero
+  no idéntica byte a byte: los floats con exponente se escriben ``1e20`` (DRF:
+  ``1e+20``), NaN/Infinity salen como null (DRF los rechaza) y la sangría de la
+  vista navegable es de 2 espacios.
+- ``MessagePackRenderer`` / ``MessagePackParser``: application/msgpack para
+  consumidores internos; solo se habilitan si el paquete msgpack está instalado.
+"""
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # dependencia opcional
+    msgpack = None
+
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+encoder_default = JSONEncoder().default
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = ORJSON_OPTIONS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        content = orjson.dumps(data, default=encoder_default, option=options)
+        # Como JSONRenderer: separadores de línea escapados, válidos dentro de <script> en JS antiguo
+        if b'\xe2\x80' in content:
+            content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return content
+
+    def get_indent(self, accepted_media_type, renderer_context):
+        # Igual que JSONRenderer: application/json; indent=4 o la vista navegable
+        if accepted_media_type:
+            for part in accepted_media_type.split(';')[1:]:
+                key, _, value = part.partition('=')
+                if key.strip() == 'indent' and value.strip().isdigit():
+                    return int(value) > 0
+        return bool(renderer_context.get('indent'))
+
+
+class ORJSONParser(BaseParser):
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encoder_default, use_bin_type=True, datetime=False)
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
+
@@ -0,0 +1,285 @@
+"""
+Reportes PDF por fase (vacantes y adjudicación).
+
+Los PDF se generan con reportlab en un pool de procesos, fuera del worker web
+(el renderizado usa CPU y en un hilo competiría por el GIL con las peticiones):
+la vista solo encola el trabajo y responde 202 hasta que el archivo está listo.
+Cada reporte se guarda en disco con la versión de los datos en el nombre, así
+que mientras los datos no cambien se sirve el mismo archivo en streaming sin
+volver a renderizar; al generar una versión nueva se borran las anteriores.
+"""
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from threading import Lock
+
+import django
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.lib.utils import simpleSplit
+from reportlab.platypus import LongTable, PageBreak, Paragraph, SimpleDocTemplate, Spacer, TableStyle
+
+from api.models import CurricularArea, EducationalInstitution, Level, Modality, Phase, PhaseAssignment, Vacancy
+from api.db_router import use_primary
+from api.functions.cache import make_cache_key
+from api.functions.versions import versions_of
+
+
+logger = logging.getLogger(__name__)
+
+REPORT_KINDS = {
+    'vacancies': 'Reporte de vacantes',
+    'adjudication': 'Reporte de adjudicación',
+}
+
+VACANCY_COLUMNS = ['Código modular', 'Institución educativa', 'Código Nexus', 'Cargo', 'Tipo', 'Motivo', 'Área curricular']
+COLUMN_WIDTHS = [2.6 * cm, 8.5 * cm, 3 * cm, 2.4 * cm, 2.4 * cm, 3 * cm, 4.5 * cm]
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1f3b63')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 7),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#eef2f7')]),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#9aa5b1')),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+_executor = None
+_executor_lock = Lock()
+_pending_lock = Lock()
+_pending = {}
+
+
+def get_executor():
+    """
+    Pool de procesos de los reportes. Se usa 'spawn' (los procesos no heredan
+    hilos ni conexiones del servidor) y cada proceso inicializa Django.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.REPORT_WORKERS,
+                mp_context=get_context('spawn'),
+                initializer=django.setup
+            )
+        return _executor
+
+
+def reset_executor():
+    global _executor
+    with _executor_lock:
+        _executor = None
+
+
+# Modelos cuyos datos aparecen en los reportes (nombres de IE, áreas, etc.)
+REPORT_MODELS = (Phase, PhaseAssignment, Vacancy, EducationalInstitution, Modality, Level, CurricularArea)
+
+
+def version_hash(phase, versions):
+    payload = f"{phase.id}|{'|'.join(map(str, versions))}"
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def data_version(phase):
+    """
+    Versión de los datos que alimentan los reportes de la fase: cambia con
+    cualquier cambio confirmado en los modelos de REPORT_MODELS, también los
+    masivos (ver api.functions.versions).
+    """
+    return version_hash(phase, versions_of(*REPORT_MODELS))
+
+
+async def adata_version(phase):
+    """data_version para las vistas ASGI."""
+    return version_hash(phase, await sync_to_async(versions_of)(*REPORT_MODELS))
+
+
+def report_path(phase, kind, version):
+    return os.path.join(settings.REPORTS_ROOT, f'{kind}-fase{phase.id}-{version}.pdf')
+
+
+def remove_stale_reports(path):
+    """Borra las versiones anteriores del mismo reporte (misma fase y tipo)."""
+    prefix = os.path.basename(path).rsplit('-', 1)[0]
+    for stale in glob.glob(os.path.join(os.path.dirname(path), f'{prefix}-*.pdf')):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+
+def vacancy_rows(queryset):
+    rows = queryset.annotate(
+        area_name=Coalesce('curricular_area__name', models.Value('-'))
+    ).order_by('educational_institution__code', 'nexus_code').values_list(
+        'educational_institution__code', 'educational_institution__name', 'nexus_code',
+        'position', 'vacancy_type', 'vacancy_reason', 'area_name'
+    )
+    return rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def vacancy_table(rows):
+    data = [VACANCY_COLUMNS]
+    name_width = COLUMN_WIDTHS[1] - 6
+    for code, name, nexus_code, position, vacancy_type, reason, area in rows:
+        # Saltos de línea precalculados: mucho más rápido que un Paragraph por celda
+        name = '\n'.join(simpleSplit(name or '-', 'Helvetica', 7, name_width))
+        data.append([code or '-', name, nexus_code, position, vacancy_type, reason, area])
+    if len(data) == 1:
+        return None
+    table = LongTable(data, colWidths=COLUMN_WIDTHS, repeatRows=1)
+    table.setStyle(TABLE_STYLE)
+    return table
+
+
+def build_vacancies_story(phase, styles):
+    story = []
+    active = Vacancy.objects.filter(phase=phase, is_active=True)
+    groups = active.values_list('modality__name', 'level__name').distinct().order_by('modality__name', 'level__name')
+    for modality_name, level_name in groups:
+        story.append(Paragraph(f'{modality_name or "Sin modalidad"} - {level_name or "Sin nivel"}', styles['Heading2']))
+        table = vacancy_table(vacancy_rows(active.filter(modality__name=modality_name, level__name=level_name)))
+        if table is not None:
+            story.extend([table, Spacer(1, 0.5 * cm)])
+    if not story:
+        story.append(Paragraph('La fase no tiene vacantes activas.', styles['BodyText']))
+    return story
+
+
+def build_adjudication_story(phase, styles):
+    """Vacantes ofertadas en cada adjudicación de la fase (modalidad, nivel y área)."""
+    story = []
+    assignments = PhaseAssignment.objects.filter(phase=phase).select_related(
+        'modality', 'level', 'curricular_area'
+    ).order_by('assignment_datetime')
+    for index, assignment in enumerate(assignments):
+        if index:
+            story.append(PageBreak())
+        when = timezone.localtime(assignment.assignment_datetime).strftime('%d/%m/%Y %H:%M')
+        area = f' - {assignment.curricular_area.name}' if assignment.curricular_area else ''
+        story.append(Paragraph(
+            f'Adjudicación {when}: {assignment.modality.name} - {assignment.level.name}{area}',
+            styles['Heading2']
+        ))
+        vacancies = Vacancy.objects.filter(
+            phase=phase, is_active=True,
+            modality_id=assignment.modality_id, level_id=assignment.level_id
+        )
+        if assignment.curricular_area_id:
+            vacancies = vacancies.filter(curricular_area_id=assignment.curricular_area_id)
+        table = vacancy_table(vacancy_rows(vacancies))
+        story.append(table or Paragraph('Sin vacantes para esta adjudicación.', styles['BodyText']))
+    if not story:
+        story.append(Paragraph('La fase no tiene adjudicaciones programadas.', styles['BodyText']))
+    return story
+
+
+STORY_BUILDERS = {
+    'vacancies': build_vacancies_story,
+    'adjudication': build_adjudication_story,
+}
+
+
+def render_report(phase_id, kind, path):
+    """Genera el PDF en un archivo temporal y lo mueve a su ruta final."""
+    try:
+        # Del primario: el nombre del archivo lleva la versión de los datos y una
+        # réplica atrasada dejaría guardado contenido anterior con la versión nueva
+        with use_primary():
+            _render_report(phase_id, kind, path)
+    finally:
+        close_old_connections()
+
+
+def _render_report(phase_id, kind, path):
+    phase = Phase.objects.get(id=phase_id)
+    styles = getSampleStyleSheet()
+
+    generated = timezone.localtime().strftime('%d/%m/%Y %H:%M')
+
+    def draw_footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont('Helvetica', 7)
+        canvas.drawString(1.5 * cm, 1 * cm, f'{phase.name} ({phase.year}) - Generado el {generated}')
+        canvas.drawRightString(doc.pagesize[0] - 1.5 * cm, 1 * cm, f'Página {doc.page}')
+        canvas.restoreState()
+
+    story = [
+        Paragraph(f'{REPORT_KINDS[kind]} - {phase.name} ({phase.year})', styles['Title']),
+        *STORY_BUILDERS[kind](phase, styles),
+    ]
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix='.tmp', delete=False) as handle:
+        doc = SimpleDocTemplate(
+            handle, pagesize=landscape(A4),
+            leftMargin=1.5 * cm, rightMargin=1.5 * cm, topMargin=1.5 * cm, bottomMargin=1.5 * cm,
+            title=REPORT_KINDS[kind]
+        )
+        doc.build(story, onFirstPage=draw_footer, onLaterPages=draw_footer)
+    os.replace(handle.name, path)
+    remove_stale_reports(path)
+
+
+def _report_done(key, future):
+    with _pending_lock:
+        _pending.pop(key, None)
+    cache.delete(make_cache_key('report-running', key))
+    error = future.exception()
+    if isinstance(error, BrokenProcessPool):
+        # Un proceso murió (p. ej. por memoria): el pool ya no sirve
+        reset_executor()
+    if error is not None:
+        logger.error('Error generando el reporte %s: %s', key, error, exc_info=error)
+        cache.set(make_cache_key('report-error', key), str(error), settings.REPORT_ERROR_TIMEOUT)
+
+
+def request_report(phase, kind, version=None):
+    """
+    Devuelve (estado, ruta, versión). Estado 'ready' si el PDF ya existe,
+    'failed' si el último intento falló, o 'pending' tras encolar la generación.
+    """
+    if version is None:
+        version = data_version(phase)
+    path = report_path(phase, kind, version)
+    if os.path.exists(path):
+        return 'ready', path, version
+
+    key = os.path.basename(path)
+    error = cache.get(make_cache_key('report-error', key))
+    if error is not None:
+        return 'failed', error, version
+
+    executor = get_executor()
+    with _pending_lock:
+        if key in _pending:
+            return 'pending', path, version
+        # Marca compartida entre workers para no renderizar el mismo reporte en paralelo
+        if not cache.add(make_cache_key('report-running', key), time.time(), settings.REPORT_RENDER_TIMEOUT):
+            return 'pending', path, version
+        try:
+            future = executor.submit(render_report, phase.id, kind, path)
+        except BrokenProcessPool:
+            reset_executor()
+            cache.delete(make_cache_key('report-running', key))
+            raise
+        _pending[key] = future
+    future.add_done_callback(lambda done: _report_done(key, done))
+    return 'pending', path, version
@@ -0,0 +1,54 @@
+"""
+Respuestas en streaming que no se acumulan en memoria.
+
+Bajo ASGI Django consume los iteradores síncronos completos con
+sync_to_async(list) antes de enviar el primer byte, y bajo WSGI hace lo mismo
+con los asíncronos. ``streaming_response`` y ``file_response`` entregan el
+contenido con el tipo de iterador que corresponde al servidor que atiende la
+petición.
+"""
+import asyncio
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, StreamingHttpResponse
+
+from api.functions.documents import READ_CHUNK_SIZE
+
+
+def is_asgi(request):
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+async def aiter_chunks(iterator):
+    """
+    Recorre un iterador síncrono (p. ej. filas de un cursor de la BD) por
+    bloques de EXPORT_CHUNK_SIZE en el hilo de la petición y entrega cada bloque
+    unido en un solo fragmento.
+    """
+    iterator = iter(iterator)
+    next_batch = sync_to_async(lambda: list(islice(iterator, settings.EXPORT_CHUNK_SIZE)))
+    while batch := await next_batch():
+        yield batch[0][:0].join(batch)
+
+
+async def aiter_file(handle):
+    """Lee el archivo por bloques en un hilo aparte."""
+    while chunk := await asyncio.to_thread(handle.read, READ_CHUNK_SIZE):
+        yield chunk
+
+
+def streaming_response(request, iterator, **kwargs):
+    if is_asgi(request):
+        iterator = aiter_chunks(iterator)
+    return StreamingHttpResponse(iterator, **kwargs)
+
+
+def file_response(request, handle, **kwargs):
+    """FileResponse (cabeceras y cierre del archivo incluidos) que bajo ASGI lee en un hilo."""
+    response = FileResponse(handle, **kwargs)
+    if is_asgi(request):
+        response.streaming_content = aiter_file(handle)
+    return response
@@ -0,0 +1,445 @@
+"""
+Generación de datos sintéticos a escala para pruebas de carga y benchmarks.
+
+Todo se crea por lotes (bulk_create) con un ``random.Random(seed)`` propio, de
+modo que la misma semilla y los mismos volúmenes producen los mismos datos.
+Las vacantes, que pueden ser millones, se insertan con INSERT de varias filas
+construidos directamente a partir de tuplas: bulk_create dedica la mayor parte
+del tiempo a preparar cada valor de cada instancia.
+
+Los catálogos (modalidades, niveles, áreas, órdenes de prelación y roles) se
+reutilizan si ya existen; el resto de registros lleva el prefijo indicado en
+sus códigos y nombres de usuario para no chocar con datos reales y poder
+eliminarlos con ``clear``. Una nueva ejecución sin ``clear`` continúa la
+numeración de lo ya generado (códigos, fases y DNI) en lugar de repetirla.
+
+Los INSERT directos y las tablas intermedias no emiten señales: cada método
+marca con bump_version los modelos que carga por esa vía.
+"""
+import random
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group as AuthGroup
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from api.models import (
+    CurricularArea, EducationalInstitution, EvaluatorProfile, Group, Level, Modality, Person,
+    Phase, PhaseAssignment, Prelation, PrelationOrder, PrelationRequirement, TeacherProfile,
+    User, Vacancy
+)
+from api.functions.versions import bump_version
+
+
+MODALITIES = [
+    ('EBR', 'Educación Básica Regular'),
+    ('EBA', 'Educación Básica Alternativa'),
+    ('EBE', 'Educación Básica Especial'),
+    ('ETP', 'Educación Técnico-Productiva'),
+]
+LEVELS = ['Inicial', 'Primaria', 'Secundaria', 'Avanzado', 'Intermedio']
+AREAS = [
+    'Matemática', 'Comunicación', 'Ciencia y Tecnología', 'Ciencias Sociales', 'Inglés',
+    'Arte y Cultura', 'Educación Física', 'Educación Religiosa', 'Tutoría',
+    'Desarrollo Personal, Ciudadanía y Cívica', 'Educación para el Trabajo',
+]
+PRELATION_ORDERS = ['Primera Prelación', 'Segunda Prelación', 'Tercera Prelación', 'Cuarta Prelación']
+ROLES = ['ADJUDICATOR', 'ADMIN', 'EVALUATOR', 'NEXUS', 'TEACHER']
+
+FIRST_NAMES = ['Ana', 'Luis', 'María', 'José', 'Rosa', 'Carlos', 'Lucía', 'Jorge', 'Elena', 'Pedro', 'Carmen', 'Miguel']
+SURNAMES = ['Quispe', 'Flores', 'Huamán', 'Mamani', 'Rojas', 'García', 'Torres', 'Chávez', 'Vargas', 'Ramos', 'Díaz', 'Castillo']
+INSTITUTION_NAMES = ['José Carlos Mariátegui', 'César Vallejo', 'Miguel Grau', 'Santa Rosa', 'San Martín', 'Túpac Amaru', 'Micaela Bastidas', 'Ricardo Palma']
+REQUIREMENTS = [
+    'Título profesional de profesor en la especialidad',
+    'Título de licenciado en educación',
+    'Título pedagógico en cualquier especialidad',
+    'Estudios de segunda especialidad',
+    'Constancia de habilitación profesional vigente',
+    'Copia del DNI',
+    'Declaración jurada de no tener impedimento',
+    'Constancia de estudios concluidos',
+]
+
+VACANCY_FIELDS = [
+    'phase', 'educational_institution', 'modality', 'level', 'nexus_code', 'position',
+    'vacancy_type', 'vacancy_reason', 'curricular_area', 'is_active', 'created_at', 'updated_at',
+]
+
+DEMO_USERS = [
+    ('admin', 'Carlos', 'Administrador', 'Sistema', '70000001', 'admin@ugel.gob.pe', 'ADMIN'),
+    ('evaluator1', 'María', 'Evaluadora', 'Gómez', '70000002', 'evaluator1@ugel.gob.pe', 'EVALUATOR'),
+    ('evaluator2', 'Pedro', 'Calificador', 'López', '70000003', 'evaluator2@ugel.gob.pe', 'EVALUATOR'),
+    ('evaluator3', 'Ana', 'Revisora', 'Martínez', '70000004', 'evaluator3@ugel.gob.pe', 'EVALUATOR'),
+    ('teacher1', 'Luis', 'Docente', 'Fernández', '70000005', 'teacher1@ugel.gob.pe', 'TEACHER'),
+    ('teacher2', 'Rosa', 'Profesora', 'Ramírez', '70000006', 'teacher2@ugel.gob.pe', 'TEACHER'),
+    ('teacher3', 'Jorge', 'Maestro', 'Torres', '70000007', 'teacher3@ugel.gob.pe', 'TEACHER'),
+    ('teacher4', 'Carmen', 'Educadora', 'Vega', '70000008', 'teacher4@ugel.gob.pe', 'TEACHER'),
+    ('teacher5', 'Ricardo', 'Instructor', 'Sánchez', '70000009', 'teacher5@ugel.gob.pe', 'TEACHER'),
+    ('nexus1', 'Patricia', 'Coordinadora', 'Mendoza', '70000010', 'nexus1@ugel.gob.pe', 'NEXUS'),
+    ('nexus2', 'Alberto', 'Enlace', 'Cruz', '70000011', 'nexus2@ugel.gob.pe', 'NEXUS'),
+    ('adjudicator1', 'Miguel', 'Adjudicador', 'Rojas', '70000012', 'adjudicator1@ugel.gob.pe', 'ADJUDICATOR'),
+    ('adjudicator2', 'Lucía', 'Asignadora', 'Flores', '70000013', 'adjudicator2@ugel.gob.pe', 'ADJUDICATOR'),
+    ('adjudicator3', 'Fernando', 'Gestor', 'Paredes', '70000014', 'adjudicator3@ugel.gob.pe', 'ADJUDICATOR'),
+]
+
+POSITIONS = [choice for choice, _ in Vacancy.POSITION_CHOICES]
+VACANCY_TYPES = [choice for choice, _ in Vacancy.VACANCY_TYPE_CHOICES]
+VACANCY_REASONS = [choice for choice, _ in Vacancy.VACANCY_REASON_CHOICES]
+
+
+def named(base, label, count):
+    """Los primeros ``count`` nombres de ``base`` completados con nombres numerados."""
+    return (base + [f'{label} {index}' for index in range(len(base) + 1, count + 1)])[:count]
+
+
+@dataclass
+class Catalogs:
+    modalities: list = field(default_factory=list)
+    levels: list = field(default_factory=list)
+    areas: list = field(default_factory=list)
+    orders: list = field(default_factory=list)
+    roles: dict = field(default_factory=dict)
+
+
+class SyntheticData:
+    """
+    Generador de datos. Ejemplo::
+
+        data = SyntheticData(seed=1)
+        catalogs = data.catalogs()
+        data.prelations(catalogs)
+        institutions = data.institutions(catalogs, 10_000)
+        phases = data.phases(2, catalogs)
+        data.vacancies(catalogs, phases, institutions, 100_000)
+        data.users(catalogs, 20_000)
+        data.demo_users(catalogs)
+    """
+
+    def __init__(self, seed=0, prefix='SYN', batch_size=5000, password='benchmark123', log=None):
+        self.random = random.Random(seed)
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.password = password
+        self.log = log or (lambda message: None)
+
+    def next_index(self, model, field, prefix, width):
+        """
+        Índice siguiente al mayor ya generado con ``prefix`` seguido de ``width``
+        dígitos (0 si no hay ninguno). Con ancho fijo el mayor valor es también
+        el mayor índice.
+        """
+        last = model.objects.filter(
+            **{f'{field}__regex': rf'^{re.escape(prefix)}[0-9]{{{width}}}$'}
+        ).aggregate(last=Max(field))['last']
+        return int(last[len(prefix):]) + 1 if last else 0
+
+    def next_dni(self, count):
+        """Primer DNI de un bloque de ``count`` números libres tras el mayor DNI existente."""
+        last = Person.objects.filter(dni__regex=r'^[0-9]{8}$').aggregate(last=Max('dni'))['last']
+        start = max(int(last) + 1 if last else 0, 10000000)
+        if start + count > 100000000:
+            raise ValueError(f'No quedan {count} DNI de 8 dígitos libres desde {start}')
+        return start
+
+    def bulk_create(self, model, objects, **kwargs):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size, **kwargs)
+        self.log(f'{model.__name__}: {len(objects)}')
+        return created
+
+    def catalogs(self, modalities=len(MODALITIES), levels=len(LEVELS), areas=len(AREAS), orders=len(PRELATION_ORDERS)):
+        """
+        Catálogos con los nombres reales y, si se piden más, nombres numerados.
+        Devuelve solo los registros pedidos (existentes o creados).
+        """
+        modality_names = (MODALITIES + [(f'M{index}', f'Modalidad {index}') for index in range(len(MODALITIES) + 1, modalities + 1)])[:modalities]
+        level_names = named(LEVELS, 'Nivel', levels)
+        area_names = named(AREAS, 'Área', areas)
+        order_names = named(PRELATION_ORDERS, 'Prelación', orders)
+
+        Modality.objects.bulk_create(
+            [Modality(abbreviature=abbreviature, name=name) for abbreviature, name in modality_names],
+            ignore_conflicts=True
+        )
+        Level.objects.bulk_create([Level(name=name) for name in level_names], ignore_conflicts=True)
+        CurricularArea.objects.bulk_create([CurricularArea(name=name) for name in area_names], ignore_conflicts=True)
+        PrelationOrder.objects.bulk_create(
+            [PrelationOrder(name=name, position=index) for index, name in enumerate(order_names, start=1)],
+            ignore_conflicts=True
+        )
+        Group.objects.bulk_create(
+            [Group(name=name, description=f'Grupo de {name}') for name in ROLES], ignore_conflicts=True
+        )
+        AuthGroup.objects.bulk_create([AuthGroup(name=name) for name in ROLES], ignore_conflicts=True)
+        return Catalogs(
+            modalities=list(Modality.objects.filter(name__in=[name for _, name in modality_names]).order_by('id')),
+            levels=list(Level.objects.filter(name__in=level_names).order_by('id')),
+            areas=list(CurricularArea.objects.filter(name__in=area_names).order_by('id')),
+            orders=list(PrelationOrder.objects.filter(name__in=order_names).order_by('position', 'id')),
+            roles={group.name: group for group in Group.objects.filter(name__in=ROLES)},
+        )
+
+    @transaction.atomic
+    def prelations(self, catalogs, requirements_per_group=(2, 4)):
+        """
+        Árbol completo de prelaciones: cada modalidad x orden x área (y sin área),
+        con 1-3 niveles y dos o tres grupos de requisitos (OR y AND).
+        """
+        existing = set(Prelation.objects.values_list('modality_id', 'curricular_area_id', 'order_id'))
+        prelations = []
+        for modality in catalogs.modalities:
+            for order in catalogs.orders:
+                for area in [None, *catalogs.areas]:
+                    key = (modality.id, area.id if area else None, order.id)
+                    if key in existing:
+                        continue
+                    prelations.append(Prelation(
+                        modality=modality, curricular_area=area, order=order,
+                        description=f'{order.name} - {modality.name} - {area.name if area else "Todas las áreas"}'
+                    ))
+        prelations = self.bulk_create(Prelation, prelations)
+
+        Through = Prelation.level.through
+        links = []
+        requirements = []
+        for prelation in prelations:
+            for level in self.random.sample(catalogs.levels, self.random.randint(1, min(3, len(catalogs.levels)))):
+                links.append(Through(prelation_id=prelation.id, level_id=level.id))
+            for group in range(1, self.random.randint(2, 3) + 1):
+                logic_type = 'OR' if group == 1 else 'AND'
+                for text in self.random.sample(REQUIREMENTS, self.random.randint(*requirements_per_group)):
+                    requirements.append(PrelationRequirement(
+                        prelation=prelation, text=text, logic_type=logic_type, group=group
+                    ))
+        Through.objects.bulk_create(links, batch_size=self.batch_size)
+        bump_version(Prelation)
+        self.bulk_create(PrelationRequirement, requirements)
+        return prelations
+
+    def institutions(self, catalogs, count):
+        institutions = []
+        start = self.next_index(EducationalInstitution, 'code', self.prefix, 7)
+        for index in range(start, start + count):
+            name = self.random.choice(INSTITUTION_NAMES)
+            institutions.append(EducationalInstitution(
+                code=f'{self.prefix}{index:07d}',
+                name=f'IE N° {index} {name}',
+                modality=self.random.choice(catalogs.modalities),
+                level=self.random.choice(catalogs.levels),
+            ))
+        return self.bulk_create(EducationalInstitution, institutions)
+
+    def phases(self, count, catalogs=None):
+        year = timezone.now().year
+        existing = set(Phase.objects.filter(name__startswith=f'{self.prefix} Fase ').values_list('name', flat=True))
+        names = []
+        number = 1
+        while len(names) < count:
+            name = f'{self.prefix} Fase {number}'
+            if name not in existing:
+                names.append(name)
+            number += 1
+        return [self.phase(name=name, year=year, catalogs=catalogs) for name in names]
+
+    def phase(self, name=None, year=None, catalogs=None):
+        now = timezone.now()
+        phase = Phase.objects.create(
+            name=name or f'{self.prefix} Fase {now.year}', year=year or now.year,
+            description='Fase generada con datos sintéticos'
+        )
+        if catalogs is not None:
+            PhaseAssignment.objects.bulk_create([
+                PhaseAssignment(
+                    phase=phase, modality=modality, level=level,
+                    assignment_datetime=now + timedelta(days=index)
+                )
+                for index, (modality, level) in enumerate(
+                    (modality, level) for modality in catalogs.modalities for level in catalogs.levels
+                )
+            ])
+        return phase
+
+    def iter_vacancy_rows(self, catalogs, phases, institutions, count, start=0):
+        choice = self.random.choice
+        random_value = self.random.random
+        area_ids = [area.id for area in catalogs.areas]
+        phase_ids = [phase.id for phase in phases]
+        # Columnas desnormalizadas modalidad/nivel: no se pasa por Vacancy.save()
+        institution_rows = [(institution.id, institution.modality_id, institution.level_id) for institution in institutions]
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        for index in range(start, start + count):
+            institution_id, modality_id, level_id = choice(institution_rows)
+            yield (
+                phase_ids[index % len(phase_ids)], institution_id, modality_id, level_id,
+                f'{self.prefix}{index:09d}', choice(POSITIONS), choice(VACANCY_TYPES), choice(VACANCY_REASONS),
+                choice(area_ids) if random_value() < 0.8 else None, True, now, now,
+            )
+
+    def insert_rows(self, model, field_names, rows):
+        """
+        INSERT de varias filas por sentencia a partir de tuplas ya preparadas
+        para la base de datos. Devuelve el número de filas insertadas.
+        """
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(model._meta.get_field(name).column) for name in field_names)
+        placeholder = f'({", ".join(["%s"] * len(field_names))})'
+        insert = f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES '
+        # PostgreSQL admite como máximo 65535 parámetros por sentencia
+        rows_per_statement = min(self.batch_size, 65535 // len(field_names))
+        # SQLite limita los parámetros por sentencia; ahí es más rápido executemany
+        # de una sentencia de una fila que muchas sentencias pequeñas
+        single_row = connection.vendor == 'sqlite'
+
+        inserted = 0
+        batch = []
+        with connection.cursor() as cursor:
+            def flush():
+                if single_row:
+                    cursor.executemany(insert + placeholder, batch)
+                else:
+                    cursor.execute(insert + ', '.join([placeholder] * len(batch)), [value for row in batch for value in row])
+
+            for row in rows:
+                batch.append(row)
+                if len(batch) == rows_per_statement:
+                    flush()
+                    inserted += len(batch)
+                    batch = []
+            if batch:
+                flush()
+                inserted += len(batch)
+        return inserted
+
+    @transaction.atomic
+    def vacancies(self, catalogs, phases, institutions, count, start=None):
+        """Vacantes repartidas entre ``phases`` sin mantenerlas todas en memoria."""
+        if isinstance(phases, Phase):
+            phases = [phases]
+        if start is None:
+            start = self.next_index(Vacancy, 'nexus_code', self.prefix, 9)
+        created = self.insert_rows(Vacancy, VACANCY_FIELDS, self.iter_vacancy_rows(catalogs, phases, institutions, count, start))
+        bump_version(Vacancy)
+        self.log(f'Vacancy: {created}')
+        return created
+
+    @transaction.atomic
+    def users(self, catalogs, count, evaluator_ratio=0.1):
+        """Usuarios con persona y perfil: docentes y, en ``evaluator_ratio``, evaluadores."""
+        # El hash es lo más costoso de crear usuarios: se calcula una sola vez
+        password = make_password(self.password)
+        prefix = self.prefix.lower()
+        start = max(self.next_index(User, 'username', f'{prefix}_{role}_', 6) for role in ('evaluator', 'teacher'))
+        dni = self.next_dni(count)
+        persons = []
+        for offset in range(count):
+            persons.append(Person(
+                first_name=self.random.choice(FIRST_NAMES),
+                paternal_surname=self.random.choice(SURNAMES),
+                maternal_surname=self.random.choice(SURNAMES),
+                dni=f'{dni + offset:08d}',
+                email=f'{prefix}_{start + offset}@example.com',
+            ))
+        persons = self.bulk_create(Person, persons)
+
+        evaluators = int(count * evaluator_ratio)
+        users = []
+        for index, person in enumerate(persons):
+            role = 'EVALUATOR' if index < evaluators else 'TEACHER'
+            users.append(User(
+                username=f'{prefix}_{role.lower()}_{start + index:06d}',
+                email=person.email, first_name=person.first_name, last_name=person.paternal_surname,
+                person=person, role=catalogs.roles.get(role), password=password,
+            ))
+        users = self.bulk_create(User, users)
+
+        teachers = [
+            TeacherProfile(
+                user=user, modality=self.random.choice(catalogs.modalities),
+                level=self.random.choice(catalogs.levels), curricular_area=self.random.choice(catalogs.areas),
+            )
+            for user in users[evaluators:]
+        ]
+        self.bulk_create(TeacherProfile, teachers)
+
+        profiles = self.bulk_create(EvaluatorProfile, [EvaluatorProfile(user=user) for user in users[:evaluators]])
+        relations = [
+            (EvaluatorProfile.modalities.through, 'modality_id', catalogs.modalities),
+            (EvaluatorProfile.levels.through, 'level_id', catalogs.levels),
+            (EvaluatorProfile.curricular_areas.through, 'curriculararea_id', catalogs.areas),
+        ]
+        for Through, column, choices in relations:
+            links = [
+                Through(evaluatorprofile_id=profile.pk, **{column: item.id})
+                for profile in profiles
+                for item in self.random.sample(choices, min(2, len(choices)))
+            ]
+            Through.objects.bulk_create(links, batch_size=self.batch_size)
+        bump_version(EvaluatorProfile)
+        return users
+
+    @transaction.atomic
+    def demo_users(self, catalogs, password='password123'):
+        """
+        Cuentas fijas para desarrollo (antes create_test_users.py): admin,
+        evaluator1-3, teacher1-5, nexus1-2 y adjudicator1-3. Las existentes no se tocan.
+        """
+        existing = set(User.objects.filter(username__in=[row[0] for row in DEMO_USERS]).values_list('username', flat=True))
+        rows = [row for row in DEMO_USERS if row[0] not in existing]
+        if not rows:
+            return []
+
+        persons = self.bulk_create(Person, [
+            Person(first_name=first_name, paternal_surname=paternal, maternal_surname=maternal, dni=dni, email=email)
+            for _, first_name, paternal, maternal, dni, email, _ in rows
+        ])
+        password = make_password(password)
+        users = self.bulk_create(User, [
+            User(
+                username=username, email=email, person=person, password=password, role=catalogs.roles.get(role),
+                is_staff=role != 'TEACHER', is_superuser=role == 'ADMIN',
+            )
+            for person, (username, _, _, _, _, email, role) in zip(persons, rows)
+        ])
+
+        auth_groups = {group.name: group for group in AuthGroup.objects.filter(name__in=ROLES)}
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user_id=user.id, group_id=auth_groups[row[6]].id)
+            for user, row in zip(users, rows) if row[6] in auth_groups
+        ])
+
+        teachers = [user for user, row in zip(users, rows) if row[6] == 'TEACHER']
+        TeacherProfile.objects.bulk_create([
+            TeacherProfile(
+                user=user,
+                modality=catalogs.modalities[index % len(catalogs.modalities)],
+                level=catalogs.levels[index % len(catalogs.levels)],
+                curricular_area=catalogs.areas[index % len(catalogs.areas)],
+            )
+            for index, user in enumerate(teachers)
+        ])
+        evaluators = EvaluatorProfile.objects.bulk_create([
+            EvaluatorProfile(user=user) for user, row in zip(users, rows) if row[6] == 'EVALUATOR'
+        ])
+        for profile in evaluators:
+            profile.modalities.set(catalogs.modalities[:2])
+            profile.levels.set(catalogs.levels[:2])
+            profile.curricular_areas.set(catalogs.areas[:3])
+        return users
+
+    @transaction.atomic
+    def clear(self):
+        """Elimina los datos generados con este prefijo (los catálogos se conservan)."""
+        prefix = self.prefix
+        counts = {
+            'Vacancy': Vacancy.objects.filter(nexus_code__startswith=prefix).delete()[0],
+            'EducationalInstitution': EducationalInstitution.objects.filter(code__startswith=prefix).delete()[0],
+            'Phase': Phase.objects.filter(name__startswith=f'{prefix} Fase').delete()[0],
+            'User': User.objects.filter(username__startswith=f'{prefix.lower()}_').delete()[0],
+            'Person': Person.objects.filter(email__startswith=f'{prefix.lower()}_', email__endswith='@example.com').delete()[0],
+        }
+        for name, count in counts.items():
+            self.log(f'{name}: {count} eliminados')
+        return counts
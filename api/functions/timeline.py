@@ -0,0 +1,179 @@
+"""
+Cronograma del proceso de contratación (ContractingProcess) y sus etapas.
+
+``get_timeline`` arma en una sola consulta el proceso, sus etapas y las
+convocatorias de la etapa de adjudicación, y lo guarda en caché hasta el
+siguiente cambio de fecha (inicio o fin de alguna etapa), momento en que cambia
+la etapa vigente. La clave incluye la versión (api.functions.versions) del
+proceso, sus etapas y sus convocatorias, así que cualquier edición la invalida.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from api.models import ContractingProcess, ConvocatoriaAdjudicacion, Stage, StageType
+from api.db_router import use_primary
+from api.functions.cache import make_cache_key
+from api.functions.versions import versions_of
+
+
+STAGE_FIELDS = ('id', 'name', 'type', 'order', 'start_date', 'end_date', 'is_qualifiable')
+CONVOCATORIA_FIELDS = ('id', 'numero_convocatoria', 'nombre', 'fecha_hora', 'lugar_o_enlace', 'finalizada', 'phase_id')
+
+
+class ScheduleError(Exception):
+    """Fechas de etapas inválidas (se responde como 400)."""
+
+
+def stage_status(start_date, end_date, today):
+    if start_date is None or end_date is None:
+        return 'unscheduled'
+    if today < start_date:
+        return 'upcoming'
+    if today > end_date:
+        return 'finished'
+    return 'current'
+
+
+def next_boundary(stages, today):
+    """Primer día posterior a hoy en que cambia el estado de alguna etapa."""
+    boundaries = []
+    for stage in stages:
+        if stage['start_date'] is None or stage['end_date'] is None:
+            continue
+        boundaries.append(stage['start_date'])
+        boundaries.append(stage['end_date'] + timedelta(days=1))
+    return min((day for day in boundaries if day > today), default=None)
+
+
+def build_timeline(process_id=None, today=None):
+    """
+    Proceso (el activo más reciente o ``process_id``) con sus etapas y las
+    convocatorias de adjudicación, en una única consulta con LEFT JOIN.
+    """
+    today = today or timezone.localdate()
+    processes = ContractingProcess.objects.all()
+    if process_id is None:
+        processes = processes.filter(is_active=True)
+    else:
+        processes = processes.filter(id=process_id)
+
+    rows = processes.order_by('-year', 'stages__order', 'stages__id', 'stages__convocatorias__numero_convocatoria').values(
+        'id', 'Name', 'year', 'is_active', 'files_evaluation_enabled',
+        *(f'stages__{field}' for field in STAGE_FIELDS),
+        *(f'stages__convocatorias__{field}' for field in CONVOCATORIA_FIELDS),
+    )
+
+    process = None
+    stages = {}
+    for row in rows:
+        if process is None:
+            process = {
+                'id': row['id'], 'name': row['Name'], 'year': row['year'],
+                'is_active': row['is_active'], 'files_evaluation_enabled': row['files_evaluation_enabled'],
+            }
+        elif row['id'] != process['id']:
+            # Varios procesos activos: solo el del año más reciente
+            break
+        stage_id = row['stages__id']
+        if stage_id is None:
+            continue
+        stage = stages.get(stage_id)
+        if stage is None:
+            stage = stages[stage_id] = {field: row[f'stages__{field}'] for field in STAGE_FIELDS}
+            stage['convocatorias'] = []
+        if row['stages__convocatorias__id'] is not None:
+            stage['convocatorias'].append({
+                field.removesuffix('_id'): row[f'stages__convocatorias__{field}']
+                for field in CONVOCATORIA_FIELDS
+            })
+
+    if process is None:
+        return None, None
+
+    current = None
+    for stage in stages.values():
+        stage['is_scheduled'] = stage['start_date'] is not None and stage['end_date'] is not None
+        stage['status'] = stage_status(stage['start_date'], stage['end_date'], today)
+        if stage['type'] != StageType.Adjudication:
+            del stage['convocatorias']
+        if current is None and stage['status'] == 'current':
+            current = stage['id']
+
+    process['stages'] = list(stages.values())
+    process['current_stage'] = current
+    process['date'] = today
+    return process, next_boundary(process['stages'], today)
+
+
+def get_timeline(process_id=None):
+    """Cronograma cacheado hasta el próximo cambio de fecha (o TIMELINE_CACHE_TIMEOUT)."""
+    today = timezone.localdate()
+    key = make_cache_key(
+        'contracting-timeline', *versions_of(ContractingProcess, Stage, ConvocatoriaAdjudicacion),
+        process_id or 'active', today
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Del primario: tras invalidar, la réplica podría no tener aún el cambio
+    with use_primary():
+        timeline, boundary = build_timeline(process_id, today)
+    timeout = settings.TIMELINE_CACHE_TIMEOUT
+    if boundary is not None:
+        expires = timezone.make_aware(datetime.combine(boundary, time.min))
+        timeout = min(timeout, max(1, int((expires - timezone.now()).total_seconds())))
+    # None también se cachea (sin proceso activo) para no repetir la consulta
+    cache.set(key, timeline or {}, timeout)
+    return timeline or {}
+
+
+def schedule_errors(stages):
+    """
+    Valida en memoria las fechas de las etapas de un proceso. Las etapas
+    programadas, en su orden, no pueden superponerse ni estar desordenadas.
+    Devuelve {id de etapa: mensaje}.
+    """
+    errors = {}
+    scheduled = []
+    for stage in sorted(stages, key=lambda item: (item['order'], item['id'] or 0)):
+        start_date, end_date = stage['start_date'], stage['end_date']
+        if (start_date is None) != (end_date is None):
+            errors[stage['id']] = 'Debe indicar la fecha de inicio y la de fin.'
+        elif start_date is not None and start_date > end_date:
+            errors[stage['id']] = 'La fecha de inicio no puede ser posterior a la fecha de fin.'
+        elif start_date is not None:
+            scheduled.append(stage)
+
+    for previous, stage in zip(scheduled, scheduled[1:]):
+        if stage['start_date'] > previous['end_date']:
+            continue
+        if stage['end_date'] < previous['start_date']:
+            message = f'La etapa debe programarse después de "{previous["name"]}" (orden {previous["order"]}).'
+        else:
+            message = f'Las fechas se superponen con la etapa "{previous["name"]}".'
+        errors.setdefault(stage['id'], message)
+    return errors
+
+
+def process_stages(process_id):
+    """Etapas del proceso como diccionarios, en una consulta."""
+    return list(Stage.objects.filter(stage_id=process_id).values('id', 'name', 'order', 'start_date', 'end_date'))
+
+
+def validate_stage_schedule(process_id, stage_id, name, order, start_date, end_date):
+    """Valida una etapa (nueva o editada) contra las demás etapas del proceso."""
+    stages = [stage for stage in process_stages(process_id) if stage['id'] != stage_id]
+    # Conflictos previos entre otras etapas no bloquean la edición de esta
+    existing = schedule_errors(stages)
+    stages.append({'id': stage_id, 'name': name, 'order': order, 'start_date': start_date, 'end_date': end_date})
+    errors = schedule_errors(stages)
+    if stage_id in errors:
+        raise ScheduleError(errors[stage_id])
+    for stage in stages:
+        # La etapa nueva/editada puede desordenar a la siguiente
+        if stage['id'] in errors and errors[stage['id']] != existing.get(stage['id']):
+            raise ScheduleError(f'Genera un conflicto con la etapa "{stage["name"]}": {errors[stage["id"]]}')
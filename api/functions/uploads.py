@@ -0,0 +1,285 @@
+"""
+Subida de archivos grandes por partes (reanudable).
+
+1. ``create_upload``: el cliente anuncia nombre y tamaño y recibe un id.
+2. ``write_chunk``: cada PUT trae un rango (Content-Range) que se guarda como
+   archivo propio ``<inicio>-<fin>.part``; repetir un rango ya recibido no
+   cambia nada, así que tras un corte basta con consultar ``upload_status`` y
+   enviar los rangos que faltan.
+3. ``finalize_upload``: une las partes en orden, verifica el SHA-256 enviado
+   por el cliente y deja el archivo listo para la importación (``upload_path``).
+   Mientras tanto mantiene ``finalize.lock`` en el directorio de la subida:
+   otra finalización o una parte nueva reciben 409.
+
+Todo vive en UPLOAD_ROOT/<id>/ (``meta.json`` + partes); las subidas con más de
+UPLOAD_EXPIRATION segundos se borran al crear una nueva.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+
+from django.conf import settings
+
+
+META_FILENAME = 'meta.json'
+LOCK_FILENAME = 'finalize.lock'
+DATA_FILENAME = 'data'
+PART_PATTERN = re.compile(r'^(\d+)-(\d+)\.part$')
+CONTENT_RANGE_PATTERN = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Error de la subida por partes; ``status`` es el código HTTP a responder."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def upload_dir(upload_id):
+    return os.path.join(settings.UPLOAD_ROOT, upload_id)
+
+
+def write_meta(upload_id, meta):
+    with tempfile.NamedTemporaryFile('w', dir=upload_dir(upload_id), suffix='.tmp', delete=False) as handle:
+        json.dump(meta, handle)
+    os.replace(handle.name, os.path.join(upload_dir(upload_id), META_FILENAME))
+
+
+def remove_expired_uploads():
+    if not os.path.isdir(settings.UPLOAD_ROOT):
+        return
+    limit = time.time() - settings.UPLOAD_EXPIRATION
+    for upload_id in os.listdir(settings.UPLOAD_ROOT):
+        path = upload_dir(upload_id)
+        try:
+            expired = os.path.getmtime(path) < limit
+        except FileNotFoundError:
+            continue  # otra petición la borró entre listdir y getmtime
+        if expired:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def create_upload(user, filename, size):
+    """Registra una subida nueva y devuelve su estado."""
+    filename = os.path.basename(str(filename or '')).strip()
+    if not filename:
+        raise UploadError('No se proporcionó el nombre del archivo')
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError('Tamaño de archivo no válido')
+    if size <= 0 or size > settings.UPLOAD_MAX_SIZE:
+        raise UploadError(f'El tamaño debe estar entre 1 y {settings.UPLOAD_MAX_SIZE} bytes')
+
+    remove_expired_uploads()
+    upload_id = uuid.uuid4().hex
+    os.makedirs(upload_dir(upload_id))
+    write_meta(upload_id, {
+        'id': upload_id,
+        'user_id': user.pk,
+        'filename': filename,
+        'size': size,
+        'sha256': None,
+        'created_at': time.time(),
+    })
+    return upload_status(get_upload(upload_id, user))
+
+
+def read_meta(upload_id):
+    try:
+        with open(os.path.join(upload_dir(upload_id), META_FILENAME), encoding='utf-8') as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        raise UploadError('Subida no encontrada', status=404)
+
+
+def get_upload(upload_id, user):
+    """Metadatos de la subida de ``user`` (404 si no existe o es de otro usuario)."""
+    if not UPLOAD_ID_PATTERN.match(str(upload_id)):
+        raise UploadError('Subida no encontrada', status=404)
+    meta = read_meta(upload_id)
+    if meta['user_id'] != user.pk:
+        raise UploadError('Subida no encontrada', status=404)
+    return meta
+
+
+def received_parts(meta):
+    """Partes guardadas como [(inicio, fin), ...] ordenadas (fin inclusivo)."""
+    parts = []
+    for filename in os.listdir(upload_dir(meta['id'])):
+        match = PART_PATTERN.match(filename)
+        if match:
+            parts.append((int(match.group(1)), int(match.group(2))))
+    return sorted(parts)
+
+
+def merge_ranges(parts):
+    ranges = []
+    for start, end in parts:
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    return ranges
+
+
+def upload_status(meta):
+    complete = meta['sha256'] is not None
+    ranges = [[0, meta['size'] - 1]] if complete else merge_ranges(received_parts(meta))
+    # Primer byte que falta: desde donde reanudar una subida secuencial
+    offset = ranges[0][1] + 1 if ranges and ranges[0][0] == 0 else 0
+    return {
+        'upload_id': meta['id'],
+        'filename': meta['filename'],
+        'size': meta['size'],
+        'received': ranges,
+        'received_bytes': sum(end - start + 1 for start, end in ranges),
+        'offset': offset,
+        'chunk_size': settings.UPLOAD_CHUNK_SIZE,
+        'complete': complete,
+        'sha256': meta['sha256'],
+    }
+
+
+def parse_content_range(header, size):
+    match = CONTENT_RANGE_PATTERN.match(header or '')
+    if not match:
+        raise UploadError('Cabecera Content-Range no válida (bytes inicio-fin/total)')
+    start, end, total = (int(group) for group in match.groups())
+    if total != size or start > end or end >= size:
+        raise UploadError(f'Rango fuera del archivo ({size} bytes)', status=416)
+    if end - start + 1 > settings.UPLOAD_MAX_CHUNK_SIZE:
+        raise UploadError(f'Cada parte puede tener como máximo {settings.UPLOAD_MAX_CHUNK_SIZE} bytes')
+    return start, end
+
+
+def lock_path(meta):
+    return os.path.join(upload_dir(meta['id']), LOCK_FILENAME)
+
+
+def check_not_finalizing(meta):
+    if os.path.exists(lock_path(meta)):
+        raise UploadError('La subida se está finalizando', status=409)
+
+
+def write_chunk(meta, content_range, stream):
+    """Guarda la parte leyendo ``stream`` por bloques; devuelve el estado."""
+    if meta['sha256'] is not None:
+        raise UploadError('La subida ya fue finalizada', status=409)
+    check_not_finalizing(meta)
+    start, end = parse_content_range(content_range, meta['size'])
+    directory = upload_dir(meta['id'])
+    target = os.path.join(directory, f'{start}-{end}.part')
+    if not os.path.exists(target):
+        expected = end - start + 1
+        # Sin cuerpo (Content-Length 0) la petición no trae stream
+        if stream is None:
+            raise UploadError(f'La parte tiene 0 bytes y el rango indica {expected}')
+        written = 0
+        handle = tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False)
+        try:
+            with handle:
+                while written <= expected:
+                    block = stream.read(min(COPY_BUFFER_SIZE, expected + 1 - written))
+                    if not block:
+                        break
+                    handle.write(block)
+                    written += len(block)
+            if written != expected:
+                raise UploadError(f'La parte tiene {written} bytes y el rango indica {expected}')
+            # La finalización pudo empezar mientras se recibía la parte
+            check_not_finalizing(meta)
+            # Renombrado atómico: una parte cortada a mitad nunca cuenta como recibida
+            os.replace(handle.name, target)
+        finally:
+            # Corte de la conexión o parte incompleta: no dejar el temporal
+            if os.path.exists(handle.name):
+                os.remove(handle.name)
+    return upload_status(meta)
+
+
+def finalize_upload(meta, sha256):
+    """Une las partes y verifica el SHA-256; devuelve el estado final."""
+    if meta['sha256'] is not None:
+        return upload_status(meta)
+    sha256 = str(sha256 or '').strip().lower()
+    if not re.match(r'^[0-9a-f]{64}$', sha256):
+        raise UploadError('Debe enviar el SHA-256 del archivo (64 caracteres hexadecimales)')
+
+    # O_EXCL: solo una petición (de cualquier worker) crea el archivo de bloqueo
+    lock = lock_path(meta)
+    try:
+        os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        raise UploadError('La subida se está finalizando', status=409)
+    try:
+        # Otra petición pudo finalizarla antes de tomar el bloqueo
+        meta = read_meta(meta['id'])
+        if meta['sha256'] is not None:
+            return upload_status(meta)
+        return join_parts(meta, sha256)
+    finally:
+        try:
+            os.remove(lock)
+        except FileNotFoundError:
+            pass  # la subida se eliminó mientras tanto
+
+
+def join_parts(meta, sha256):
+    parts = received_parts(meta)
+    ranges = merge_ranges(parts)
+    if ranges != [[0, meta['size'] - 1]]:
+        raise UploadError('Faltan partes del archivo', status=409)
+
+    directory = upload_dir(meta['id'])
+    digest = hashlib.sha256()
+    position = 0
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as output:
+        for start, end in parts:
+            if end < position:
+                continue  # parte contenida en otra ya copiada
+            with open(os.path.join(directory, f'{start}-{end}.part'), 'rb') as part:
+                # Si se solapa con lo ya copiado, saltar esos bytes
+                part.seek(position - start)
+                while block := part.read(COPY_BUFFER_SIZE):
+                    output.write(block)
+                    digest.update(block)
+            position = end + 1
+    if digest.hexdigest() != sha256:
+        # No se sabe qué parte llegó dañada: se descartan todas
+        os.remove(output.name)
+        for start, end in parts:
+            os.remove(os.path.join(directory, f'{start}-{end}.part'))
+        raise UploadError('El SHA-256 no coincide: el archivo llegó dañado, vuelva a subirlo', status=422)
+
+    os.replace(output.name, data_path(meta))
+    for start, end in parts:
+        os.remove(os.path.join(directory, f'{start}-{end}.part'))
+    meta['sha256'] = sha256
+    write_meta(meta['id'], meta)
+    return upload_status(meta)
+
+
+def data_path(meta):
+    # Con la extensión original: openpyxl decide el formato por la extensión
+    return os.path.join(upload_dir(meta['id']), DATA_FILENAME + os.path.splitext(meta['filename'])[1].lower())
+
+
+def delete_upload(meta):
+    shutil.rmtree(upload_dir(meta['id']), ignore_errors=True)
+
+
+def upload_path(upload_id, user):
+    """(ruta, nombre) del archivo de una subida finalizada, para la importación."""
+    meta = get_upload(upload_id, user)
+    if meta['sha256'] is None:
+        raise UploadError('La subida no ha sido finalizada', status=409)
+    return data_path(meta), meta['filename']
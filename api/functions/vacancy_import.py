@@ -0,0 +1,256 @@
+"""
+Importación de vacantes desde uno o varios libros Excel, con todas sus hojas.
+
+1. Cada hoja se lee y valida por separado (``vacancy_sheets.parse_sheet``) en un
+   pool de procesos: pandas/openpyxl usan CPU y así las hojas se procesan en
+   paralelo sin bloquear el GIL del worker web.
+2. Se unen los resultados: códigos Nexus repetidos entre hojas o archivos (se
+   conserva la primera aparición), ya registrados en la base de datos, fases
+   inexistentes e IEs nuevas que chocan con otra IE registrada.
+3. Las filas válidas se escriben en una sola transacción con bulk_create (IEs
+   nuevas y vacantes).
+
+El resultado incluye los conteos por hoja y todas las filas con sus errores
+(para el reporte de importación, ver api.functions.import_reports).
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from threading import Lock
+
+from django.conf import settings
+from django.db import transaction
+from openpyxl import load_workbook
+
+from api.models import CurricularArea, EducationalInstitution, Level, Modality, Phase, Vacancy
+from api.functions.catalog_resolver import CatalogResolver, acronym, normalize
+from api.functions.vacancy_sheets import parse_sheet
+
+
+_pool = None
+_pool_lock = Lock()
+
+
+def get_pool():
+    """
+    Pool de procesos compartido por las importaciones del worker. Se usa
+    'spawn': los procesos no heredan los hilos ni las conexiones del servidor.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.IMPORT_WORKERS, mp_context=get_context('spawn'))
+        return _pool
+
+
+def reset_pool():
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+
+def catalog_resolvers():
+    """
+    Resolvers de modalidad, nivel y área curricular con las filas activas (una
+    consulta por catálogo). Las modalidades aceptan también su abreviatura y
+    sus siglas ("Educación Básica Regular" -> "EBR") si no chocan con otra.
+    """
+    modalities = list(Modality.objects.filter(is_active=True).values_list('id', 'name', 'abbreviature'))
+    abbreviatures = {normalize(abbreviature) for _, _, abbreviature in modalities if abbreviature}
+    return {
+        'modalities': CatalogResolver(
+            (pk, name, [abbreviature or ''] + ([] if acronym(name) in abbreviatures else [acronym(name)]))
+            for pk, name, abbreviature in modalities
+        ),
+        'levels': CatalogResolver(
+            (pk, name, []) for pk, name in Level.objects.filter(is_active=True).values_list('id', 'name')
+        ),
+        'curricular_areas': CatalogResolver(
+            (pk, name, []) for pk, name in CurricularArea.objects.filter(is_active=True).values_list('id', 'name')
+        ),
+    }
+
+
+def load_import_catalogs():
+    """Catálogos para validar las filas (se envían a los procesos del pool)."""
+    return {
+        **catalog_resolvers(),
+        'positions': {code for code, _ in Vacancy.POSITION_CHOICES},
+        'vacancy_types': {code for code, _ in Vacancy.VACANCY_TYPE_CHOICES},
+        'vacancy_reasons': {code for code, _ in Vacancy.VACANCY_REASON_CHOICES},
+    }
+
+
+def sheet_names(path):
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def parse_sources(sources, catalogs):
+    """
+    Lee todas las hojas de ``sources`` ([(ruta, nombre), ...]) en el orden de
+    los archivos y hojas. Con una sola hoja (o IMPORT_WORKERS <= 1) no se usa el pool.
+    """
+    tasks = [(path, name, sheet, catalogs) for path, name in sources for sheet in sheet_names(path)]
+    if len(tasks) <= 1 or settings.IMPORT_WORKERS <= 1:
+        return [parse_sheet(task) for task in tasks]
+    try:
+        return list(get_pool().map(parse_sheet, tasks))
+    except BrokenProcessPool:
+        # Un proceso murió (p. ej. por memoria): el pool ya no sirve
+        reset_pool()
+        raise
+
+
+def validate_sheet(source, filename, phase_id):
+    """
+    Lee y valida la primera hoja de ``source`` con las mismas reglas que la
+    importación (previsualización y carga masiva). Devuelve el resultado de
+    parse_sheet y sus filas válidas.
+    """
+    result = parse_sheet((source, filename, 0, load_import_catalogs()))
+    return result, ([] if result['error'] else merge_rows([result], phase_id))
+
+
+def sheet_label(result):
+    return f'{result["source"]} / {result["sheet"]}'
+
+
+def merge_rows(results, default_phase_id):
+    """
+    Marca como inválidas las filas con fase faltante o inexistente y las que
+    repiten un código Nexus (en otra hoja o archivo, o ya registrado).
+    """
+    rows = [row for result in results for row in result['rows']]
+    for result in results:
+        for row in result['rows']:
+            row['sheet'] = sheet_label(result)
+            row['phase_id'] = row['phase_id'] or default_phase_id
+            if row['phase_id'] is None:
+                row['errors'].append('No se indicó la fase (phase_id)')
+
+    phase_ids = {row['phase_id'] for row in rows if row['phase_id'] is not None}
+    existing_phases = set(Phase.objects.filter(id__in=phase_ids).values_list('id', flat=True))
+
+    seen = {}
+    for row in rows:
+        if row['phase_id'] is not None and row['phase_id'] not in existing_phases:
+            row['errors'].append(f"La fase {row['phase_id']} no existe")
+        code = row['data']['nexus_code']
+        if not code:
+            continue
+        first = seen.setdefault(code, row)
+        if first is not row:
+            row['errors'].append(f"Código Nexus '{code}' repetido (ya está en {first['sheet']}, fila {first['row']})")
+
+    registered = {vacancy.nexus_code for vacancy in in_batches(Vacancy.objects.only('nexus_code'), 'nexus_code', seen)}
+    for row in rows:
+        if row['data']['nexus_code'] in registered and seen[row['data']['nexus_code']] is row:
+            row['errors'].append(f"Código Nexus '{row['data']['nexus_code']}' ya registrado")
+    check_institutions([row for row in rows if not row['errors']])
+    return [row for row in rows if not row['errors']]
+
+
+def in_batches(queryset, field, values):
+    """Filtra ``queryset`` por ``field__in`` en bloques de IMPORT_BATCH_SIZE."""
+    values = list(values)
+    for start in range(0, len(values), settings.IMPORT_BATCH_SIZE):
+        yield from queryset.filter(**{f'{field}__in': values[start:start + settings.IMPORT_BATCH_SIZE]})
+
+
+def check_institutions(rows):
+    """
+    Marca las filas cuya IE nueva (código no registrado) tiene el mismo nombre,
+    modalidad y nivel que otra IE con distinto código: no se podría crear.
+    """
+    registered = {institution.code for institution in in_batches(
+        EducationalInstitution.objects.only('code'), 'code', {row['data']['ie_code'] for row in rows}
+    )}
+    new_rows = [row for row in rows if row['data']['ie_code'] not in registered]
+    owners = {
+        (institution.name, institution.modality_id, institution.level_id): institution.code
+        for institution in in_batches(
+            EducationalInstitution.objects.only('code', 'name', 'modality_id', 'level_id'),
+            'name', {row['data']['ie_name'] for row in new_rows}
+        )
+    }
+    for row in new_rows:
+        key = (row['data']['ie_name'], row['modality_id'], row['level_id'])
+        owner = owners.setdefault(key, row['data']['ie_code'])
+        if owner != row['data']['ie_code']:
+            row['errors'].append(f"La IE '{row['data']['ie_name']}' ya existe con el código {owner}")
+
+
+def write_rows(rows):
+    """Crea las IEs que falten y las vacantes de ``rows`` en una transacción."""
+    with transaction.atomic():
+        institutions = {
+            institution.code: institution
+            for institution in in_batches(
+                EducationalInstitution.objects.all(), 'code', {row['data']['ie_code'] for row in rows}
+            )
+        }
+        new_institutions = {}
+        for row in rows:
+            code = row['data']['ie_code']
+            if code not in institutions and code not in new_institutions:
+                new_institutions[code] = EducationalInstitution(
+                    code=code, name=row['data']['ie_name'],
+                    modality_id=row['modality_id'], level_id=row['level_id']
+                )
+        EducationalInstitution.objects.bulk_create(new_institutions.values(), batch_size=settings.IMPORT_BATCH_SIZE)
+        institutions.update(new_institutions)
+
+        vacancies = []
+        for row in rows:
+            institution = institutions[row['data']['ie_code']]
+            vacancies.append(Vacancy(
+                phase_id=row['phase_id'],
+                educational_institution=institution,
+                # bulk_create no llama a save(): copia desnormalizada de la IE
+                modality_id=institution.modality_id,
+                level_id=institution.level_id,
+                nexus_code=row['data']['nexus_code'],
+                position=row['data']['position'],
+                vacancy_type=row['data']['vacancy_type'],
+                vacancy_reason=row['data']['vacancy_reason'],
+                curricular_area_id=row['curricular_area_id'],
+            ))
+        Vacancy.objects.bulk_create(vacancies, batch_size=settings.IMPORT_BATCH_SIZE)
+    return len(new_institutions), len(vacancies)
+
+
+def import_vacancies(sources, phase_id=None, dry_run=False):
+    """
+    Importa (o solo valida, con ``dry_run``) las vacantes de todas las hojas de
+    ``sources``. ``phase_id`` es la fase de las filas sin columna phase_id.
+    """
+    results = parse_sources(sources, load_import_catalogs())
+    valid_rows = merge_rows(results, phase_id)
+    institutions_created, created = (0, 0) if dry_run else write_rows(valid_rows)
+
+    sheets = []
+    for result in results:
+        invalid = [row for row in result['rows'] if row['errors']]
+        sheets.append({
+            'file': result['source'],
+            'sheet': result['sheet'],
+            'error': result['error'],
+            'total': len(result['rows']),
+            'valid_count': len(result['rows']) - len(invalid),
+            'invalid_count': len(invalid),
+            'created_count': 0 if dry_run else len(result['rows']) - len(invalid),
+        })
+    return {
+        'dry_run': dry_run,
+        'total': sum(sheet['total'] for sheet in sheets),
+        'valid_count': len(valid_rows),
+        'invalid_count': sum(sheet['invalid_count'] for sheet in sheets),
+        'created_count': created,
+        'institutions_created': institutions_created,
+        'sheets': sheets,
+        'rows': [row for result in results for row in result['rows']],
+    }
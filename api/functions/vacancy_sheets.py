@@ -0,0 +1,91 @@
+"""
+Lectura y validación de una hoja de vacantes.
+
+Este módulo no importa Django: ``parse_sheet`` se ejecuta en los procesos del
+pool de importación (ver api.functions.vacancy_import), que no inicializan el
+ORM. Los catálogos llegan ya cargados (``CatalogResolver`` y conjuntos de códigos).
+"""
+import pandas as pd
+
+
+REQUIRED_COLUMNS = ['ie_code', 'ie_name', 'modality', 'level', 'nexus_code', 'position', 'vacancy_type', 'vacancy_reason']
+OPTIONAL_COLUMNS = ['curricular_area', 'phase_id']
+
+# Columna, catálogo (ver vacancy_import.catalog_resolvers) y mensaje si no se encuentra
+CATALOG_FIELDS = (
+    ('modality', 'modalities', "Modalidad '{}' no encontrada"),
+    ('level', 'levels', "Nivel '{}' no encontrado"),
+    ('curricular_area', 'curricular_areas', "Área curricular '{}' no encontrada"),
+)
+
+
+def clean(value):
+    """Texto de la celda sin espacios extremos ('' si está vacía)."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ''
+    return str(value).strip()
+
+
+def parse_row(record, catalogs):
+    """Valores limpios de la fila, ids de catálogo resueltos, errores y sugerencias."""
+    data = {column: clean(record.get(column)) for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS}
+    errors = []
+    for column in REQUIRED_COLUMNS:
+        if not data[column]:
+            errors.append(f"Campo '{column}' vacío")
+
+    row = {'data': data, 'errors': errors, 'suggestions': {}}
+    for field, catalog, message in CATALOG_FIELDS:
+        row[f'{field}_id'] = None
+        if data[field]:
+            resolver = catalogs[catalog]
+            row[f'{field}_id'] = resolver.resolve(data[field])
+            if row[f'{field}_id'] is None:
+                errors.append(resolver.error(message.format(data[field]), data[field]))
+                if resolver.suggest(data[field]):
+                    row['suggestions'][field] = resolver.suggest(data[field])
+
+    for field, catalog, label in (
+        ('position', 'positions', 'Cargo'),
+        ('vacancy_type', 'vacancy_types', 'Tipo de vacante'),
+        ('vacancy_reason', 'vacancy_reasons', 'Motivo de vacante'),
+    ):
+        data[field] = data[field].upper()
+        if data[field] and data[field] not in catalogs[catalog]:
+            errors.append(f"{label} '{data[field]}' no válido")
+
+    row['phase_id'] = None
+    if data['phase_id']:
+        try:
+            row['phase_id'] = int(float(data['phase_id']))
+        except ValueError:
+            errors.append(f"Fase '{data['phase_id']}' no válida")
+    return row
+
+
+def parse_sheet(task):
+    """
+    Lee y valida una hoja. ``task`` es (ruta o archivo, nombre del archivo,
+    hoja o su posición, catálogos). Devuelve
+    {"source", "sheet", "error", "rows": [{"row", "data", "errors", ...}]}.
+    """
+    path, source, sheet, catalogs = task
+    result = {'source': source, 'sheet': sheet, 'error': None, 'rows': []}
+    with pd.ExcelFile(path) as book:
+        if isinstance(sheet, int):
+            sheet = result['sheet'] = book.sheet_names[sheet]
+        # Todo como texto: los códigos numéricos no se convierten en 12345.0
+        df = book.parse(sheet, dtype=str)
+    df.columns = [str(column).strip() for column in df.columns]
+    missing_columns = [column for column in REQUIRED_COLUMNS if column not in df.columns]
+    if missing_columns:
+        result['error'] = f'Faltan columnas requeridas: {", ".join(missing_columns)}'
+        return result
+
+    for row_num, record in enumerate(df.to_dict('records'), start=2):  # la fila 1 es el encabezado
+        if not any(clean(value) for value in record.values()):
+            continue
+        row = parse_row(record, catalogs)
+        row['row'] = row_num
+        result['rows'].append(row)
+    return result
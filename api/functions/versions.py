@@ -0,0 +1,167 @@
+"""
+Versión de los datos por modelo (o colección con nombre).
+
+Cada modelo versionado tiene una fila en ``ModelVersion`` cuyo contador se
+incrementa con un UPDATE atómico al confirmarse cualquier transacción que lo
+modifique: señales post_save/post_delete/m2m_changed (ver api/signals.py) y
+operaciones masivas a través de ``VersionedQuerySet`` (bulk_create, bulk_update,
+update), que no emiten señales. Los incrementos de una misma transacción se
+agrupan en un solo UPDATE por modelo al hacer commit.
+
+``version_of(Model)`` lee la versión de la caché y solo va a la tabla cuando no
+está, así que las vistas pueden construir claves de caché y ETags sin consultar
+las tablas de datos. La tabla es la fuente de verdad compartida por todos los
+workers; con una caché local por proceso (sin REDIS_URL) cada worker relee la
+versión cada MODEL_VERSION_CACHE_TIMEOUT segundos.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.utils import timezone
+
+from api.db_router import use_primary
+from api.functions.cache import make_cache_key
+
+
+def version_name(model):
+    """Nombre en el registro: la etiqueta del modelo ('api.vacancy') o el texto dado."""
+    if isinstance(model, str):
+        return model
+    return model._meta.label_lower
+
+
+def version_key(name):
+    return make_cache_key('model-version', name)
+
+
+def versions_of(*models):
+    """Versión actual de cada modelo, en el mismo orden (una lectura de caché)."""
+    names = [version_name(model) for model in models]
+    keys = {name: version_key(name) for name in names}
+    cached = cache.get_many(keys.values())
+    missing = [name for name in names if keys[name] not in cached]
+    if missing:
+        ModelVersion = apps.get_model('api', 'ModelVersion')
+        # Del primario: una versión vieja de la réplica quedaría cacheada
+        with use_primary():
+            stored = dict(ModelVersion.objects.filter(name__in=missing).values_list('name', 'version'))
+        values = {keys[name]: stored.get(name, 0) for name in missing}
+        # add no pisa una versión más nueva que write_versions haya cacheado
+        # mientras se leía la tabla: se vuelve a leer lo que quedó en la caché
+        for key, version in values.items():
+            cache.add(key, version, settings.MODEL_VERSION_CACHE_TIMEOUT)
+        values.update(cache.get_many(values))
+        cached.update(values)
+    return tuple(cached[keys[name]] for name in names)
+
+
+def version_of(model):
+    return versions_of(model)[0]
+
+
+def write_versions(names):
+    """Incrementa en la tabla la versión de ``names`` y actualiza la caché."""
+    ModelVersion = apps.get_model('api', 'ModelVersion')
+    names = sorted(names)
+    now = timezone.now()
+    with transaction.atomic():
+        rows = ModelVersion.objects.filter(name__in=names)
+        if rows.update(version=models.F('version') + 1, updated_at=now) < len(names):
+            # Primera vez que cambian: crear las filas que falten e incrementarlas
+            existing = set(rows.values_list('name', flat=True))
+            new_names = [name for name in names if name not in existing]
+            ModelVersion.objects.bulk_create(
+                [ModelVersion(name=name, version=0) for name in new_names], ignore_conflicts=True
+            )
+            ModelVersion.objects.filter(name__in=new_names).update(
+                version=models.F('version') + 1, updated_at=now
+            )
+        versions = dict(rows.values_list('name', 'version'))
+    cache.set_many(
+        {version_key(name): version for name, version in versions.items()},
+        settings.MODEL_VERSION_CACHE_TIMEOUT
+    )
+
+
+# Lote activo de deferred_versions() (incrementos fuera de transacción)
+deferred = ContextVar('deferred_model_versions', default=None)
+
+
+@contextmanager
+def deferred_versions():
+    """
+    Agrupa los incrementos hechos fuera de transacciones (p. ej. una carga
+    masiva fila por fila sin atomic) y los escribe una sola vez al salir.
+    """
+    pending = PendingVersions()
+    token = deferred.set(pending)
+    try:
+        yield
+    finally:
+        deferred.reset(token)
+        if pending.names:
+            pending.flush()
+
+
+class PendingVersions:
+    """Modelos modificados en la transacción en curso; se escriben al hacer commit."""
+
+    def __init__(self):
+        self.names = set()
+
+    def flush(self):
+        write_versions(self.names)
+
+
+def bump_version(*models, using=None):
+    """
+    Marca los modelos como modificados. Dentro de una transacción el incremento
+    se hace al confirmarla (una vez por modelo); fuera de ella, de inmediato.
+    """
+    names = {version_name(model) for model in models}
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        batch = deferred.get()
+        if batch is not None:
+            batch.names |= names
+        else:
+            write_versions(names)
+        return
+    pending = getattr(connection, 'pending_model_versions', None)
+    # Si la transacción (o el savepoint) se revirtió, su callback ya no está registrado
+    if pending is None or not any(entry[1] == pending.flush for entry in connection.run_on_commit):
+        pending = connection.pending_model_versions = PendingVersions()
+        transaction.on_commit(pending.flush, using=using)
+    pending.names |= names
+
+
+class VersionedQuerySet(models.QuerySet):
+    """QuerySet que versiona el modelo también en las operaciones masivas, que no emiten señales."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            bump_version(self.model, using=self.db)
+        return created
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if rows:
+            bump_version(self.model, using=self.db)
+        return rows
+
+    bulk_update.alters_data = True
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            bump_version(self.model, using=self.db)
+        return rows
+
+    update.alters_data = True
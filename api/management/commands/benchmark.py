@@ -0,0 +1,369 @@
+import io
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import django
+import pandas as pd
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import Phase, User, Vacancy
+from api.views.prelation import PrelationViewSet
+from api.functions.renderers import MessagePackRenderer, ORJSONRenderer, msgpack
+from api.functions.synthetic import SyntheticData
+
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark de los endpoints más usados sobre una base de datos de prueba aislada '
+        '(SQLite o PostgreSQL según DATABASE_URL): latencia en frío (caché vacía) y en tibio, '
+        'consultas SQL y memoria. El esquema de la base de prueba se crea desde los modelos, sin '
+        'migraciones. Ej: python manage.py benchmark --output bench.json --compare main.json'
+    )
+
+    SCENARIOS = [
+        'vacancy-list', 'vacancy-filter', 'vacancy-preview', 'vacancy-bulk-upload',
+        'login', 'auth-me', 'prelation-list', 'phase-list',
+    ]
+    # Tiempo de serialización (render) de respuestas ya construidas, por renderer
+    RENDER_SCENARIOS = ['vacancy-page', 'prelation-list']
+
+    def add_arguments(self, parser):
+        parser.add_argument('--institutions', type=int, default=10_000)
+        parser.add_argument('--vacancies', type=int, default=100_000)
+        parser.add_argument('--users', type=int, default=20_000)
+        parser.add_argument('--upload-rows', type=int, default=500, help='Filas del Excel de preview/bulk-upload')
+        parser.add_argument('--repeat', type=int, default=10, help='Iteraciones medidas por escenario')
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--scenario', action='append', choices=self.SCENARIOS, help='Repetible; por defecto todos')
+        parser.add_argument('--render', action='append', choices=self.RENDER_SCENARIOS, help='Repetible; por defecto todos')
+        parser.add_argument('--no-render', action='store_true', help='No medir el render por renderer')
+        parser.add_argument('--keepdb', action='store_true', help='Conservar la base de prueba y sus datos entre ejecuciones')
+        parser.add_argument('--output', help='Archivo JSON de resultados')
+        parser.add_argument('--compare', help='JSON de una ejecución anterior para comparar')
+        parser.add_argument('--threshold', type=float, default=0.15, help='Regresión de latencia tolerada (0.15 = 15%%)')
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        self.options = options
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as handle:
+                baseline = json.load(handle)
+
+        old_name = connection.settings_dict['NAME']
+        # Esquema desde los modelos (como migrate --run-syncdb): en una base vacía las
+        # migraciones de admin se aplican antes de que exista api.User y fallan
+        connection.settings_dict.setdefault('TEST', {})['MIGRATE'] = False
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            self.seed()
+            results = self.run()
+            rendering = {} if options['no_render'] else self.run_rendering()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        report = {'meta': self.meta(), 'results': results, 'rendering': rendering}
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {options["output"]}'))
+
+        if baseline is not None:
+            regressions = self.compare(baseline, report)
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'Regresiones: {", ".join(regressions)}')
+
+    def meta(self):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'volumes': {
+                name: self.options[name] for name in ('institutions', 'vacancies', 'users', 'upload_rows')
+            },
+            'repeat': self.options['repeat'],
+            'seed': self.options['seed'],
+        }
+
+    # --- Datos ---
+
+    def seed(self):
+        options = self.options
+        data = SyntheticData(seed=options['seed'], prefix='BENCH', log=lambda message: self.stdout.write(f'   {message}'))
+        self.catalogs = data.catalogs()
+
+        self.phase = Phase.objects.filter(name='BENCH Fase').first()
+        if self.phase is None:
+            self.stdout.write('Generando datos...')
+            start = time.perf_counter()
+            data.prelations(self.catalogs)
+            institutions = data.institutions(self.catalogs, options['institutions'])
+            self.phase = data.phase(name='BENCH Fase', catalogs=self.catalogs)
+            data.vacancies(self.catalogs, self.phase, institutions, options['vacancies'])
+            data.users(self.catalogs, options['users'])
+            User.objects.create_superuser('bench_admin', 'bench_admin@example.com', data.password)
+            self.stdout.write(f'Datos generados en {time.perf_counter() - start:.1f}s')
+        else:
+            self.stdout.write('Reutilizando los datos de la base de prueba (--keepdb)')
+
+        self.password = data.password
+        self.admin = User.objects.get(username='bench_admin')
+        self.teacher = User.objects.filter(teacher_profile__isnull=False).order_by('id').first()
+        self.sample = Vacancy.objects.filter(phase=self.phase).select_related('educational_institution').order_by('id').first()
+        self.upload_serial = Vacancy.objects.filter(nexus_code__startswith='BENCHUP').count()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def upload_file(self, new_codes):
+        """Excel de vacantes; con ``new_codes`` usa códigos Nexus no registrados aún."""
+        vacancies = Vacancy.objects.filter(phase=self.phase).select_related(
+            'educational_institution', 'modality', 'level', 'curricular_area'
+        ).order_by('id')[:self.options['upload_rows']]
+        rows = []
+        for vacancy in vacancies:
+            if new_codes:
+                self.upload_serial += 1
+                nexus_code = f'BENCHUP{self.upload_serial:09d}'
+            else:
+                nexus_code = vacancy.nexus_code
+            rows.append({
+                'ie_code': vacancy.educational_institution.code,
+                'ie_name': vacancy.educational_institution.name,
+                'modality': vacancy.modality.abbreviature,
+                'level': vacancy.level.name,
+                'nexus_code': nexus_code,
+                'position': vacancy.position,
+                'vacancy_type': vacancy.vacancy_type,
+                'vacancy_reason': vacancy.vacancy_reason,
+                'curricular_area': vacancy.curricular_area.name if vacancy.curricular_area else None,
+            })
+        buffer = io.BytesIO()
+        pd.DataFrame(rows).to_excel(buffer, index=False)
+        return SimpleUploadedFile('vacantes.xlsx', buffer.getvalue(), content_type=XLSX_CONTENT_TYPE)
+
+    # --- Escenarios ---
+    # Cada escenario prepara lo necesario y devuelve la función que se mide.
+
+    def scenario_vacancy_list(self):
+        client = self.client_for(self.admin)
+        return lambda: client.get('/api/vacancies/')
+
+    def scenario_vacancy_filter(self):
+        client = self.client_for(self.admin)
+        params = {
+            'phase': self.phase.id, 'modality': self.sample.modality_id, 'level': self.sample.level_id, 'page': 2,
+        }
+        return lambda: client.get('/api/vacancies/', params)
+
+    def scenario_vacancy_preview(self):
+        client = self.client_for(self.admin)
+        upload = self.upload_file(new_codes=False)
+        content = upload.read()
+
+        def request():
+            upload = SimpleUploadedFile('vacantes.xlsx', content, content_type=XLSX_CONTENT_TYPE)
+            return client.post('/api/vacancies/preview/', {'file': upload, 'phase_id': self.phase.id}, format='multipart')
+        return request
+
+    def scenario_vacancy_bulk_upload(self):
+        client = self.client_for(self.admin)
+        upload = self.upload_file(new_codes=True)
+        return lambda: client.post('/api/vacancies/bulk-upload/', {'file': upload, 'phase_id': self.phase.id}, format='multipart')
+
+    def scenario_login(self):
+        client = APIClient()
+        payload = {'username': self.teacher.username, 'password': self.password}
+        return lambda: client.post('/api/auth/login/', payload, format='json')
+
+    def scenario_auth_me(self):
+        client = self.client_for(self.teacher)
+        return lambda: client.get('/api/auth/me/')
+
+    def scenario_prelation_list(self):
+        client = self.client_for(self.admin)
+        return lambda: client.get('/api/prelations/')
+
+    def scenario_phase_list(self):
+        client = self.client_for(self.admin)
+        return lambda: client.get('/api/phases/')
+
+    # --- Medición ---
+
+    def timed(self, request):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            response = request()
+            elapsed = time.perf_counter() - start
+        return response, elapsed * 1000, counter.count
+
+    def summary(self, timings):
+        timings = sorted(timings)
+        return {
+            'min': round(timings[0], 2),
+            'p50': round(statistics.median(timings), 2),
+            'p95': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            'max': round(timings[-1], 2),
+            'mean': round(statistics.fmean(timings), 2),
+        }
+
+    def measure(self, name):
+        """
+        Cada iteración vacía la caché y mide la petición en frío; luego repite la
+        petición (preparada de nuevo) en tibio, con la caché que dejó la primera.
+        """
+        prepare = getattr(self, f'scenario_{name.replace("-", "_")}')
+        cold, warm = [], []
+        cold_queries, warm_queries = [], []
+        statuses = set()
+        for iteration in range(self.options['warmup'] + self.options['repeat']):
+            cache.clear()
+            response, cold_ms, cold_count = self.timed(prepare())
+            statuses.add(response.status_code)
+            response, warm_ms, warm_count = self.timed(prepare())
+            statuses.add(response.status_code)
+            if iteration >= self.options['warmup']:
+                cold.append(cold_ms)
+                cold_queries.append(cold_count)
+                warm.append(warm_ms)
+                warm_queries.append(warm_count)
+
+        # Memoria en una ejecución aparte (en frío): tracemalloc distorsiona los tiempos
+        cache.clear()
+        request = prepare()
+        tracemalloc.start()
+        try:
+            response = request()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'status': sorted(statuses),
+            'latency_ms': self.summary(cold),
+            'warm_latency_ms': self.summary(warm),
+            'queries': max(cold_queries),
+            'warm_queries': max(warm_queries),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'response_bytes': len(response.content),
+        }
+
+    def run(self):
+        results = {}
+        self.stdout.write(
+            f'\n{"escenario":<22}{"p50 ms":>10}{"p95 ms":>10}{"consultas":>11}'
+            f'{"p50 tibio":>11}{"consultas":>11}{"memoria KB":>12}  estado'
+        )
+        for name in self.options['scenario'] or self.SCENARIOS:
+            result = results[name] = self.measure(name)
+            self.stdout.write(
+                f'{name:<22}{result["latency_ms"]["p50"]:>10.1f}{result["latency_ms"]["p95"]:>10.1f}'
+                f'{result["queries"]:>11}{result["warm_latency_ms"]["p50"]:>11.1f}{result["warm_queries"]:>11}'
+                f'{result["peak_memory_kb"]:>12.0f}  {result["status"]}'
+            )
+        return results
+
+    # --- Render ---
+
+    def renderers(self):
+        renderers = {'drf-json': JSONRenderer(), 'orjson': ORJSONRenderer()}
+        if msgpack is not None:
+            renderers['msgpack'] = MessagePackRenderer()
+        return renderers
+
+    def render_data_vacancy_page(self):
+        """Página de 100 vacantes tal como la devuelve el listado."""
+        return self.client_for(self.admin).get('/api/vacancies/', {'page_size': 100}).data
+
+    def render_data_prelation_list(self):
+        """Todas las prelaciones con el serializer del listado (sin paginar)."""
+        view = PrelationViewSet()
+        return view.serializer_class(view.queryset.all(), many=True).data
+
+    def run_rendering(self):
+        results = {}
+        self.stdout.write(f'\n{"render":<18}{"renderer":<10}{"p50 ms":>10}{"p95 ms":>10}{"bytes":>12}')
+        for name in self.options['render'] or self.RENDER_SCENARIOS:
+            data = getattr(self, f'render_data_{name.replace("-", "_")}')()
+            results[name] = {}
+            for label, renderer in self.renderers().items():
+                timings = []
+                for iteration in range(self.options['warmup'] + self.options['repeat']):
+                    start = time.perf_counter()
+                    content = renderer.render(data, renderer.media_type, {})
+                    if iteration >= self.options['warmup']:
+                        timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                result = results[name][label] = {
+                    'p50': round(statistics.median(timings), 3),
+                    'p95': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+                    'bytes': len(content),
+                }
+                self.stdout.write(f'{name:<18}{label:<10}{result["p50"]:>10.2f}{result["p95"]:>10.2f}{result["bytes"]:>12}')
+        return results
+
+    def compare(self, baseline, report):
+        threshold = self.options['threshold']
+        regressions = []
+        self.stdout.write(
+            f'\nComparación con {baseline["meta"].get("commit") or self.options["compare"]}:'
+            f'\n{"escenario":<22}{"p50 antes":>11}{"p50 ahora":>11}{"cambio":>9}{"consultas":>13}'
+        )
+        # Frío y tibio por separado; los resultados anteriores a la medición en tibio solo tienen frío
+        measures = [('', 'latency_ms', 'queries'), (' tibio', 'warm_latency_ms', 'warm_queries')]
+        for name, result in report['results'].items():
+            before = baseline['results'].get(name)
+            if before is None:
+                continue
+            for suffix, latency, queries in measures:
+                if latency not in before:
+                    continue
+                old, new = before[latency]['p50'], result[latency]['p50']
+                change = (new - old) / old if old else 0
+                regressed = change > threshold or result[queries] > before[queries]
+                if regressed:
+                    regressions.append(f'{name}{suffix}')
+                line = (
+                    f'{name + suffix:<22}{old:>11.1f}{new:>11.1f}{change:>+9.0%}'
+                    f'{before[queries]:>7} -> {result[queries]:<4}'
+                )
+                self.stdout.write(self.style.ERROR(line) if regressed else line)
+        return regressions
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, OuterRef, Q, Subquery
+
+from api.models import EducationalInstitution, Vacancy
+
+
+class Command(BaseCommand):
+    help = 'Verifica que la modalidad y el nivel desnormalizados de las vacantes coincidan con los de su IE'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Corregir las vacantes inconsistentes'
+        )
+
+    def handle(self, *args, **options):
+        with_institution = Vacancy.objects.filter(educational_institution__isnull=False)
+        mismatched = with_institution.filter(
+            Q(modality__isnull=True) |
+            Q(level__isnull=True) |
+            ~Q(modality_id=F('educational_institution__modality_id')) |
+            ~Q(level_id=F('educational_institution__level_id'))
+        )
+        orphaned = Vacancy.objects.filter(educational_institution__isnull=True).filter(
+            Q(modality__isnull=False) | Q(level__isnull=False)
+        )
+
+        mismatched_count = mismatched.count()
+        orphaned_count = orphaned.count()
+
+        if not mismatched_count and not orphaned_count:
+            self.stdout.write(self.style.SUCCESS('✅ Todas las vacantes están sincronizadas con su IE'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'   - Vacantes con modalidad/nivel distintos a su IE: {mismatched_count}'))
+        self.stdout.write(self.style.WARNING(f'   - Vacantes sin IE con modalidad/nivel: {orphaned_count}'))
+        for nexus_code in mismatched.values_list('nexus_code', flat=True)[:20]:
+            self.stdout.write(f'     {nexus_code}')
+
+        if not options['fix']:
+            self.stdout.write('\nEjecute nuevamente con --fix para corregirlas.')
+            return
+
+        institution = EducationalInstitution.objects.filter(pk=OuterRef('educational_institution_id'))
+        fixed = Vacancy.objects.filter(pk__in=mismatched.values('pk')).update(
+            modality_id=Subquery(institution.values('modality_id')[:1]),
+            level_id=Subquery(institution.values('level_id')[:1]),
+        )
+        cleared = orphaned.update(modality=None, level=None)
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Vacantes corregidas: {fixed + cleared}'))
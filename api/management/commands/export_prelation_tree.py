@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from api.functions.prelation_tree import export_prelation_tree, tree_root, tree_url
+
+
+class Command(BaseCommand):
+    help = (
+        'Exporta el árbol de prelaciones activo (un JSON con huella por modalidad más un índice) '
+        'a PRELATION_TREE_ROOT. Se ejecuta en el build después de migrate.'
+    )
+
+    def handle(self, *args, **options):
+        snapshot = export_prelation_tree()
+        self.stdout.write(f'Directorio: {tree_root()}')
+        self.stdout.write(f'   - Índice: {tree_url(snapshot["index"])}')
+        for modality_id, filename in snapshot['modalities'].items():
+            self.stdout.write(f'   - Modalidad {modality_id}: {tree_url(filename)}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Árbol de prelaciones exportado ({len(snapshot["modalities"])} modalidades)'
+        ))
@@ -0,0 +1,76 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.functions.synthetic import SyntheticData
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera datos de prueba a escala con bulk inserts y semilla determinista: catálogos, '
+        'prelaciones con requisitos, IEs, fases, vacantes y usuarios con perfil. '
+        'Ej: python manage.py generate_test_data --vacancies 1000000 --institutions 50000'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='SYN', help='Prefijo de códigos y usuarios generados')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--modalities', type=int, default=4)
+        parser.add_argument('--levels', type=int, default=5)
+        parser.add_argument('--areas', type=int, default=11)
+        parser.add_argument('--prelation-orders', type=int, default=4)
+        parser.add_argument('--no-prelations', action='store_true', help='No generar el árbol de prelaciones')
+        parser.add_argument('--institutions', type=int, default=1000)
+        parser.add_argument('--phases', type=int, default=1)
+        parser.add_argument('--vacancies', type=int, default=10_000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--evaluator-ratio', type=float, default=0.1)
+        parser.add_argument('--password', default='password123', help='Contraseña de los usuarios generados')
+        parser.add_argument('--no-demo-users', action='store_true', help='No crear las cuentas fijas (admin, teacher1, ...)')
+        parser.add_argument('--clear', action='store_true', help='Eliminar antes los datos generados con el mismo prefijo')
+
+    def handle(self, *args, **options):
+        if options['vacancies'] and not (options['institutions'] and options['phases']):
+            raise CommandError('Para generar vacantes se necesitan --institutions y --phases mayores que 0')
+
+        data = SyntheticData(
+            seed=options['seed'], prefix=options['prefix'], batch_size=options['batch_size'],
+            password=options['password'], log=lambda message: self.stdout.write(f'   {message}')
+        )
+        start = time.perf_counter()
+
+        if options['clear']:
+            self.stdout.write(self.style.WARNING(f'Eliminando datos con prefijo {options["prefix"]}...'))
+            data.clear()
+
+        self.step('Catálogos')
+        catalogs = data.catalogs(
+            modalities=options['modalities'], levels=options['levels'],
+            areas=options['areas'], orders=options['prelation_orders']
+        )
+        if not options['no_prelations']:
+            self.step('Prelaciones')
+            data.prelations(catalogs)
+
+        self.step('Instituciones educativas')
+        institutions = data.institutions(catalogs, options['institutions'])
+        self.step('Fases')
+        phases = data.phases(options['phases'], catalogs)
+        if options['vacancies']:
+            self.step('Vacantes')
+            data.vacancies(catalogs, phases, institutions, options['vacancies'])
+
+        if options['users']:
+            self.step('Usuarios')
+            data.users(catalogs, options['users'], evaluator_ratio=options['evaluator_ratio'])
+        if not options['no_demo_users']:
+            self.step('Cuentas de desarrollo')
+            created = data.demo_users(catalogs)
+            if created:
+                self.stdout.write('   admin, evaluator1, teacher1, nexus1, adjudicator1 ... / password123')
+
+        self.stdout.write(self.style.SUCCESS(f'\n✅ Datos generados en {time.perf_counter() - start:.1f}s'))
+
+    def step(self, name):
+        self.stdout.write(self.style.WARNING(f'{name}...'))
@@ -0,0 +1,178 @@
+import json
+import statistics
+import threading
+import time
+from datetime import datetime
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+DEFAULT_PATHS = ['/api/catalogs/', '/api/auth/me/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga contra un servidor en ejecución: throughput y latencia con N '
+        'conexiones concurrentes (keep-alive). Sirve para comparar el despliegue WSGI '
+        '(gunicorn backend.wsgi) con el ASGI (gunicorn backend.asgi -k uvicorn_worker.UvicornWorker). '
+        'Ej: python manage.py loadtest http://127.0.0.1:8000 --username admin --password password123 '
+        '--concurrency 10 50 200 --output asgi.json --compare wsgi.json'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='URL base del servidor, p. ej. http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths', help=f'Repetible; por defecto {DEFAULT_PATHS}')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 50, 100])
+        parser.add_argument('--duration', type=float, default=10, help='Segundos por nivel de concurrencia')
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--token', help='Access token JWT')
+        parser.add_argument('--username', help='Obtiene el token con /api/auth/login/')
+        parser.add_argument('--password')
+        parser.add_argument('--label', help='Nombre de la ejecución (p. ej. wsgi, asgi)')
+        parser.add_argument('--output', help='Archivo JSON de resultados')
+        parser.add_argument('--compare', help='JSON de otra ejecución para comparar')
+
+    def handle(self, *args, **options):
+        self.options = options
+        target = urlsplit(options['url'])
+        if target.scheme not in ('http', 'https') or not target.hostname:
+            raise CommandError('La URL debe ser http(s)://host[:puerto]')
+        self.target = target
+        paths = options['paths'] or DEFAULT_PATHS
+
+        headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        token = options['token'] or (options['username'] and self.login())
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+
+        results = {}
+        self.stdout.write(f'\n{"conexiones":>10}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"p99 ms":>10}{"errores":>9}')
+        for concurrency in options['concurrency']:
+            result = results[str(concurrency)] = self.run_level(concurrency, paths, headers)
+            self.stdout.write(
+                f'{concurrency:>10}{result["throughput"]:>10.1f}{result["latency_ms"]["p50"]:>10.1f}'
+                f'{result["latency_ms"]["p95"]:>10.1f}{result["latency_ms"]["p99"]:>10.1f}{result["errors"]:>9}'
+            )
+
+        report = {
+            'meta': {
+                'label': options['label'],
+                'url': options['url'],
+                'paths': paths,
+                'duration': options['duration'],
+                'date': datetime.now().isoformat(timespec='seconds'),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {options["output"]}'))
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as handle:
+                self.compare(json.load(handle), report)
+
+    def connect(self):
+        connection_class = HTTPSConnection if self.target.scheme == 'https' else HTTPConnection
+        return connection_class(self.target.hostname, self.target.port, timeout=self.options['timeout'])
+
+    def login(self):
+        connection = self.connect()
+        body = json.dumps({'username': self.options['username'], 'password': self.options['password']})
+        try:
+            connection.request('POST', '/api/auth/login/', body=body, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            payload = response.read()
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise CommandError(f'Login fallido ({response.status}): {payload[:200]!r}')
+        return json.loads(payload)['access']
+
+    def run_level(self, concurrency, paths, headers):
+        """Cada hilo mantiene una conexión y envía peticiones hasta agotar la duración."""
+        latencies = []
+        statuses = {}
+        errors = [0]
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(concurrency + 1)
+        deadline = [0.0]
+
+        def worker(offset):
+            own_latencies = []
+            own_statuses = {}
+            own_errors = 0
+            connection = self.connect()
+            start_barrier.wait()
+            index = offset
+            while time.perf_counter() < deadline[0]:
+                path = paths[index % len(paths)]
+                index += 1
+                start = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, HTTPException):
+                    own_errors += 1
+                    connection.close()
+                    connection = self.connect()
+                    continue
+                own_latencies.append((time.perf_counter() - start) * 1000)
+                own_statuses[response.status] = own_statuses.get(response.status, 0) + 1
+                if response.status >= 400:
+                    own_errors += 1
+            connection.close()
+            with lock:
+                latencies.extend(own_latencies)
+                for code, count in own_statuses.items():
+                    statuses[code] = statuses.get(code, 0) + count
+                errors[0] += own_errors
+
+        threads = [threading.Thread(target=worker, args=(offset,), daemon=True) for offset in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        deadline[0] = time.perf_counter() + self.options['duration']
+        started = time.perf_counter()
+        start_barrier.wait()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))], 2)
+
+        return {
+            'requests': len(latencies),
+            'throughput': round(len(latencies) / elapsed, 1),
+            'latency_ms': {
+                'p50': round(statistics.median(latencies), 2) if latencies else 0.0,
+                'p95': percentile(0.95),
+                'p99': percentile(0.99),
+                'max': round(latencies[-1], 2) if latencies else 0.0,
+            },
+            'errors': errors[0],
+            'status': {str(code): count for code, count in sorted(statuses.items())},
+        }
+
+    def compare(self, baseline, report):
+        self.stdout.write(
+            f'\nComparación con {baseline["meta"].get("label") or self.options["compare"]}:'
+            f'\n{"conexiones":>10}{"req/s antes":>13}{"req/s ahora":>13}{"cambio":>9}{"p95 antes":>11}{"p95 ahora":>11}'
+        )
+        for concurrency, result in report['results'].items():
+            before = baseline['results'].get(concurrency)
+            if before is None:
+                continue
+            old, new = before['throughput'], result['throughput']
+            change = (new - old) / old if old else 0
+            self.stdout.write(
+                f'{concurrency:>10}{old:>13.1f}{new:>13.1f}{change:>+9.0%}'
+                f'{before["latency_ms"]["p95"]:>11.1f}{result["latency_ms"]["p95"]:>11.1f}'
+            )
@@ -0,0 +1,256 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.text import compress_string
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from api.db_router import REPLICA_DB_ALIAS, read_database, replica_configured
+from api.functions.cache import make_cache_key
+from api.functions.metrics import RequestMetrics, current_metrics, log_slow_request, registry
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional: sin ella solo se usa gzip
+    brotli = None
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+jwt_authentication = JWTAuthentication()
+
+
+def accepted_encodings(request):
+    """Codificaciones de Accept-Encoding, sin las marcadas con q=0."""
+    encodings = set()
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = item.partition(';')
+        quality = params.strip().removeprefix('q=')
+        if params and quality.replace('.', '', 1).isdigit() and float(quality) == 0:
+            continue
+        if name.strip():
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def is_staff(request):
+    """
+    Si el usuario ya autenticado (por DRF o la sesión) es staff. No fuerza la
+    carga perezosa del usuario de la sesión: bajo ASGI sería una consulta desde
+    el event loop.
+    """
+    user = getattr(request, 'user', None)
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return False
+    return bool(getattr(user, 'is_staff', False))
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Comprime con brotli (si está instalado y el cliente lo acepta) o gzip las
+    respuestas JSON de al menos COMPRESSION_MIN_SIZE bytes. Las respuestas en
+    streaming (SSE, descargas) y las ya codificadas se dejan intactas.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if content_type not in settings.COMPRESSION_CONTENT_TYPES:
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        encodings = accepted_encodings(request)
+        if brotli is not None and 'br' in encodings:
+            encoding = 'br'
+            content = brotli.compress(
+                response.content, mode=brotli.MODE_TEXT, quality=settings.COMPRESSION_BROTLI_QUALITY
+            )
+        elif 'gzip' in encodings:
+            encoding = 'gzip'
+            content = compress_string(response.content)
+        else:
+            return response
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        # Los bytes cambian según la codificación: un ETag fuerte pasa a ser débil
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+class RequestMetricsMiddleware(MiddlewareMixin):
+    """
+    Registra por petición las consultas SQL (vía ``execute_wrapper`` en todas
+    las conexiones), el tiempo de render de las respuestas de DRF y el tamaño de
+    la respuesta. Agrega los valores en ``api.functions.metrics.registry``,
+    añade la cabecera Server-Timing y registra las peticiones lentas con su SQL.
+    Funciona tanto bajo WSGI como bajo ASGI.
+    """
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.REQUEST_METRICS_ENABLED:
+            return self.get_response(request)
+
+        metrics = self.new_metrics()
+        token = current_metrics.set(metrics)
+        try:
+            with self.wrap_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        return self.record(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not settings.REQUEST_METRICS_ENABLED:
+            return await self.get_response(request)
+
+        metrics = self.new_metrics()
+        token = current_metrics.set(metrics)
+        # Las conexiones son locales al hilo: el ORM asíncrono consulta desde el
+        # hilo sync de la petición, así que los wrappers se instalan en ese hilo
+        stack = await sync_to_async(self.wrap_connections)(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            current_metrics.reset(token)
+        return self.record(request, response, metrics)
+
+    def new_metrics(self):
+        return RequestMetrics(
+            record_sql=settings.REQUEST_METRICS_SLOW_MS is not None,
+            max_statements=settings.REQUEST_METRICS_MAX_STATEMENTS
+        )
+
+    def wrap_connections(self, metrics):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics))
+        return stack
+
+    def record(self, request, response, metrics):
+        total = metrics.elapsed
+        if not response.streaming:
+            metrics.response_size = len(response.content)
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        registry.observe(view, request.method, metrics, total)
+
+        # Los tiempos internos (SQL, serialización) solo se exponen a staff o en desarrollo
+        if settings.REQUEST_METRICS_SERVER_TIMING or is_staff(request):
+            response['Server-Timing'] = metrics.server_timing(total)
+        if settings.REQUEST_METRICS_SLOW_MS is not None and total * 1000 >= settings.REQUEST_METRICS_SLOW_MS:
+            log_slow_request(request, metrics, total)
+        return response
+
+    def process_template_response(self, request, response):
+        # Las respuestas de DRF se renderizan después de este hook
+        metrics = current_metrics.get()
+        if metrics is not None:
+            start = time.perf_counter()
+
+            def rendered(response):
+                metrics.render_time += time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """
+    Las peticiones de solo lectura leen de la réplica. Tras una escritura
+    (POST, PUT, PATCH, DELETE) el mismo cliente lee del primario durante
+    READ_REPLICA_STICKY_SECONDS, para ver sus propios cambios aunque la réplica
+    vaya con retraso. El cliente se identifica por el usuario de su JWT (así
+    sigue valiendo tras refrescar el token) y, sin él, por una cookie.
+    """
+    cookie_name = 'db_primary_until'
+
+    def sticky_key(self, request):
+        header = request.META.get('HTTP_AUTHORIZATION')
+        raw_token = header and jwt_authentication.get_raw_token(header.encode('iso-8859-1'))
+        if not raw_token:
+            return None
+        try:
+            # Solo verifica firma y expiración; el usuario no se consulta
+            user_id = jwt_authentication.get_validated_token(raw_token)[jwt_settings.USER_ID_CLAIM]
+        except (InvalidToken, KeyError):
+            return None
+        return make_cache_key('db-primary', user_id)
+
+    def is_sticky(self, request, key):
+        try:
+            if float(request.COOKIES.get(self.cookie_name, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        return key is not None and cache.get(key) is not None
+
+    def select_database(self, request):
+        key = self.sticky_key(request)
+        reads_from_replica = request.method in SAFE_METHODS and not self.is_sticky(request, key)
+        token = read_database.set(REPLICA_DB_ALIAS if reads_from_replica else DEFAULT_DB_ALIAS)
+        return key, token
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_configured():
+            return self.get_response(request)
+
+        key, token = self.select_database(request)
+        try:
+            response = self.get_response(request)
+        except Exception:
+            read_database.reset(token)
+            raise
+        return self.finish(request, response, key, token)
+
+    async def __acall__(self, request):
+        if not replica_configured():
+            return await self.get_response(request)
+
+        key, token = self.select_database(request)
+        try:
+            response = await self.get_response(request)
+        except Exception:
+            read_database.reset(token)
+            raise
+        return self.finish(request, response, key, token)
+
+    def finish(self, request, response, key, token):
+        # Las respuestas en streaming se generan después de salir del middleware
+        if not response.streaming:
+            read_database.reset(token)
+
+        if request.method not in SAFE_METHODS:
+            window = settings.READ_REPLICA_STICKY_SECONDS
+            if key is not None:
+                cache.set(key, 1, window)
+            secure = settings.READ_REPLICA_COOKIE_SECURE
+            response.set_cookie(
+                self.cookie_name, str(time.time() + window), max_age=window,
+                httponly=True, samesite='None' if secure else 'Lax', secure=secure
+            )
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_modality_level(apps, schema_editor):
+    Vacancy = apps.get_model('api', 'Vacancy')
+    EducationalInstitution = apps.get_model('api', 'EducationalInstitution')
+    institution = EducationalInstitution.objects.filter(pk=OuterRef('educational_institution_id'))
+    Vacancy.objects.filter(educational_institution__isnull=False).update(
+        modality_id=Subquery(institution.values('modality_id')[:1]),
+        level_id=Subquery(institution.values('level_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_alter_educationalinstitution_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacancy',
+            name='level',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='vacancies', to='api.level'),
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='modality',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='vacancies', to='api.modality'),
+        ),
+        migrations.RunPython(backfill_modality_level, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['phase', 'modality', 'level', 'curricular_area'], name='api_vacancy_phase_mod_lvl_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0019_vacancy_modality_level_denormalization'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='convocatoriaadjudicacion',
+            name='phase',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='convocatorias', to='api.phase'),
+        ),
+        migrations.CreateModel(
+            name='AdjudicationCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('merit_position', models.PositiveIntegerField(help_text='Puesto en el cuadro de mérito')),
+                ('score', models.DecimalField(blank=True, decimal_places=3, max_digits=7, null=True)),
+                ('preferred_vacancies', models.JSONField(blank=True, default=list, help_text='Códigos Nexus en orden de preferencia')),
+                ('status', models.CharField(choices=[('PENDING', 'Pendiente'), ('ADJUDICATED', 'Adjudicado'), ('DECLINED', 'Desistió / No se presentó')], default='PENDING', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('convocatoria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidates', to='api.convocatoriaadjudicacion')),
+                ('prelation_order', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='adjudication_candidates', to='api.prelationorder')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='adjudication_candidacies', to='api.teacherprofile')),
+            ],
+            options={
+                'verbose_name': 'Postulante de Adjudicación',
+                'verbose_name_plural': 'Postulantes de Adjudicación',
+                'db_table': 'api_adjudication_candidate',
+                'ordering': ['prelation_order_id', 'merit_position'],
+                'unique_together': {('convocatoria', 'teacher')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Adjudication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('convocatoria', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adjudications', to='api.convocatoriaadjudicacion')),
+                ('vacancy', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='adjudications', to='api.vacancy')),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adjudications', to='api.adjudicationcandidate')),
+            ],
+            options={
+                'verbose_name': 'Adjudicación',
+                'verbose_name_plural': 'Adjudicaciones',
+                'db_table': 'api_adjudication',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['convocatoria', 'updated_at'], name='api_adjud_conv_updated_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('vacancy',), name='unique_active_adjudication_vacancy'), models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('candidate',), name='unique_active_adjudication_candidate')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.4 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_adjudication'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModelVersion',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Versión de Modelo',
+                'verbose_name_plural': 'Versiones de Modelos',
+                'db_table': 'api_model_version',
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.4 on 2026-10-19 18:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('PREVIEW', 'Previsualización'), ('BULK_UPLOAD', 'Carga masiva'), ('IMPORT', 'Importación')], max_length=20)),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('dry_run', models.BooleanField(default=False)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('valid_count', models.PositiveIntegerField(default=0)),
+                ('invalid_count', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('error_counts', models.JSONField(blank=True, default=dict, help_text='Filas con cada tipo de error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('phase', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='import_reports', to='api.phase')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_reports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Reporte de Importación',
+                'verbose_name_plural': 'Reportes de Importación',
+                'db_table': 'api_import_report',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportReportRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sheet', models.CharField(blank=True, max_length=255)),
+                ('row', models.PositiveIntegerField(help_text='Número de fila en la hoja de Excel')),
+                ('data', models.JSONField(default=dict)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('suggestions', models.JSONField(blank=True, default=dict)),
+                ('error_types', models.CharField(blank=True, max_length=255)),
+                ('is_valid', models.BooleanField(default=True)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rows', to='api.importreport')),
+            ],
+            options={
+                'verbose_name': 'Fila de Reporte de Importación',
+                'verbose_name_plural': 'Filas de Reportes de Importación',
+                'db_table': 'api_import_report_row',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['report', 'is_valid', 'id'], name='api_import_row_valid_idx')],
+            },
+        ),
+    ]
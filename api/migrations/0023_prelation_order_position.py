@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-19 19:10
+
+from django.db import migrations, models
+
+
+def number_orders(apps, schema_editor):
+    # Hasta ahora el orden de las prelaciones era el de su id
+    PrelationOrder = apps.get_model('api', 'PrelationOrder')
+    for order in PrelationOrder.objects.order_by('id'):
+        PrelationOrder.objects.filter(id=order.id).update(position=order.id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_import_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prelationorder',
+            name='position',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(number_orders, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='prelationorder',
+            options={'ordering': ['position', 'id']},
+        ),
+        migrations.AlterModelOptions(
+            name='adjudicationcandidate',
+            options={
+                'ordering': ['prelation_order__position', 'prelation_order_id', 'merit_position'],
+                'verbose_name': 'Postulante de Adjudicación',
+                'verbose_name_plural': 'Postulantes de Adjudicación',
+            },
+        ),
+    ]
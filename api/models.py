@@ -4,6 +4,8 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import AbstractUser
 
+from api.functions.versions import VersionedQuerySet
+
 class Person(models.Model):
     first_name = models.CharField(max_length=30)
     paternal_surname = models.CharField(max_length=30)
@@ -20,6 +22,8 @@ class Modality(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    objects = VersionedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.abbreviature} - {self.name}"
 
@@ -28,6 +32,8 @@ class Level(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    objects = VersionedQuerySet.as_manager()
+
     def __str__(self):
         return self.name
     
@@ -36,12 +42,21 @@ class CurricularArea(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    objects = VersionedQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
 class PrelationOrder(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    # Orden en que se atienden las prelaciones (1 = primera)
+    position = models.PositiveIntegerField(default=0)
     
+    objects = VersionedQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['position', 'id']
+
     def __str__(self):
         return self.name
     
@@ -54,6 +69,8 @@ class Prelation(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    objects = VersionedQuerySet.as_manager()
+
     class Meta:
         unique_together = ('modality', 'curricular_area', 'order')
 
@@ -70,6 +87,8 @@ class PrelationRequirement(models.Model):
     
     is_active = models.BooleanField(default=True)
 
+    objects = VersionedQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.logic_type} - {self.text} (Group {self.group})"
 
@@ -164,6 +183,8 @@ class ContractingProcess(models.Model):
     #Comproar si ya se activó la fase de evaluación por expedientes
     files_evaluation_enabled = models.BooleanField(default=False)
 
+    objects = VersionedQuerySet.as_manager()
+
     def __str__(self):
         return self.Name
 
@@ -182,6 +203,8 @@ class Stage(models.Model):
 
     is_qualifiable = models.BooleanField(default=False)
 
+    objects = VersionedQuerySet.as_manager()
+
     class Meta:
         ordering = ['order']
 
@@ -206,6 +229,11 @@ class ConvocatoriaAdjudicacion(models.Model):
     
     # Estado de esta convocatoria específica
     finalizada = models.BooleanField(default=False)
+    
+    # Fase cuyas vacantes se adjudican en esta convocatoria
+    phase = models.ForeignKey('Phase', on_delete=models.PROTECT, related_name='convocatorias', null=True, blank=True)
+
+    objects = VersionedQuerySet.as_manager()
 
     class Meta:
         ordering = ['numero_convocatoria']
@@ -361,6 +389,8 @@ class Phase(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = VersionedQuerySet.as_manager()
+
     class Meta:
         db_table = 'api_phase'
         verbose_name = 'Fase'
@@ -390,6 +420,8 @@ class PhaseStage(models.Model):
     start_date = models.DateTimeField()
     end_date = models.DateTimeField()
     
+    objects = VersionedQuerySet.as_manager()
+
     class Meta:
         db_table = 'api_phase_stage'
         verbose_name = 'Etapa de Fase'
@@ -418,6 +450,8 @@ class PhaseAssignment(models.Model):
     
     notes = models.TextField(blank=True)
     
+    objects = VersionedQuerySet.as_manager()
+
     class Meta:
         db_table = 'api_phase_assignment'
         verbose_name = 'Adjudicación de Fase'
@@ -443,6 +477,8 @@ class EducationalInstitution(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, null=True)
     updated_at = models.DateTimeField(auto_now=True, null=True)
     
+    objects = VersionedQuerySet.as_manager()
+
     class Meta:
         db_table = 'api_educational_institution'
         verbose_name = 'Institución Educativa'
@@ -452,6 +488,15 @@ class EducationalInstitution(models.Model):
     
     def __str__(self):
         return f"{self.code} - {self.name}"
+    
+    def save(self, *args, **kwargs):
+        is_new = self.pk is None
+        super().save(*args, **kwargs)
+        if not is_new:
+            # Propagar modalidad y nivel a las columnas desnormalizadas de sus vacantes
+            self.vacancies.exclude(
+                modality_id=self.modality_id, level_id=self.level_id
+            ).update(modality_id=self.modality_id, level_id=self.level_id)
 
 
 class Vacancy(models.Model):
@@ -486,15 +531,187 @@ class Vacancy(models.Model):
     vacancy_reason = models.CharField(max_length=30, choices=VACANCY_REASON_CHOICES, null=True)
     curricular_area = models.ForeignKey('CurricularArea', on_delete=models.PROTECT, null=True, blank=True)
     
+    # Copia desnormalizada de la modalidad y nivel de la IE para filtrar sin JOIN.
+    # Se mantienen en save() de Vacancy y de EducationalInstitution.
+    modality = models.ForeignKey('Modality', on_delete=models.PROTECT, null=True, blank=True, editable=False, related_name='vacancies')
+    level = models.ForeignKey('Level', on_delete=models.PROTECT, null=True, blank=True, editable=False, related_name='vacancies')
+    
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True, null=True)
     updated_at = models.DateTimeField(auto_now=True, null=True)
     
+    objects = VersionedQuerySet.as_manager()
+
     class Meta:
         db_table = 'api_vacancy'
         verbose_name = 'Vacante'
         verbose_name_plural = 'Vacantes'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['phase', 'modality', 'level', 'curricular_area'], name='api_vacancy_phase_mod_lvl_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.nexus_code} - {self.educational_institution.name} - {self.position}"
+    
+    def save(self, *args, **kwargs):
+        if self.educational_institution_id:
+            self.modality_id = self.educational_institution.modality_id
+            self.level_id = self.educational_institution.level_id
+        else:
+            self.modality_id = None
+            self.level_id = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'educational_institution' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'modality', 'level'}
+        super().save(*args, **kwargs)
+
+
+class ImportReport(models.Model):
+    """
+    Resultado de una previsualización, carga masiva o importación de vacantes.
+    Las filas (válidas e inválidas) se guardan en ImportReportRow y se consultan
+    paginadas o se descargan como Excel anotado (ver api.functions.import_reports).
+    """
+    SOURCE_CHOICES = [
+        ('PREVIEW', 'Previsualización'),
+        ('BULK_UPLOAD', 'Carga masiva'),
+        ('IMPORT', 'Importación'),
+    ]
+    
+    user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='import_reports')
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    filename = models.CharField(max_length=255, blank=True)
+    phase = models.ForeignKey(Phase, on_delete=models.SET_NULL, null=True, blank=True, related_name='import_reports')
+    dry_run = models.BooleanField(default=False)
+    
+    total = models.PositiveIntegerField(default=0)
+    valid_count = models.PositiveIntegerField(default=0)
+    invalid_count = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_counts = models.JSONField(default=dict, blank=True, help_text='Filas con cada tipo de error')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'api_import_report'
+        verbose_name = 'Reporte de Importación'
+        verbose_name_plural = 'Reportes de Importación'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.get_source_display()} - {self.filename} ({self.created_at:%Y-%m-%d %H:%M})"
+
+
+class ImportReportRow(models.Model):
+    """
+    Fila de un reporte de importación con sus valores y errores.
+    """
+    report = models.ForeignKey(ImportReport, on_delete=models.CASCADE, related_name='rows')
+    sheet = models.CharField(max_length=255, blank=True)
+    row = models.PositiveIntegerField(help_text='Número de fila en la hoja de Excel')
+    data = models.JSONField(default=dict)
+    errors = models.JSONField(default=list, blank=True)
+    suggestions = models.JSONField(default=dict, blank=True)
+    # Tipos de error separados por comas (",modality,level,") para filtrar con __contains
+    error_types = models.CharField(max_length=255, blank=True)
+    is_valid = models.BooleanField(default=True)
+    
+    class Meta:
+        db_table = 'api_import_report_row'
+        verbose_name = 'Fila de Reporte de Importación'
+        verbose_name_plural = 'Filas de Reportes de Importación'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['report', 'is_valid', 'id'], name='api_import_row_valid_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.report_id} - {self.sheet} fila {self.row}"
+
+
+# --- Adjudication Models ---
+
+class AdjudicationCandidate(models.Model):
+    """
+    Postulante de una convocatoria de adjudicación.
+    Se adjudica por orden de prelación y, dentro de cada prelación, por puesto en el cuadro de mérito.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pendiente'),
+        ('ADJUDICATED', 'Adjudicado'),
+        ('DECLINED', 'Desistió / No se presentó'),
+    ]
+    
+    convocatoria = models.ForeignKey(ConvocatoriaAdjudicacion, on_delete=models.CASCADE, related_name='candidates')
+    teacher = models.ForeignKey('TeacherProfile', on_delete=models.PROTECT, related_name='adjudication_candidacies')
+    prelation_order = models.ForeignKey('PrelationOrder', on_delete=models.PROTECT, related_name='adjudication_candidates')
+    merit_position = models.PositiveIntegerField(help_text='Puesto en el cuadro de mérito')
+    score = models.DecimalField(max_digits=7, decimal_places=3, null=True, blank=True)
+    preferred_vacancies = models.JSONField(default=list, blank=True, help_text='Códigos Nexus en orden de preferencia')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = VersionedQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'api_adjudication_candidate'
+        verbose_name = 'Postulante de Adjudicación'
+        verbose_name_plural = 'Postulantes de Adjudicación'
+        ordering = ['prelation_order__position', 'prelation_order_id', 'merit_position']
+        unique_together = ('convocatoria', 'teacher')
+    
+    def __str__(self):
+        return f"{self.convocatoria.nombre} - {self.merit_position}. {self.teacher.user.username}"
+
+
+class Adjudication(models.Model):
+    """
+    Vacante adjudicada a un postulante. Al liberar la plaza (renuncia) se desactiva
+    y la vacante vuelve a estar disponible.
+    """
+    convocatoria = models.ForeignKey(ConvocatoriaAdjudicacion, on_delete=models.CASCADE, related_name='adjudications')
+    candidate = models.ForeignKey(AdjudicationCandidate, on_delete=models.CASCADE, related_name='adjudications')
+    vacancy = models.ForeignKey('Vacancy', on_delete=models.PROTECT, related_name='adjudications')
+    
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = VersionedQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'api_adjudication'
+        verbose_name = 'Adjudicación'
+        verbose_name_plural = 'Adjudicaciones'
+        ordering = ['created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['vacancy'], condition=models.Q(is_active=True), name='unique_active_adjudication_vacancy'),
+            models.UniqueConstraint(fields=['candidate'], condition=models.Q(is_active=True), name='unique_active_adjudication_candidate'),
+        ]
+        indexes = [
+            models.Index(fields=['convocatoria', 'updated_at'], name='api_adjud_conv_updated_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.vacancy.nexus_code} -> {self.candidate}"
+
+
+class ModelVersion(models.Model):
+    """
+    Versión de los datos de un modelo o colección. Se incrementa con cada
+    cambio confirmado (ver api.functions.versions).
+    """
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'api_model_version'
+        verbose_name = 'Versión de Modelo'
+        verbose_name_plural = 'Versiones de Modelos'
     
     def __str__(self):
-        return f"{self.nexus_code} - {self.educational_institution.name} - {self.position}"
\ No newline at end of file
+        return f"{self.name} v{self.version}"
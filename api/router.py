@@ -7,6 +7,12 @@ from api.views import (
 )
 from api.views.phase import PhaseViewSet, PhaseStageViewSet, PhaseAssignmentViewSet
 from api.views.vacancy import EducationalInstitutionViewSet, VacancyViewSet
+from api.views.evaluator_queue import EvaluatorQueueViewSet
+from api.views.import_template import ImportTemplateViewSet
+from api.views.adjudication import ConvocatoriaAdjudicacionViewSet
+from api.views.contracting_process import ContractingProcessViewSet, StageViewSet
+from api.views.upload import UploadViewSet
+from api.views.import_report import ImportReportViewSet
 
 router = DefaultRouter()
 router.register(r'modalities', ModalityViewSet, basename='modality')
@@ -25,6 +31,19 @@ router.register(r'phase-assignments', PhaseAssignmentViewSet, basename='phase-as
 # Vacancy endpoints
 router.register(r'educational-institutions', EducationalInstitutionViewSet, basename='educational-institution')
 router.register(r'vacancies', VacancyViewSet, basename='vacancy')
+router.register(r'import-templates', ImportTemplateViewSet, basename='import-template')
+router.register(r'uploads', UploadViewSet, basename='upload')
+router.register(r'import-reports', ImportReportViewSet, basename='import-report')
+
+# Evaluator endpoints
+router.register(r'evaluator-queue', EvaluatorQueueViewSet, basename='evaluator-queue')
+
+# Contracting process endpoints
+router.register(r'contracting-processes', ContractingProcessViewSet, basename='contracting-process')
+router.register(r'stages', StageViewSet, basename='stage')
+
+# Adjudication endpoints
+router.register(r'convocatorias', ConvocatoriaAdjudicacionViewSet, basename='convocatoria')
 
 # Auth endpoints
 router.register(r'auth/groups', GroupViewSet, basename='group')
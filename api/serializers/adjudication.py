@@ -0,0 +1,52 @@
+from rest_framework import serializers
+from api.models import ConvocatoriaAdjudicacion, AdjudicationCandidate, Adjudication, StageType
+
+
+class ConvocatoriaAdjudicacionSerializer(serializers.ModelSerializer):
+    phase_name = serializers.CharField(source='phase.name', read_only=True, allow_null=True)
+    candidates_count = serializers.IntegerField(read_only=True)
+    adjudications_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = ConvocatoriaAdjudicacion
+        fields = [
+            'id', 'stage', 'numero_convocatoria', 'nombre', 'fecha_hora', 'lugar_o_enlace',
+            'finalizada', 'phase', 'phase_name', 'candidates_count', 'adjudications_count'
+        ]
+        read_only_fields = ['id']
+
+    def validate_stage(self, value):
+        if value.type != StageType.Adjudication:
+            raise serializers.ValidationError('Solo se pueden crear convocatorias en etapas de Adjudicación.')
+        return value
+
+
+class AdjudicationCandidateSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='teacher.user.username', read_only=True)
+    full_name = serializers.CharField(source='teacher.user.get_full_name', read_only=True)
+    prelation_order_name = serializers.CharField(source='prelation_order.name', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = AdjudicationCandidate
+        fields = [
+            'id', 'convocatoria', 'teacher', 'username', 'full_name',
+            'prelation_order', 'prelation_order_name', 'merit_position', 'score',
+            'preferred_vacancies', 'status', 'status_display'
+        ]
+        read_only_fields = ['id', 'convocatoria', 'status']
+
+
+class AdjudicationSerializer(serializers.ModelSerializer):
+    nexus_code = serializers.CharField(source='vacancy.nexus_code', read_only=True)
+    ie_name = serializers.CharField(source='vacancy.educational_institution.name', read_only=True, allow_null=True)
+    candidate_username = serializers.CharField(source='candidate.teacher.user.username', read_only=True)
+    merit_position = serializers.IntegerField(source='candidate.merit_position', read_only=True)
+
+    class Meta:
+        model = Adjudication
+        fields = [
+            'id', 'convocatoria', 'candidate', 'candidate_username', 'merit_position',
+            'vacancy', 'nexus_code', 'ie_name', 'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+from api.models import ContractingProcess, Stage
+from api.functions.timeline import ScheduleError, validate_stage_schedule
+
+
+class StageSerializer(serializers.ModelSerializer):
+    type_display = serializers.CharField(source='get_type_display', read_only=True)
+    is_scheduled = serializers.BooleanField(source='esta_programada', read_only=True)
+
+    class Meta:
+        model = Stage
+        fields = [
+            'id', 'stage', 'name', 'type', 'type_display', 'order',
+            'start_date', 'end_date', 'is_scheduled', 'is_qualifiable'
+        ]
+        read_only_fields = ['id']
+
+    def validate(self, data):
+        def value(field):
+            if field in data:
+                return data[field]
+            return getattr(self.instance, field, None)
+
+        process = value('stage')
+        try:
+            validate_stage_schedule(
+                process.id, getattr(self.instance, 'id', None), value('name'), value('order'),
+                value('start_date'), value('end_date')
+            )
+        except ScheduleError as exc:
+            raise serializers.ValidationError({'start_date': str(exc)})
+        return data
+
+
+class StageScheduleSerializer(serializers.Serializer):
+    """Fechas de una etapa dentro de la programación masiva del proceso."""
+    id = serializers.IntegerField()
+    start_date = serializers.DateField(allow_null=True)
+    end_date = serializers.DateField(allow_null=True)
+
+
+class ContractingProcessSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source='Name', max_length=100)
+    stages = StageSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ContractingProcess
+        fields = ['id', 'name', 'year', 'is_active', 'files_evaluation_enabled', 'stages']
+        read_only_fields = ['id']
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from api.models import TeacherProfile
+
+
+class EvaluatorQueueTeacherSerializer(serializers.ModelSerializer):
+    """Serializer ligero de docentes para la cola de trabajo del evaluador"""
+    id = serializers.IntegerField(source='user_id', read_only=True)
+    username = serializers.CharField(source='user.username', read_only=True)
+    full_name = serializers.CharField(source='user.get_full_name', read_only=True)
+    modality_name = serializers.CharField(source='modality.name', read_only=True)
+    level_name = serializers.CharField(source='level.name', read_only=True)
+    curricular_area_name = serializers.CharField(source='curricular_area.name', read_only=True)
+
+    class Meta:
+        model = TeacherProfile
+        fields = [
+            'id', 'username', 'full_name',
+            'modality', 'modality_name',
+            'level', 'level_name',
+            'curricular_area', 'curricular_area_name'
+        ]
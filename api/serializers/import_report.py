@@ -0,0 +1,36 @@
+from rest_framework import serializers
+from rest_framework.reverse import reverse
+from api.models import ImportReport, ImportReportRow
+
+
+class ImportReportSerializer(serializers.ModelSerializer):
+    source_display = serializers.CharField(source='get_source_display', read_only=True)
+    rows_url = serializers.SerializerMethodField()
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportReport
+        fields = [
+            'id', 'source', 'source_display', 'filename', 'phase', 'dry_run',
+            'total', 'valid_count', 'invalid_count', 'created_count', 'error_counts',
+            'rows_url', 'download_url', 'created_at'
+        ]
+        read_only_fields = fields
+
+    def get_rows_url(self, obj):
+        return reverse('import-report-rows', args=[obj.pk], request=self.context.get('request'))
+
+    def get_download_url(self, obj):
+        return reverse('import-report-download', args=[obj.pk], request=self.context.get('request'))
+
+
+class ImportReportRowSerializer(serializers.ModelSerializer):
+    error_types = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportReportRow
+        fields = ['id', 'sheet', 'row', 'data', 'is_valid', 'errors', 'error_types', 'suggestions']
+        read_only_fields = fields
+
+    def get_error_types(self, obj):
+        return [code for code in obj.error_types.split(',') if code]
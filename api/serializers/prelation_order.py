@@ -5,4 +5,4 @@ from api.models import PrelationOrder
 class PrelationOrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = PrelationOrder
-        fields = ['id', 'name']
+        fields = ['id', 'name', 'position']
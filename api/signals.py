@@ -0,0 +1,67 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.models import (
+    Adjudication, AdjudicationCandidate, ContractingProcess, ConvocatoriaAdjudicacion, CurricularArea,
+    EducationalInstitution, EvaluatorProfile, Group, Level, Modality, Phase, PhaseAssignment, PhaseStage,
+    Prelation, PrelationOrder, PrelationRequirement, Stage, TeacherProfile, User, Vacancy
+)
+from api.functions.evaluator_scope import invalidate_evaluator_scope
+from api.functions.versions import bump_version
+
+
+@receiver(m2m_changed, sender=EvaluatorProfile.modalities.through)
+@receiver(m2m_changed, sender=EvaluatorProfile.levels.through)
+@receiver(m2m_changed, sender=EvaluatorProfile.curricular_areas.through)
+def evaluator_scope_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidar el alcance cacheado cuando cambian las asignaciones del evaluador."""
+    if reverse:
+        # Cambio desde la modalidad/nivel/área: puede afectar a varios evaluadores
+        if action == 'pre_clear':
+            user_ids = sender.objects.filter(
+                **{sender._meta.get_field(instance._meta.model_name).attname: instance.pk}
+            ).values_list('evaluatorprofile_id', flat=True)
+        elif action in ('post_add', 'post_remove'):
+            user_ids = pk_set
+        else:
+            return
+        for user_id in user_ids:
+            invalidate_evaluator_scope(user_id)
+    elif action.startswith('post_'):
+        invalidate_evaluator_scope(instance.pk)
+
+
+@receiver(post_delete, sender=EvaluatorProfile)
+def evaluator_profile_deleted(sender, instance, **kwargs):
+    invalidate_evaluator_scope(instance.pk)
+
+
+# Versión por modelo (api.functions.versions) para claves de caché y ETags
+VERSIONED_MODELS = (
+    Modality, Level, CurricularArea, PrelationOrder, Prelation, PrelationRequirement,
+    Phase, PhaseStage, PhaseAssignment, EducationalInstitution, Vacancy,
+    ContractingProcess, Stage, ConvocatoriaAdjudicacion, AdjudicationCandidate, Adjudication,
+    User, Group, TeacherProfile, EvaluatorProfile,
+)
+VERSIONED_RELATIONS = {
+    Prelation.level.through: Prelation,
+    EvaluatorProfile.modalities.through: EvaluatorProfile,
+    EvaluatorProfile.levels.through: EvaluatorProfile,
+    EvaluatorProfile.curricular_areas.through: EvaluatorProfile,
+}
+
+
+def model_changed(sender, **kwargs):
+    bump_version(sender)
+
+
+def relation_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version(VERSIONED_RELATIONS[sender])
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(model_changed, sender=model, dispatch_uid=f'model-version-save-{model.__name__}')
+    post_delete.connect(model_changed, sender=model, dispatch_uid=f'model-version-delete-{model.__name__}')
+for through in VERSIONED_RELATIONS:
+    m2m_changed.connect(relation_changed, sender=through, dispatch_uid=f'model-version-m2m-{through.__name__}')
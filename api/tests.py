@@ -1,3 +1,885 @@
-from django.test import TestCase
+import gzip
+import hashlib
+import io
+import json
+import os
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from openpyxl import Workbook, load_workbook
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.models import (
+    Adjudication, AdjudicationCandidate, ContractingProcess, ConvocatoriaAdjudicacion, CurricularArea,
+    EducationalInstitution, EvaluatorProfile, ImportReport, Level, Modality, Phase, Prelation, PrelationOrder, Stage,
+    StageType, TeacherProfile, User, Vacancy
+)
+from api.functions.adjudication import (
+    AdjudicationConflict, AdjudicationError, AdjudicationSession, forget_session, get_session, run_adjudication
+)
+from api.functions import documents, reports
+from api.functions.cache import get_or_compute, make_cache_key
+from api.functions.events import convocatoria_events
+from api.functions.export import VACANCY_EXPORT_COLUMNS
+from api.functions.import_reports import XLSX_HEADER, filter_rows
+from api.functions.renderers import ORJSONRenderer
+from api.functions.timeline import build_timeline, get_timeline, schedule_errors
+from api.functions.uploads import LOCK_FILENAME, upload_dir, upload_path
+from api.functions.vacancy_import import import_vacancies
+from api.functions.vacancy_sheets import OPTIONAL_COLUMNS, REQUIRED_COLUMNS
+from api.views.vacancy import VacancyViewSet
+from api.functions.versions import bump_version, version_key, version_of, versions_of, write_versions
+
+
+# Columnas de la plantilla, sin phase_id (la fase se indica al importar)
+IMPORT_COLUMNS = REQUIRED_COLUMNS + OPTIONAL_COLUMNS[:1]
+
+
+class AdjudicationEngineTests(TestCase):
+    """Motor de adjudicación: orden de atención, elecciones y conflictos."""
+
+    def setUp(self):
+        self.modality = Modality.objects.create(name='Educación Básica Regular', abbreviature='EBR')
+        self.level = Level.objects.create(name='Secundaria')
+        self.area = CurricularArea.objects.create(name='Matemática')
+        self.phase = Phase.objects.create(name='Fase 1', year=2026)
+        institution = EducationalInstitution.objects.create(
+            code='0000001', name='IE 1', modality=self.modality, level=self.level
+        )
+        self.vacancies = [
+            Vacancy.objects.create(
+                phase=self.phase, educational_institution=institution, nexus_code=f'N{index}',
+                position='DOCENTE', vacancy_type='ORGANICA', vacancy_reason='LICENCIA', curricular_area=self.area
+            )
+            for index in range(3)
+        ]
+        # La segunda prelación se crea primero: el orden lo da position, no el id
+        self.second_order = PrelationOrder.objects.create(name='Segunda', position=2)
+        self.first_order = PrelationOrder.objects.create(name='Primera', position=1)
+
+        process = ContractingProcess.objects.create(Name='Proceso', year=2026)
+        self.stage = Stage.objects.create(stage=process, name='Adjudicación', type=StageType.Adjudication, order=1)
+        self.convocatoria = self.create_convocatoria(1)
+        self.candidates = {
+            name: self.create_candidate(self.convocatoria, name, order, merit)
+            for name, order, merit in (
+                ('b', self.second_order, 1),
+                ('a2', self.first_order, 2),
+                ('a1', self.first_order, 1),
+                ('a3', self.first_order, 3),
+            )
+        }
+
+    def create_convocatoria(self, number):
+        convocatoria = ConvocatoriaAdjudicacion.objects.create(
+            stage=self.stage, numero_convocatoria=number, nombre=f'Convocatoria {number}',
+            fecha_hora=timezone.now(), lugar_o_enlace='UGEL', phase=self.phase
+        )
+        self.addCleanup(forget_session, convocatoria.id)
+        return convocatoria
+
+    def create_candidate(self, convocatoria, username, order, merit, **kwargs):
+        user = User.objects.create_user(f'{username}-{convocatoria.id}', password='x')
+        teacher = TeacherProfile.objects.create(
+            user=user, modality=self.modality, level=self.level, curricular_area=self.area
+        )
+        return AdjudicationCandidate.objects.create(
+            convocatoria=convocatoria, teacher=teacher, prelation_order=order, merit_position=merit, **kwargs
+        )
+
+    def nexus_codes(self):
+        return {
+            adjudication.candidate_id: adjudication.vacancy.nexus_code
+            for adjudication in Adjudication.objects.filter(is_active=True).select_related('vacancy')
+        }
+
+    def test_run_follows_prelation_position_and_merit(self):
+        adjudications, unassigned = run_adjudication(self.convocatoria.id)
+
+        self.assertEqual(len(adjudications), 3)
+        self.assertEqual(unassigned, [self.candidates['b']])
+        self.assertEqual(self.nexus_codes(), {
+            self.candidates['a1'].id: 'N0',
+            self.candidates['a2'].id: 'N1',
+            self.candidates['a3'].id: 'N2',
+        })
+
+    def test_run_honours_preferences(self):
+        AdjudicationCandidate.objects.filter(id=self.candidates['a1'].id).update(preferred_vacancies=['N2'])
+
+        run_adjudication(self.convocatoria.id)
+
+        codes = self.nexus_codes()
+        self.assertEqual(codes[self.candidates['a1'].id], 'N2')
+        self.assertEqual(codes[self.candidates['a2'].id], 'N0')
+
+    def test_pick_only_next_candidate(self):
+        session = get_session(self.convocatoria)
+
+        with self.assertRaises(AdjudicationError):
+            session.pick(self.candidates['a2'].id)
+        adjudication = session.pick(self.candidates['a1'].id, self.vacancies[1].id)
+
+        self.assertEqual(adjudication.vacancy_id, self.vacancies[1].id)
+        self.assertEqual(session.next_candidate().id, self.candidates['a2'].id)
+        with self.assertRaises(AdjudicationError):
+            session.pick(self.candidates['a2'].id, self.vacancies[1].id)
+
+    def test_skip_and_release(self):
+        session = get_session(self.convocatoria)
+        adjudication = session.pick(self.candidates['a1'].id, self.vacancies[0].id)
+        session.skip(self.candidates['a2'].id)
+
+        self.assertEqual(AdjudicationCandidate.objects.get(id=self.candidates['a2'].id).status, 'DECLINED')
+        self.assertEqual(session.next_candidate().id, self.candidates['a3'].id)
+
+        session.release(adjudication.id)
+        self.assertNotIn(self.candidates['a1'].id, self.nexus_codes())
+        self.assertIn(self.vacancies[0].id, session.available_vacancy_ids(session.next_candidate()))
+        with self.assertRaises(AdjudicationError):
+            session.release(adjudication.id)
+
+    def test_skip_after_other_session_adjudicated(self):
+        session = AdjudicationSession(self.convocatoria)
+        other = AdjudicationSession(self.convocatoria)
+        session.pick(self.candidates['a1'].id, self.vacancies[0].id)
+        # Otra sesión (otro worker) atiende al siguiente postulante entre dos llamadas
+        other.pick(self.candidates['a2'].id, self.vacancies[1].id)
+
+        with self.assertRaises(AdjudicationError):
+            session.skip(self.candidates['a2'].id)
+        self.assertEqual(session.next_candidate().id, self.candidates['a3'].id)
+
+        # Aunque el sello no detecte el cambio, el estado se relee bajo el bloqueo
+        other.pick(self.candidates['a3'].id, self.vacancies[2].id)
+        with mock.patch.object(session, 'sync'), self.assertRaises(AdjudicationConflict):
+            session.skip(self.candidates['a3'].id)
+        self.assertEqual(AdjudicationCandidate.objects.get(id=self.candidates['a3'].id).status, 'ADJUDICATED')
+        self.assertEqual(session.next_candidate().id, self.candidates['b'].id)
+
+    @override_settings(SSE_POLL_INTERVAL=0.01)
+    def test_events_include_late_commits_behind_cursor(self):
+        session = get_session(self.convocatoria)
+        session.pick(self.candidates['a1'].id)
+        events = convocatoria_events(self.convocatoria)
+        next_event = async_to_sync(events.__anext__)
+        self.addCleanup(async_to_sync(events.aclose))
+        self.assertTrue(next_event().startswith('retry:'))
+
+        first = session.pick(self.candidates['a2'].id)
+        self.assertIn(f'"adjudication": {first.id}', next_event())
+
+        # Otra transacción confirma después con un updated_at anterior al cursor
+        late = session.pick(self.candidates['a3'].id)
+        Adjudication.objects.filter(id=late.id).update(updated_at=first.updated_at - timedelta(seconds=1))
+        self.assertIn(f'"adjudication": {late.id}', next_event())
+        self.assertEqual(next_event(), ': keepalive\n\n')
+
+    def test_pick_conflict_reloads_session(self):
+        session = get_session(self.convocatoria)
+        # Otra convocatoria de la fase adjudica la vacante sin pasar por esta sesión
+        other = self.create_convocatoria(2)
+        rival = self.create_candidate(other, 'rival', self.first_order, 1)
+        Adjudication.objects.create(convocatoria=other, candidate=rival, vacancy=self.vacancies[0])
+
+        with self.assertRaises(AdjudicationConflict):
+            session.pick(self.candidates['a1'].id, self.vacancies[0].id)
+
+        self.assertNotIn(self.vacancies[0].id, session.available_vacancy_ids(session.next_candidate()))
+        adjudication = session.pick(self.candidates['a1'].id)
+        self.assertEqual(adjudication.vacancy_id, self.vacancies[1].id)
+
+    def test_run_on_finished_convocatoria(self):
+        ConvocatoriaAdjudicacion.objects.filter(id=self.convocatoria.id).update(finalizada=True)
+
+        with self.assertRaises(AdjudicationError):
+            run_adjudication(self.convocatoria.id)
+        with self.assertRaises(AdjudicationError):
+            get_session(self.convocatoria).pick(self.candidates['a1'].id)
+
+    def test_api_validates_ids_and_reports_conflicts(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser('admin', 'admin@ugel.pe', 'x'))
+        url = f'/api/convocatorias/{self.convocatoria.id}'
+
+        self.assertEqual(client.post(f'{url}/pick/', {'candidate': 'abc'}).status_code, 400)
+        self.assertEqual(client.post(f'{url}/pick/', {'candidate': self.candidates['a1'].id, 'vacancy': 'x'}).status_code, 400)
+        self.assertEqual(client.post(f'{url}/skip/', {}).status_code, 400)
+        self.assertEqual(client.post(f'{url}/release/', {'adjudication': '1.5'}).status_code, 400)
+
+        get_session(self.convocatoria)
+        other = self.create_convocatoria(2)
+        rival = self.create_candidate(other, 'rival', self.first_order, 1)
+        Adjudication.objects.create(convocatoria=other, candidate=rival, vacancy=self.vacancies[0])
+        response = client.post(f'{url}/pick/', {'candidate': self.candidates['a1'].id, 'vacancy': self.vacancies[0].id})
+        self.assertEqual(response.status_code, 409)
+
+
+class ModelVersionTests(TestCase):
+    """Registro de versiones: incrementos al confirmar y lectura con la caché."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_bump_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                bump_version('test.a', 'test.b')
+                bump_version('test.a')
+                self.assertEqual(version_of('test.a'), 0)
+
+        self.assertEqual(versions_of('test.a', 'test.b'), (1, 1))
+
+    def test_no_bump_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(ValueError), transaction.atomic():
+                bump_version('test.a')
+                raise ValueError
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(version_of('test.a'), 0)
+
+    def test_bump_after_rolled_back_savepoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                with self.assertRaises(ValueError), transaction.atomic():
+                    bump_version('test.a')
+                    raise ValueError
+                # El callback del savepoint revertido se descartó: se registra otro
+                bump_version('test.b')
+
+        self.assertEqual(versions_of('test.a', 'test.b'), (0, 1))
+
+    def test_rolled_back_savepoint_keeps_outer_bumps(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                bump_version('test.a')
+                with self.assertRaises(ValueError), transaction.atomic():
+                    raise ValueError
+
+        self.assertEqual(version_of('test.a'), 1)
+
+    def test_cache_miss_keeps_newer_cached_version(self):
+        write_versions({'test.a'})
+        # Otro worker cacheó una versión más nueva mientras esta lectura iba a la tabla
+        cache.set(version_key('test.a'), 2)
+        get_many = cache.get_many
+        with mock.patch.object(cache, 'get_many', side_effect=[{}, get_many([version_key('test.a')])]):
+            self.assertEqual(version_of('test.a'), 2)
+
+        self.assertEqual(cache.get(version_key('test.a')), 2)
+
+
+class ORJSONRendererTests(TestCase):
+    """Salida de ORJSONRenderer frente a JSONRenderer de DRF."""
+
+    def test_matches_drf_for_api_types(self):
+        data = {
+            'text': 'Línea\u2028siguiente\u2029fin — ñ',
+            'number': 2.5,
+            'created_at': timezone.now(),
+            'items': [{'id': 1, 'active': True, 'area': None}],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+
+class DocumentIndexTests(TestCase):
+    """Índice de documentos obligatorios y paquete ZIP ante archivos reemplazados en sitio."""
+
+    def setUp(self):
+        self.root = self.make_directory()
+        self.path = os.path.join(self.root, 'ANEXO_1.pdf')
+        self.write(b'primera')
+        self.index = documents.DocumentIndex(self.root)
+        patcher = mock.patch.object(documents, 'mandatory_documents', self.index)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_directory(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return directory.name
+
+    def write(self, content):
+        # Reemplazo en sitio: el mtime del directorio no cambia
+        with open(self.path, 'r+b' if os.path.exists(self.path) else 'wb') as handle:
+            handle.write(content)
+
+    def test_entries_and_bundle_follow_overwritten_file(self):
+        with override_settings(MANDATORY_DOCUMENTS_BUNDLE_ROOT=self.make_directory()):
+            before = self.index.entries()[0]
+            first_bundle = documents.get_bundle()
+            self.write(b'segunda version')
+            after = self.index.entries()[0]
+            second_bundle = documents.get_bundle()
+
+        self.assertEqual((before.size, after.size), (7, 15))
+        self.assertNotEqual(before.sha256, after.sha256)
+        self.assertNotEqual(first_bundle.filename, second_bundle.filename)
+        with zipfile.ZipFile(second_bundle.path) as archive:
+            self.assertEqual(archive.read('ANEXO_1.pdf'), b'segunda version')
+        self.assertEqual(self.index.get('ANEXO_1.pdf'), after)
+
+
+class ChunkedUploadTests(TestCase):
+    """Subida por partes: reanudación, partes solapadas, SHA-256 y bloqueo de la finalización."""
+    content = bytes(range(200)) * 3
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(UPLOAD_ROOT=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin', password='x', is_staff=True))
+        response = self.client.post('/api/uploads/', {'filename': 'vacantes.xlsx', 'size': len(self.content)}, format='json')
+        self.upload_id = response.data['upload_id']
+        self.url = f'/api/uploads/{self.upload_id}/'
+
+    def put(self, start, end):
+        return self.client.put(
+            self.url, self.content[start:end + 1], content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.content)}'
+        )
+
+    def finalize(self, sha256=None):
+        return self.client.post(
+            f'{self.url}finalize/', {'sha256': sha256 or hashlib.sha256(self.content).hexdigest()}, format='json'
+        )
+
+    def stored_content(self):
+        path, _ = upload_path(self.upload_id, User.objects.get(username='admin'))
+        with open(path, 'rb') as handle:
+            return handle.read()
+
+    def test_resume_from_offset(self):
+        self.put(0, 99)
+        status = self.client.get(self.url).data
+        self.assertEqual((status['offset'], status['received']), (100, [[0, 99]]))
+
+        self.put(status['offset'], len(self.content) - 1)
+        response = self.finalize()
+
+        self.assertTrue(response.data['complete'])
+        self.assertEqual(self.stored_content(), self.content)
+
+    def test_overlapping_and_repeated_parts(self):
+        self.put(0, 299)
+        self.put(200, 399)
+        self.put(250, 300)
+        self.put(200, 399)
+        self.put(350, len(self.content) - 1)
+
+        self.assertEqual(self.finalize().status_code, 200)
+        self.assertEqual(self.stored_content(), self.content)
+
+    def test_sha256_mismatch_discards_parts(self):
+        self.put(0, len(self.content) - 1)
+
+        response = self.finalize('0' * 64)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.client.get(self.url).data['received'], [])
+        self.put(0, len(self.content) - 1)
+        self.assertTrue(self.finalize().data['complete'])
+
+    def test_finalize_lock_rejects_finalize_and_parts(self):
+        self.put(0, 99)
+        lock = os.path.join(upload_dir(self.upload_id), LOCK_FILENAME)
+        open(lock, 'w').close()
+
+        self.assertEqual(self.put(100, len(self.content) - 1).status_code, 409)
+        self.assertEqual(self.finalize().status_code, 409)
+        os.remove(lock)
+        self.put(100, len(self.content) - 1)
+        self.assertTrue(self.finalize().data['complete'])
+        self.assertFalse(os.path.exists(lock))
+
+
+class VacancyDataMixin:
+    """Catálogos, una fase activa y vacantes de dos áreas (más una sin área y una inactiva)."""
+
+    def setUp(self):
+        cache.clear()
+        self.modality = Modality.objects.create(name='Educación Básica Regular', abbreviature='EBR')
+        self.level = Level.objects.create(name='Secundaria')
+        self.math = CurricularArea.objects.create(name='Matemática')
+        self.language = CurricularArea.objects.create(name='Comunicación')
+        self.phase = Phase.objects.create(name='Fase 1', year=2026, is_active=True)
+        self.institution = EducationalInstitution.objects.create(
+            code='0000001', name='IE 1', modality=self.modality, level=self.level
+        )
+        for code, area, active in (
+            ('M1', self.math, True), ('M2', self.math, True), ('S1', None, True),
+            ('C1', self.language, True), ('M3', self.math, False),
+        ):
+            self.create_vacancy(code, area, is_active=active)
+
+    def create_vacancy(self, nexus_code, area, **kwargs):
+        return Vacancy.objects.create(
+            phase=self.phase, educational_institution=self.institution, nexus_code=nexus_code,
+            position='DOCENTE', vacancy_type='ORGANICA', vacancy_reason='LICENCIA', curricular_area=area, **kwargs
+        )
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def create_teacher(self, username, area):
+        user = User.objects.create_user(username, password='x')
+        TeacherProfile.objects.create(user=user, modality=self.modality, level=self.level, curricular_area=area)
+        return user
+
+
+class VacancyFeedTests(VacancyDataMixin, TransactionTestCase):
+    """
+    Vacantes para el perfil del docente (for-me): filtro, caché compartida e
+    invalidación. Con commits reales: las versiones se incrementan al confirmar.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.teacher = self.create_teacher('docente1', self.math)
+        self.same_profile = self.create_teacher('docente2', self.math)
+
+    def codes(self, response):
+        return sorted(vacancy['nexus_code'] for vacancy in response.data['results'])
+
+    def test_filters_by_profile(self):
+        response = self.client_for(self.teacher).get('/api/vacancies/for-me/')
+
+        self.assertEqual(self.codes(response), ['M1', 'M2', 'S1'])
+        other = self.client_for(self.create_teacher('docente3', self.language)).get('/api/vacancies/for-me/')
+        self.assertEqual(self.codes(other), ['C1', 'S1'])
+
+    def test_cache_shared_by_profile_and_invalidated_by_version(self):
+        etag = self.client_for(self.teacher).get('/api/vacancies/for-me/')['ETag']
+        client = self.client_for(self.same_profile)
+
+        self.assertEqual(client.get('/api/vacancies/for-me/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # Entrada compartida: otro docente del mismo perfil no vuelve a leer las vacantes
+        with mock.patch.object(VacancyViewSet, 'paginate_queryset', side_effect=AssertionError):
+            self.assertEqual(self.codes(client.get('/api/vacancies/for-me/')), ['M1', 'M2', 'S1'])
+
+        self.create_vacancy('M4', self.math)
+        response = client.get('/api/vacancies/for-me/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.codes(response), ['M1', 'M2', 'M4', 'S1'])
+
+    def test_rejects_invalid_phase(self):
+        response = self.client_for(self.teacher).get('/api/vacancies/for-me/', {'phase': 'abc'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class EvaluatorQueueTests(VacancyDataMixin, TestCase):
+    """Cola del evaluador: alcance por asignaciones del perfil y paginación por clave."""
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user('evaluador', password='x')
+        self.profile = EvaluatorProfile.objects.create(user=user)
+        self.profile.modalities.add(self.modality)
+        self.profile.levels.add(self.level)
+        self.profile.curricular_areas.add(self.math)
+        self.client = self.client_for(user)
+
+    def all_codes(self, url):
+        codes = []
+        while url:
+            data = self.client.get(url).data
+            self.assertNotIn('count', data)
+            codes += [item['nexus_code'] for item in data['results']]
+            url = data['next']
+        return codes
+
+    def test_vacancies_in_scope_with_keyset_paging(self):
+        first = self.client.get('/api/evaluator-queue/vacancies/', {'page_size': 2}).data
+
+        self.assertEqual([item['nexus_code'] for item in first['results']], ['M1', 'M2'])
+        self.assertIn('cursor=', first['next'])
+        self.assertEqual(self.all_codes(first['next']), ['S1'])
+
+    def test_scope_follows_profile_assignments(self):
+        self.assertEqual(self.all_codes('/api/evaluator-queue/vacancies/'), ['M1', 'M2', 'S1'])
+
+        self.profile.curricular_areas.add(self.language)
+
+        self.assertEqual(self.all_codes('/api/evaluator-queue/vacancies/'), ['M1', 'M2', 'S1', 'C1'])
+        self.profile.levels.clear()
+        self.assertEqual(self.all_codes('/api/evaluator-queue/vacancies/'), [])
+
+    def test_teachers_in_scope(self):
+        self.create_teacher('docente-matematica', self.math)
+        self.create_teacher('docente-comunicacion', self.language)
+
+        results = self.client.get('/api/evaluator-queue/teachers/').data['results']
+
+        self.assertEqual([item['username'] for item in results], ['docente-matematica'])
+
+    def test_requires_evaluator_profile(self):
+        response = self.client_for(self.create_teacher('docente', self.math)).get('/api/evaluator-queue/vacancies/')
+
+        self.assertEqual(response.status_code, 403)
+
+
+class VacancyExportTests(VacancyDataMixin, TestCase):
+    """Exportación de las vacantes de una fase en CSV y XLSX."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(User.objects.create_superuser('admin', 'admin@ugel.pe', 'x'))
+
+    def test_csv_is_streamed_with_all_rows(self):
+        response = self.client.get('/api/vacancies/export/', {'phase': self.phase.id, 'format': 'csv'})
+
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(lines[0], '\ufeff' + ','.join(VACANCY_EXPORT_COLUMNS))
+        self.assertEqual([line.split(',')[4] for line in lines[1:]], ['M1', 'M2', 'S1', 'C1', 'M3'])
+        self.assertEqual(lines[3].split(',')[8], '')
+
+    def test_xlsx_export(self):
+        response = self.client.get('/api/vacancies/export/', {'phase': self.phase.id, 'format': 'xlsx'})
+
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True).active
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(list(rows[0]), VACANCY_EXPORT_COLUMNS)
+        self.assertEqual([row[4] for row in rows[1:]], ['M1', 'M2', 'S1', 'C1', 'M3'])
+
+    def test_validates_phase_and_format(self):
+        self.assertEqual(self.client.get('/api/vacancies/export/', {'phase': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/vacancies/export/', {'phase': 999}).status_code, 404)
+        response = self.client.get('/api/vacancies/export/', {'phase': self.phase.id, 'format': 'pdf'})
+        self.assertEqual(response.status_code, 400)
+
+
+class PhaseReportTests(VacancyDataMixin, TransactionTestCase):
+    """Reportes PDF por fase: versión de los datos, archivo por versión y encolado."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(REPORTS_ROOT=directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_version_changes_after_write(self):
+        before = reports.data_version(self.phase)
+        self.assertEqual(reports.data_version(self.phase), before)
+
+        self.create_vacancy('M9', self.math)
+
+        self.assertNotEqual(reports.data_version(self.phase), before)
+
+    def test_render_replaces_previous_version(self):
+        old_path = reports.report_path(self.phase, 'vacancies', 'v1')
+        reports.render_report(self.phase.id, 'vacancies', old_path)
+        new_path = reports.report_path(self.phase, 'vacancies', 'v2')
+        reports.render_report(self.phase.id, 'vacancies', new_path)
+
+        with open(new_path, 'rb') as handle:
+            self.assertEqual(handle.read(5), b'%PDF-')
+        self.assertFalse(os.path.exists(old_path))
+
+    def test_request_report_enqueues_once(self):
+        executor = mock.Mock()
+        self.addCleanup(reports._pending.clear)
+        with mock.patch.object(reports, 'get_executor', return_value=executor):
+            first = reports.request_report(self.phase, 'adjudication', 'v1')
+            second = reports.request_report(self.phase, 'adjudication', 'v1')
+        path = first[1]
+
+        self.assertEqual((first[0], second[0]), ('pending', 'pending'))
+        executor.submit.assert_called_once_with(reports.render_report, self.phase.id, 'adjudication', path)
+        reports.render_report(self.phase.id, 'adjudication', path)
+        self.assertEqual(reports.request_report(self.phase, 'adjudication', 'v1'), ('ready', path, 'v1'))
+
+
+class TimelineTests(TransactionTestCase):
+    """Cronograma del proceso: estado de cada etapa, validación de fechas y caché por versión."""
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        day = timedelta(days=1)
+        self.process = ContractingProcess.objects.create(Name='Proceso 2026', year=2026, is_active=True)
+        self.stages = [
+            Stage.objects.create(stage=self.process, name=name, type=stage_type, order=order, start_date=start, end_date=end)
+            for name, stage_type, order, start, end in (
+                ('Verificación', StageType.RequirementsVerification, 1, self.today - 10 * day, self.today - day),
+                ('Evaluación', StageType.PreliminaryEvaluation, 2, self.today, self.today + 2 * day),
+                ('Adjudicación', StageType.Adjudication, 3, self.today + 5 * day, self.today + 6 * day),
+                ('Resultados', StageType.FinalResults, 4, None, None),
+            )
+        ]
+        ConvocatoriaAdjudicacion.objects.create(
+            stage=self.stages[2], numero_convocatoria=1, nombre='Convocatoria 1',
+            fecha_hora=timezone.now(), lugar_o_enlace='UGEL'
+        )
+
+    def test_build_timeline(self):
+        timeline, boundary = build_timeline(today=self.today)
+
+        self.assertEqual(
+            [stage['status'] for stage in timeline['stages']], ['finished', 'current', 'upcoming', 'unscheduled']
+        )
+        self.assertEqual(timeline['current_stage'], self.stages[1].id)
+        self.assertEqual(boundary, self.today + timedelta(days=3))
+        self.assertEqual(len(timeline['stages'][2]['convocatorias']), 1)
+        self.assertNotIn('convocatorias', timeline['stages'][1])
+
+    def test_cached_until_a_stage_changes(self):
+        first = get_timeline()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_timeline(), first)
+
+        Stage.objects.filter(id=self.stages[1].id).update(end_date=self.today - timedelta(days=1))
+
+        self.assertIsNone(get_timeline()['current_stage'])
+
+    def test_schedule_errors(self):
+        day = timedelta(days=1)
+        stages = [
+            {'id': 1, 'name': 'A', 'order': 1, 'start_date': self.today, 'end_date': self.today + 3 * day},
+            {'id': 2, 'name': 'B', 'order': 2, 'start_date': self.today + 2 * day, 'end_date': self.today + 4 * day},
+            {'id': 3, 'name': 'C', 'order': 3, 'start_date': self.today, 'end_date': None},
+            {'id': 4, 'name': 'D', 'order': 4, 'start_date': self.today + 9 * day, 'end_date': self.today + 8 * day},
+        ]
+
+        self.assertEqual(sorted(schedule_errors(stages)), [2, 3, 4])
+        self.assertEqual(schedule_errors(stages[:1]), {})
+
+
+class ConditionalListTests(VacancyDataMixin, TransactionTestCase):
+    """GET condicional de los listados (ETag por versión) y compresión de respuestas JSON."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(User.objects.create_superuser('admin', 'admin@ugel.pe', 'x'))
+
+    def test_not_modified_until_a_write(self):
+        etag = self.client.get('/api/modalities/')['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/modalities/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Comparación débil: el mismo valor sin W/ también coincide
+        strong = etag.removeprefix('W/')
+        self.assertEqual(self.client.get('/api/modalities/', HTTP_IF_NONE_MATCH=strong).status_code, 304)
+
+        self.client.post('/api/modalities/', {'name': 'Educación Básica Alternativa', 'abbreviature': 'EBA'})
+        response = self.client.get('/api/modalities/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/api/modalities/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_etag_depends_on_query(self):
+        first = self.client.get('/api/vacancies/', {'page': 1})['ETag']
+        second = self.client.get('/api/vacancies/', {'page': 2, 'page_size': 2})['ETag']
+
+        self.assertNotEqual(first, second)
+
+    @override_settings(COMPRESSION_MIN_SIZE=200)
+    def test_large_json_is_gzipped(self):
+        response = self.client.get('/api/vacancies/', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 5)
+        plain = self.client.get('/api/vacancies/')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertEqual(plain['ETag'], response['ETag'])
+
+
+class PrelationListCacheTests(TransactionTestCase):
+    """Listado público de prelaciones cacheado por versión y recálculo single-flight."""
+
+    def setUp(self):
+        cache.clear()
+        self.modality = Modality.objects.create(name='Educación Básica Regular', abbreviature='EBR')
+        self.level = Level.objects.create(name='Secundaria')
+        self.areas = [CurricularArea.objects.create(name=name) for name in ('Matemática', 'Comunicación')]
+        self.order = PrelationOrder.objects.create(name='Primera', position=1)
+        self.create_prelation(self.areas[0])
+        self.client = APIClient()
+
+    def create_prelation(self, area):
+        prelation = Prelation.objects.create(
+            modality=self.modality, curricular_area=area, order=self.order, description=f'Prelación {area.name}'
+        )
+        prelation.level.add(self.level)
+        return prelation
+
+    def test_cached_until_a_write(self):
+        self.assertEqual(self.client.get('/api/prelations/').data['count'], 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/prelations/').data['count'], 1)
+
+        self.create_prelation(self.areas[1])
+
+        self.assertEqual(self.client.get('/api/prelations/').data['count'], 2)
+
+    def test_pages_cached_separately(self):
+        self.create_prelation(self.areas[1])
+
+        first = self.client.get('/api/prelations/', {'page_size': 1}).data
+        second = self.client.get('/api/prelations/', {'page_size': 1, 'page': 2}).data
+
+        self.assertNotEqual(first['results'][0]['id'], second['results'][0]['id'])
+
+    def test_get_or_compute_waits_for_the_lock_holder(self):
+        cache.add(make_cache_key('lock', 'valor'), 1)
+        compute = mock.Mock(return_value='propio')
+
+        # Mientras se espera, el que tiene el candado guarda el valor
+        with mock.patch('api.functions.cache.time.sleep', side_effect=lambda _: cache.set('valor', 'compartido')):
+            self.assertEqual(get_or_compute('valor', compute, 60), 'compartido')
+        compute.assert_not_called()
+
+        with override_settings(CACHE_LOCK_WAIT=0):
+            self.assertEqual(get_or_compute('otro', compute, 60), 'propio')
+
+
+class VacancyWorkbookMixin(VacancyDataMixin):
+    """Libro de dos hojas con un código Nexus repetido entre ellas, uno ya registrado y un área inexistente."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = self.client_for(User.objects.create_superuser('admin', 'admin@ugel.pe', 'x'))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'vacantes.xlsx')
+        self.write_workbook({
+            'Matemática': [('0000002', 'IE 2', 'N1', 'Matemática'), ('0000002', 'IE 2', 'N2', 'Matemática')],
+            # N1 repetido entre hojas, M1 ya registrado y un área inexistente
+            'Comunicación': [
+                ('0000002', 'IE 2', 'N1', 'Comunicación'), ('0000001', 'IE 1', 'M1', 'Comunicación'),
+                ('0000001', 'IE 1', 'N3', 'Química'), ('0000001', 'IE 1', 'N4', 'Comunicación'),
+            ],
+        })
+
+    def write_workbook(self, sheets):
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+        for title, rows in sheets.items():
+            sheet = workbook.create_sheet(title)
+            sheet.append(IMPORT_COLUMNS)
+            for ie_code, ie_name, nexus_code, area in rows:
+                sheet.append([
+                    ie_code, ie_name, 'EBR', 'Secundaria', nexus_code, 'DOCENTE', 'ORGANICA', 'LICENCIA', area
+                ])
+        workbook.save(self.path)
+
+    def upload(self, url, field='files', **data):
+        with open(self.path, 'rb') as handle:
+            return self.client.post(url, {field: handle, 'phase_id': self.phase.id, **data})
+
+
+@override_settings(IMPORT_WORKERS=1)
+class VacancyImportTests(VacancyWorkbookMixin, TestCase):
+    """Importación de vacantes desde varias hojas: códigos repetidos entre hojas, conteos y dry_run."""
+
+    def test_sheets_are_merged_and_counted(self):
+        result = import_vacancies([(self.path, 'vacantes.xlsx')], self.phase.id)
+
+        self.assertEqual(
+            [
+                (sheet['sheet'], sheet['total'], sheet['valid_count'], sheet['created_count'])
+                for sheet in result['sheets']
+            ],
+            [('Matemática', 2, 2, 2), ('Comunicación', 4, 1, 1)]
+        )
+        self.assertEqual((result['total'], result['invalid_count'], result['created_count']), (6, 3, 3))
+        self.assertEqual(result['institutions_created'], 1)
+        errors = {row['data']['nexus_code']: row['errors'] for row in result['rows'] if row['errors']}
+        self.assertEqual(
+            errors['N1'], ["Código Nexus 'N1' repetido (ya está en vacantes.xlsx / Matemática, fila 2)"]
+        )
+        self.assertEqual(errors['M1'], ["Código Nexus 'M1' ya registrado"])
+        self.assertEqual(list(errors), ['N1', 'M1', 'N3'])
+        created = Vacancy.objects.filter(nexus_code__startswith='N').order_by('nexus_code')
+        self.assertEqual([vacancy.nexus_code for vacancy in created], ['N1', 'N2', 'N4'])
+        self.assertEqual(created[0].curricular_area, self.math)
+
+    def test_dry_run_creates_nothing(self):
+        response = self.upload('/api/vacancies/import/', dry_run='true')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['valid_count'], response.data['created_count']), (3, 0))
+        self.assertEqual(response.data['report']['invalid_count'], 3)
+        self.assertFalse(Vacancy.objects.filter(nexus_code__startswith='N').exists())
+        self.assertFalse(EducationalInstitution.objects.filter(code='0000002').exists())
+
+    def test_import_endpoint_creates_vacancies(self):
+        response = self.upload('/api/vacancies/import/')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created_count'], 3)
+        self.assertEqual(Vacancy.objects.filter(phase=self.phase, nexus_code__startswith='N').count(), 3)
+
+
+@override_settings(IMPORT_WORKERS=1)
+class ImportReportTests(VacancyWorkbookMixin, TestCase):
+    """Reportes de importación: resumen en la respuesta, filas filtradas y Excel anotado."""
+
+    def setUp(self):
+        super().setUp()
+        self.report = self.upload('/api/vacancies/import/', dry_run='true').data['report']
+
+    def row_codes(self, **params):
+        response = self.client.get(f'/api/import-reports/{self.report["id"]}/rows/', params)
+        self.assertEqual(response.status_code, 200)
+        return [row['data']['nexus_code'] for row in response.data['results']]
+
+    def test_rows_filtered_by_validity_error_type_and_sheet(self):
+        self.assertEqual(self.report['error_counts'], {'duplicate': 1, 'registered': 1, 'curricular_area': 1})
+        self.assertEqual(self.row_codes(valid='true'), ['N1', 'N2', 'N4'])
+        self.assertEqual(self.row_codes(valid='false'), ['N1', 'M1', 'N3'])
+        self.assertEqual(self.row_codes(error_type='duplicate'), ['N1'])
+        self.assertEqual(self.row_codes(sheet='vacantes.xlsx / Comunicación', valid='true'), ['N4'])
+        self.assertEqual(self.row_codes(page_size=2), ['N1', 'N2'])
+
+    def test_invalid_error_type_is_rejected(self):
+        response = self.client.get(f'/api/import-reports/{self.report["id"]}/rows/', {'error_type': 'otro'})
+
+        self.assertEqual(response.status_code, 400)
+        with self.assertRaises(ValueError):
+            filter_rows(ImportReport.objects.get(id=self.report['id']), error_type='otro')
+
+    def test_download_annotated_xlsx(self):
+        response = self.client.get(f'/api/import-reports/{self.report["id"]}/download/', {'valid': 'false'})
+
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True).active
+        rows = list(sheet.iter_rows(values_only=True))
+        self.assertEqual(list(rows[0]), XLSX_HEADER)
+        self.assertEqual([row[XLSX_HEADER.index('nexus_code')] for row in rows[1:]], ['N1', 'M1', 'N3'])
+        self.assertEqual(rows[2][-1], "Código Nexus 'M1' ya registrado")
+
+    def test_preview_returns_summary_only(self):
+        response = self.upload('/api/vacancies/preview/', field='file')
+
+        self.assertEqual((response.data['total'], response.data['invalid_count']), (2, 0))
+        self.assertNotIn('preview', response.data)
+        self.assertEqual(response.data['report']['source'], 'PREVIEW')
+        self.assertEqual(self.upload('/api/vacancies/preview/', field='file', phase_id='abc').status_code, 400)
+
+    def test_reports_are_private(self):
+        other = self.client_for(User.objects.create_superuser('otro', 'otro@ugel.pe', 'x'))
+
+        self.assertEqual(other.get(f'/api/import-reports/{self.report["id"]}/rows/').status_code, 404)
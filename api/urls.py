@@ -1,7 +1,9 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework_simplejwt.views import TokenRefreshView
 from .router import router
-from .views.auth import CustomTokenObtainPairView, change_password, me
+from .views.auth import CustomTokenObtainPairView, change_password
+from .views.asynchronous import catalog, catalogs, mandatory_document_download, me, phase_report_status
+from .views.metrics import metrics
 
 urlpatterns = [
     # Autenticación JWT
@@ -10,6 +12,18 @@ urlpatterns = [
     path('auth/change-password/', change_password, name='change_password'),
     path('auth/me/', me, name='me'),
     
+    # Vistas asíncronas (ASGI); van antes del router para atender sus rutas
+    path('catalogs/', catalogs, name='catalogs'),
+    path('catalogs/<slug:name>/', catalog, name='catalog'),
+    re_path(
+        r'^mandatory-documents/files/(?P<filename>[^/]+)/$',
+        mandatory_document_download, name='mandatory-document-download'
+    ),
+    path('phases/<int:pk>/report/status/', phase_report_status, name='phase-report-status'),
+    
+    # Métricas (Prometheus)
+    path('_metrics/', metrics, name='metrics'),
+    
     # Router endpoints
     path('', include(router.urls)),
 ]
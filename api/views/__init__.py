@@ -7,7 +7,8 @@ from .prelation import PrelationViewSet
 from .prelation_requirement import PrelationRequirementViewSet
 from .mandatory_document import MandatoryDocumentViewSet
 from .user import GroupViewSet, UserViewSet
-from .auth import CustomTokenObtainPairView, change_password, me
+from .auth import CustomTokenObtainPairView, change_password
+from .asynchronous import me
 
 __all__ = [
     'ModalityViewSet',
@@ -0,0 +1,184 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.db import IntegrityError, models, transaction
+
+from api.models import ConvocatoriaAdjudicacion, AdjudicationCandidate, Adjudication, Vacancy
+from api.serializers.adjudication import (
+    ConvocatoriaAdjudicacionSerializer,
+    AdjudicationCandidateSerializer,
+    AdjudicationSerializer
+)
+from api.serializers.vacancy import VacancySerializer
+from api.functions.adjudication import AdjudicationError, get_session, run_adjudication
+from api.functions.permissions import IsAdminOrAdjudicator
+from api.functions.events import convocatoria_events, event_stream_response
+from api.functions.negotiation import FileActionNegotiationMixin
+
+
+class ConvocatoriaAdjudicacionViewSet(FileActionNegotiationMixin, viewsets.ModelViewSet):
+    """
+    Convocatorias de la etapa de adjudicación y su motor de adjudicación.
+    
+    POST /api/convocatorias/<id>/candidates/   Cargar postulantes (lista)
+    POST /api/convocatorias/<id>/run/          Adjudicación automática de pendientes
+    GET  /api/convocatorias/<id>/session/      Siguiente postulante y vacantes elegibles
+    POST /api/convocatorias/<id>/pick/         {"candidate": id, "vacancy": id opcional}
+    POST /api/convocatorias/<id>/skip/         {"candidate": id}
+    POST /api/convocatorias/<id>/release/      {"adjudication": id}
+    GET  /api/convocatorias/<id>/results/
+    GET  /api/convocatorias/<id>/events/       Stream SSE de vacantes tomadas/liberadas
+    """
+    queryset = ConvocatoriaAdjudicacion.objects.select_related('phase').annotate(
+        candidates_count=models.Count('candidates', distinct=True),
+        adjudications_count=models.Count(
+            'adjudications', filter=models.Q(adjudications__is_active=True), distinct=True
+        ),
+    ).order_by('stage_id', 'numero_convocatoria')
+    serializer_class = ConvocatoriaAdjudicacionSerializer
+    permission_classes = [IsAdminOrAdjudicator]
+    file_actions = ('events',)
+
+    def error(self, exc):
+        return Response({'error': str(exc)}, status=exc.status)
+
+    def id_param(self, request, name, required=True):
+        """Id enviado en el cuerpo: (valor, None) o (None, respuesta 400)."""
+        value = request.data.get(name)
+        if value in (None, ''):
+            if not required:
+                return None, None
+            return None, Response({'error': f'Se requiere {name}'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return int(value), None
+        except (TypeError, ValueError):
+            return None, Response({'error': f'{name} debe ser un número entero'}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=['get', 'post'])
+    def candidates(self, request, pk=None):
+        """Listar o cargar (en bloque) los postulantes de la convocatoria"""
+        convocatoria = self.get_object()
+        
+        if request.method == 'GET':
+            queryset = convocatoria.candidates.select_related(
+                'teacher__user', 'teacher__user__person', 'prelation_order'
+            ).order_by('prelation_order__position', 'prelation_order_id', 'merit_position', 'id')
+            return Response(AdjudicationCandidateSerializer(queryset, many=True).data)
+        
+        data = request.data if isinstance(request.data, list) else [request.data]
+        serializer = AdjudicationCandidateSerializer(data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                created = AdjudicationCandidate.objects.bulk_create([
+                    AdjudicationCandidate(convocatoria=convocatoria, **item)
+                    for item in serializer.validated_data
+                ])
+        except IntegrityError:
+            return Response(
+                {'error': 'Uno o más docentes ya están registrados en la convocatoria'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'created_count': len(created)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def run(self, request, pk=None):
+        """Adjudicar automáticamente a todos los postulantes pendientes"""
+        convocatoria = self.get_object()
+        try:
+            adjudications, unassigned = run_adjudication(convocatoria.id)
+        except AdjudicationError as exc:
+            return self.error(exc)
+        return Response({
+            'adjudicated_count': len(adjudications),
+            'unassigned_count': len(unassigned),
+            'unassigned': [candidate.id for candidate in unassigned],
+        })
+
+    @action(detail=True, methods=['get'])
+    def session(self, request, pk=None):
+        """Estado de la sesión en vivo: siguiente postulante y vacantes elegibles"""
+        convocatoria = self.get_object()
+        try:
+            session = get_session(convocatoria)
+            with session.lock:
+                session.sync()
+                candidate = session.next_candidate()
+                vacancy_ids = session.available_vacancy_ids(candidate) if candidate else []
+                pending_count = len(session.queue)
+        except AdjudicationError as exc:
+            return self.error(exc)
+        
+        vacancies = Vacancy.objects.filter(id__in=vacancy_ids).select_related(
+            'phase', 'educational_institution', 'curricular_area', 'modality', 'level'
+        ).order_by('nexus_code')
+        return Response({
+            'pending_count': pending_count,
+            'next_candidate': AdjudicationCandidateSerializer(candidate).data if candidate else None,
+            'available_vacancies': VacancySerializer(vacancies, many=True).data,
+        })
+
+    @action(detail=True, methods=['post'])
+    def pick(self, request, pk=None):
+        """El siguiente postulante elige una vacante (sin vacante: la primera disponible)"""
+        convocatoria = self.get_object()
+        candidate_id, error = self.id_param(request, 'candidate')
+        if error is None:
+            vacancy_id, error = self.id_param(request, 'vacancy', required=False)
+        if error is not None:
+            return error
+        try:
+            adjudication = get_session(convocatoria).pick(candidate_id, vacancy_id)
+        except AdjudicationError as exc:
+            return self.error(exc)
+        return Response(AdjudicationSerializer(adjudication).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def skip(self, request, pk=None):
+        """Marcar al siguiente postulante como ausente o desistido"""
+        convocatoria = self.get_object()
+        candidate_id, error = self.id_param(request, 'candidate')
+        if error is not None:
+            return error
+        try:
+            candidate = get_session(convocatoria).skip(candidate_id)
+        except AdjudicationError as exc:
+            return self.error(exc)
+        return Response(AdjudicationCandidateSerializer(candidate).data)
+
+    @action(detail=True, methods=['post'])
+    def release(self, request, pk=None):
+        """Liberar una plaza adjudicada"""
+        convocatoria = self.get_object()
+        adjudication_id, error = self.id_param(request, 'adjudication')
+        if error is not None:
+            return error
+        try:
+            adjudication = get_session(convocatoria).release(adjudication_id)
+        except AdjudicationError as exc:
+            return self.error(exc)
+        return Response(AdjudicationSerializer(adjudication).data)
+
+    @action(detail=True, methods=['get'])
+    def results(self, request, pk=None):
+        """Adjudicaciones vigentes de la convocatoria"""
+        convocatoria = self.get_object()
+        queryset = Adjudication.objects.filter(convocatoria=convocatoria, is_active=True).select_related(
+            'vacancy', 'vacancy__educational_institution', 'candidate', 'candidate__teacher__user'
+        ).order_by(
+            'candidate__prelation_order__position', 'candidate__prelation_order_id', 'candidate__merit_position'
+        )
+        return Response(AdjudicationSerializer(queryset, many=True).data)
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def events(self, request, pk=None):
+        """
+        Cambios de estado de las vacantes de la convocatoria como server-sent
+        events. Reemplaza el sondeo del listado de vacantes: el cliente carga el
+        estado con results/ y luego solo recibe deltas; al reconectar el
+        navegador envía Last-Event-ID y se reanuda desde ese cambio.
+        """
+        convocatoria = self.get_object()
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+        return event_stream_response(request, convocatoria_events(convocatoria, last_event_id))
@@ -0,0 +1,164 @@
+"""
+Vistas asíncronas para los endpoints de solo lectura más consultados.
+
+Se sirven con el ORM asíncrono bajo ASGI (gunicorn + UvicornWorker): mientras
+esperan a la base de datos o al disco no ocupan un worker, así que un mismo
+proceso atiende muchas conexiones concurrentes. Bajo WSGI siguen funcionando
+(Django las ejecuta con async_to_sync).
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponseNotModified, JsonResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+
+from api.models import CurricularArea, Level, Modality, Phase, PrelationOrder
+from api.serializers import (
+    CurricularAreaSerializer, LevelSerializer, ModalitySerializer, PrelationOrderSerializer
+)
+from api.db_router import use_primary
+from api.functions.asynchronous import async_api_view, error_response
+from api.functions.cache import etag_matches, make_etag
+from api.functions.documents import aiter_file_range, mandatory_documents, serve_document
+from api.functions.streaming import is_asgi
+from api.functions.reports import REPORT_KINDS, adata_version, request_report
+from api.functions.versions import versions_of
+from api.views.auth import user_payload
+
+
+User = get_user_model()
+
+CATALOGS = {
+    'modalities': (Modality, ModalitySerializer),
+    'levels': (Level, LevelSerializer),
+    'curricular-areas': (CurricularArea, CurricularAreaSerializer),
+    'prelation-orders': (PrelationOrder, PrelationOrderSerializer),
+}
+
+ME_QUERYSET = User.objects.select_related(
+    'role', 'person',
+    'teacher_profile__modality', 'teacher_profile__level', 'teacher_profile__curricular_area',
+    'evaluator_profile',
+).prefetch_related(
+    'evaluator_profile__modalities', 'evaluator_profile__levels', 'evaluator_profile__curricular_areas'
+)
+
+
+async def catalog_data(name):
+    model, serializer_class = CATALOGS[name]
+    items = [item async for item in model.objects.all()]
+    return serializer_class(items, many=True).data
+
+
+async def catalog_response(request, names):
+    """JsonResponse con ETag derivado de la versión de los catálogos (304 si no cambió)."""
+    catalog_models = [CATALOGS[name][0] for name in ([names] if isinstance(names, str) else names)]
+    etag = make_etag(request.path, *await sync_to_async(versions_of)(*catalog_models))
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        # Del primario: el ETag nuevo no debe acompañar datos de una réplica atrasada
+        with use_primary():
+            if isinstance(names, str):
+                response = JsonResponse(await catalog_data(names), safe=False)
+            else:
+                response = JsonResponse({name: await catalog_data(name) for name in names})
+    response['ETag'] = etag
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+@async_api_view(authenticated=True, user_queryset=ME_QUERYSET)
+async def me(request):
+    """
+    Obtener información del usuario autenticado.
+
+    GET /api/auth/me/
+
+    Response:
+    {
+        "id": 1,
+        "username": "user",
+        "email": "user@example.com",
+        "role": "TEACHER",
+        "role_id": 1,
+        "full_name": "Name Lastname",
+        "person": {...},
+        "teacher_profile": {...}
+    }
+    """
+    return JsonResponse(user_payload(request.user))
+
+
+@async_api_view()
+async def catalogs(request):
+    """
+    Catálogos de solo lectura en una sola petición
+
+    GET /api/catalogs/
+    {"modalities": [...], "levels": [...], "curricular-areas": [...], "prelation-orders": [...]}
+    """
+    return await catalog_response(request, list(CATALOGS))
+
+
+@async_api_view()
+async def catalog(request, name):
+    """
+    Un catálogo (mismo formato que el listado de su ViewSet)
+
+    GET /api/catalogs/<modalities|levels|curricular-areas|prelation-orders>/
+    """
+    if name not in CATALOGS:
+        return error_response({'error': 'Catálogo no encontrado'}, 404)
+    return await catalog_response(request, name)
+
+
+@async_api_view()
+async def mandatory_document_download(request, filename):
+    """
+    Descarga un PDF de mandatory_documents (con ETag y soporte de Range)
+
+    GET /api/mandatory-documents/files/<filename>/
+    """
+    # El índice hace stat (y hash la primera vez): se consulta fuera del event loop
+    entry = await asyncio.to_thread(mandatory_documents.get, filename)
+    if entry is None:
+        return error_response({'error': 'Documento no encontrado'}, 404)
+    # Bajo WSGI (runserver) el iterador asíncrono se acumularía completo en memoria
+    return serve_document(request, entry, file_iterator=aiter_file_range if is_asgi(request) else None)
+
+
+@async_api_view(admin=True)
+async def phase_report_status(request, pk):
+    """
+    Estado de la generación del reporte PDF de la fase (para consultar en bucle)
+
+    GET /api/phases/<id>/report/status/?kind=vacancies|adjudication
+    {"status": "pending|ready|failed", "kind": ..., "version": ..., "url": ...}
+
+    Si el reporte de la versión actual no existe, encola su generación.
+    """
+    kind = request.GET.get('kind', 'vacancies')
+    if kind not in REPORT_KINDS:
+        return error_response(
+            {'error': f'Tipo de reporte no válido. Opciones: {", ".join(REPORT_KINDS)}'}, 400
+        )
+    try:
+        phase = await Phase.objects.aget(pk=pk)
+    except Phase.DoesNotExist:
+        return error_response('No encontrado.', 404)
+
+    version = await adata_version(phase)
+    state, result, version = await sync_to_async(request_report)(phase, kind, version)
+
+    data = {'status': state, 'kind': kind, 'version': version}
+    if state == 'ready':
+        data['url'] = request.build_absolute_uri(f'{reverse("phase-report", args=[phase.pk])}?kind={kind}')
+    elif state == 'failed':
+        data['error'] = f'Error generando el reporte: {result}'
+    response = JsonResponse(data)
+    if state == 'pending':
+        response['Retry-After'] = '2'
+    return response
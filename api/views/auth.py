@@ -79,27 +79,11 @@ def change_password(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def me(request):
+def user_payload(user):
     """
-    Obtener información del usuario autenticado.
-    
-    GET /api/auth/me/
-    
-    Response:
-    {
-        "id": 1,
-        "username": "user",
-        "email": "user@example.com",
-        "role": "TEACHER",
-        "role_id": 1,
-        "full_name": "Name Lastname",
-        "person": {...},
-        "teacher_profile": {...}
-    }
+    Datos del usuario autenticado (GET /api/auth/me/). Espera el usuario con
+    rol, persona y perfiles ya cargados (ver ``api.views.asynchronous.me``).
     """
-    user = request.user
     data = {
         'id': user.id,
         'username': user.username,
@@ -146,4 +130,4 @@ def me(request):
             'curricular_areas': [{'id': ca.id, 'name': ca.name} for ca in profile.curricular_areas.all()],
         }
     
-    return Response(data, status=status.HTTP_200_OK)
+    return data
@@ -0,0 +1,92 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.response import Response
+from django.db import transaction
+
+from api.models import ContractingProcess, Stage
+from api.serializers.contracting_process import (
+    ContractingProcessSerializer,
+    StageSerializer,
+    StageScheduleSerializer
+)
+from api.functions.timeline import get_timeline, schedule_errors
+
+
+class ContractingProcessViewSet(viewsets.ModelViewSet):
+    """
+    Procesos de contratación y su cronograma.
+    
+    GET /api/contracting-processes/timeline/          Cronograma del proceso activo
+    GET /api/contracting-processes/<id>/timeline/     Cronograma de un proceso
+    PUT /api/contracting-processes/<id>/schedule/     [{"id", "start_date", "end_date"}, ...]
+    """
+    queryset = ContractingProcess.objects.prefetch_related('stages').order_by('-year')
+    serializer_class = ContractingProcessSerializer
+
+    def get_permissions(self):
+        if self.action in ['timeline', 'process_timeline']:
+            permission_classes = [AllowAny]
+        else:
+            permission_classes = [IsAdminUser]
+        return [permission() for permission in permission_classes]
+
+    @action(detail=False, methods=['get'])
+    def timeline(self, request):
+        timeline = get_timeline()
+        if not timeline:
+            return Response({'error': 'No hay un proceso de contratación activo'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(timeline)
+
+    @action(detail=True, methods=['get'], url_path='timeline', url_name='process-timeline')
+    def process_timeline(self, request, pk=None):
+        timeline = get_timeline(self.get_object().id)
+        return Response(timeline)
+
+    @action(detail=True, methods=['put'])
+    def schedule(self, request, pk=None):
+        """
+        Programar varias etapas a la vez. Se valida el cronograma completo en
+        memoria (una consulta) y se guarda con bulk_update.
+        """
+        process = self.get_object()
+        serializer = StageScheduleSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        stages = {stage.id: stage for stage in Stage.objects.filter(stage=process)}
+        unknown = [item['id'] for item in serializer.validated_data if item['id'] not in stages]
+        if unknown:
+            return Response(
+                {'error': f'Etapas que no pertenecen al proceso: {unknown}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        for item in serializer.validated_data:
+            stages[item['id']].start_date = item['start_date']
+            stages[item['id']].end_date = item['end_date']
+
+        errors = schedule_errors([
+            {'id': stage.id, 'name': stage.name, 'order': stage.order,
+             'start_date': stage.start_date, 'end_date': stage.end_date}
+            for stage in stages.values()
+        ])
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            # bulk_update no emite señales, pero Stage.objects versiona el modelo (invalida el cronograma)
+            Stage.objects.bulk_update(list(stages.values()), ['start_date', 'end_date'])
+        return Response(StageSerializer(sorted(stages.values(), key=lambda stage: stage.order), many=True).data)
+
+
+class StageViewSet(viewsets.ModelViewSet):
+    queryset = Stage.objects.select_related('stage').all()
+    serializer_class = StageSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        process_id = self.request.query_params.get('process', None)
+        if process_id:
+            queryset = queryset.filter(stage_id=process_id)
+        return queryset
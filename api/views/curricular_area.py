@@ -2,11 +2,13 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, AllowAny
 from api.models import CurricularArea
 from api.serializers import CurricularAreaSerializer
+from api.functions.conditional import ConditionalListMixin
 
 
-class CurricularAreaViewSet(viewsets.ModelViewSet):
+class CurricularAreaViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = CurricularArea.objects.all()
     serializer_class = CurricularAreaSerializer
+    version_models = (CurricularArea,)
 
     def get_permissions(self):
         """Permitir lectura sin autenticación, pero requerir admin para modificaciones"""
@@ -0,0 +1,74 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from api.models import Vacancy, TeacherProfile, Phase
+from api.serializers.vacancy import VacancySerializer
+from api.serializers.evaluator_queue import EvaluatorQueueTeacherSerializer
+from api.functions.pagination import KeysetResultsSetPagination
+from api.functions.evaluator_scope import (
+    get_evaluator_scope, filter_vacancies_by_scope, filter_teachers_by_scope
+)
+
+
+class EvaluatorQueueViewSet(viewsets.GenericViewSet):
+    """
+    Cola de trabajo del evaluador autenticado, limitada a las modalidades,
+    niveles y áreas curriculares asignadas en su EvaluatorProfile.
+    
+    GET /api/evaluator-queue/vacancies/?phase=<id>
+    GET /api/evaluator-queue/teachers/
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetResultsSetPagination
+
+    def get_scope(self):
+        profile = getattr(self.request.user, 'evaluator_profile', None)
+        if profile is None:
+            return None
+        return get_evaluator_scope(profile)
+
+    def paginated(self, queryset, serializer_class):
+        page = self.paginate_queryset(queryset)
+        serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    def forbidden(self):
+        return Response(
+            {'error': 'El usuario no tiene un perfil de evaluador'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    @action(detail=False, methods=['get'])
+    def vacancies(self, request):
+        """Vacantes activas de la fase (o de la fase activa) dentro del alcance"""
+        scope = self.get_scope()
+        if scope is None:
+            return self.forbidden()
+
+        phase_id = request.query_params.get('phase')
+        if not phase_id:
+            phase_id = Phase.objects.filter(is_active=True).values_list('id', flat=True).first()
+        if not phase_id:
+            # Sin fase activa: página vacía (no las vacantes sin fase)
+            return self.paginated(Vacancy.objects.none(), VacancySerializer)
+
+        queryset = filter_vacancies_by_scope(
+            Vacancy.objects.filter(phase_id=phase_id, is_active=True), scope
+        ).select_related(
+            'phase', 'educational_institution', 'curricular_area', 'modality', 'level'
+        )
+        return self.paginated(queryset, VacancySerializer)
+
+    @action(detail=False, methods=['get'])
+    def teachers(self, request):
+        """Docentes cuyo perfil está dentro del alcance"""
+        scope = self.get_scope()
+        if scope is None:
+            return self.forbidden()
+
+        queryset = filter_teachers_by_scope(
+            TeacherProfile.objects.filter(user__is_active=True), scope
+        ).select_related('user', 'user__person', 'modality', 'level', 'curricular_area')
+        return self.paginated(queryset, EvaluatorQueueTeacherSerializer)
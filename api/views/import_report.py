@@ -0,0 +1,75 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from api.models import ImportReport
+from api.serializers.import_report import ImportReportSerializer, ImportReportRowSerializer
+from api.functions.pagination import KeysetResultsSetPagination, StandardResultsSetPagination
+from api.functions.import_reports import ERROR_TYPE_LABELS, filter_rows, sample_errors, write_report_xlsx
+from api.functions.streaming import file_response
+
+
+def report_summary(report, request):
+    """Reporte y primeros errores, para la respuesta de la carga (en lugar de todas las filas)."""
+    errors = sample_errors(report)
+    return {
+        'report': ImportReportSerializer(report, context={'request': request}).data,
+        'errors': errors,
+        'errors_truncated': report.invalid_count > len(errors),
+    }
+
+
+class ImportReportViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Reportes de previsualización, carga masiva e importación de vacantes
+    
+    GET /api/import-reports/                      Reportes del usuario
+    GET /api/import-reports/<id>/                 Resumen y conteo por tipo de error
+    GET /api/import-reports/<id>/rows/            Filas paginadas (?valid=, ?error_type=, ?sheet=)
+    GET /api/import-reports/<id>/download/        Excel anotado con la columna "errors" (mismos filtros)
+    GET /api/import-reports/error-types/          Tipos de error disponibles para filtrar
+    """
+    serializer_class = ImportReportSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = StandardResultsSetPagination
+
+    def get_queryset(self):
+        return ImportReport.objects.filter(user=self.request.user)
+
+    def get_filtered_rows(self, request):
+        return filter_rows(
+            self.get_object(),
+            valid=request.query_params.get('valid'),
+            error_type=request.query_params.get('error_type'),
+            sheet=request.query_params.get('sheet'),
+        )
+
+    @action(detail=True, methods=['get'])
+    def rows(self, request, pk=None):
+        try:
+            queryset = self.get_filtered_rows(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # Paginación por clave: el costo por página no crece con el número de filas
+        paginator = KeysetResultsSetPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = ImportReportRowSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        try:
+            queryset = self.get_filtered_rows(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return file_response(
+            request,
+            write_report_xlsx(queryset),
+            as_attachment=True,
+            filename=f'reporte_importacion_{pk}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+
+    @action(detail=False, methods=['get'], url_path='error-types')
+    def error_types(self, request):
+        return Response([{'code': code, 'label': label} for code, label in ERROR_TYPE_LABELS.items()])
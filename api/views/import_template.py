@@ -0,0 +1,30 @@
+from rest_framework import viewsets, status
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+
+from api.functions.excel_templates import TEMPLATES, template_response
+
+
+class ImportTemplateViewSet(viewsets.ViewSet):
+    """
+    Plantillas Excel para carga masiva (vacantes, usuarios, requisitos de prelación).
+    
+    GET /api/import-templates/
+    GET /api/import-templates/<name>/
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    lookup_value_regex = '[a-z-]+'
+
+    def list(self, request):
+        return Response([
+            {'name': name, 'filename': spec.filename, 'columns': spec.columns}
+            for name, spec in TEMPLATES.items()
+        ])
+
+    def retrieve(self, request, pk=None):
+        if pk not in TEMPLATES:
+            return Response(
+                {'error': 'Plantilla no encontrada'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return template_response(request, pk)
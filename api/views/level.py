@@ -2,11 +2,13 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, AllowAny
 from api.models import Level
 from api.serializers import LevelSerializer
+from api.functions.conditional import ConditionalListMixin
 
 
-class LevelViewSet(viewsets.ModelViewSet):
+class LevelViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = Level.objects.all()
     serializer_class = LevelSerializer
+    version_models = (Level,)
 
     def get_permissions(self):
         """Permitir lectura sin autenticación, pero requerir admin para modificaciones"""
@@ -1,20 +1,25 @@
-from rest_framework import viewsets
+from rest_framework import viewsets, status
 from rest_framework.permissions import IsAdminUser, AllowAny
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.conf import settings
-import os
+from django.http import HttpResponseRedirect
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
 
 from api.models import MandatoryDocument
 from api.serializers.mandatory_document import MandatoryDocumentSerializer
+from api.functions.negotiation import FileActionNegotiationMixin
+from api.functions.documents import aiter_file_range, mandatory_documents, serve_document, get_bundle
+from api.functions.streaming import is_asgi
 
-class MandatoryDocumentViewSet(viewsets.ModelViewSet):
+class MandatoryDocumentViewSet(FileActionNegotiationMixin, viewsets.ModelViewSet):
     queryset = MandatoryDocument.objects.all()
     serializer_class = MandatoryDocumentSerializer
+    file_actions = ('bundle_file',)
 
     def get_permissions(self):
         """Permitir lectura sin autenticación, pero requerir admin para modificaciones"""
-        if self.action in ['list', 'retrieve', 'available_files']:
+        if self.action in ['list', 'retrieve', 'available_files', 'bundle', 'bundle_file']:
             permission_classes = [AllowAny]
         else:
             permission_classes = [IsAdminUser]
@@ -23,25 +28,52 @@ class MandatoryDocumentViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def available_files(self, request):
         """Lista los archivos PDF disponibles en la carpeta mandatory_documents"""
-        mandatory_docs_path = os.path.join(settings.BASE_DIR, 'mandatory_documents')
-        
-        if not os.path.exists(mandatory_docs_path):
-            return Response({'files': []})
-        
-        files = []
-        for filename in os.listdir(mandatory_docs_path):
-            if filename.endswith('.pdf'):
-                # Extraer información del nombre del archivo
-                # Formato esperado: ANEXO_8.pdf, ANEXO_9.pdf, etc.
-                file_info = {
-                    'filename': filename,
-                    'name': filename.replace('.pdf', '').replace('_', ' '),
-                    'url': f'{request.scheme}://{request.get_host()}/mandatory_documents/{filename}',
-                    'size': os.path.getsize(os.path.join(mandatory_docs_path, filename))
-                }
-                files.append(file_info)
-        
-        # Ordenar por nombre de archivo
-        files.sort(key=lambda x: x['filename'])
+        # Formato esperado: ANEXO_8.pdf, ANEXO_9.pdf, etc.
+        files = [
+            {
+                'filename': entry.filename,
+                'name': entry.name,
+                'url': request.build_absolute_uri(
+                    reverse('mandatory-document-download', kwargs={'filename': entry.filename})
+                ),
+                'size': entry.size,
+                'sha256': entry.sha256,
+            }
+            for entry in mandatory_documents.entries()
+        ]
         
         return Response({'files': files})
+
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    def bundle(self, request):
+        """Redirige al ZIP vigente con todos los documentos obligatorios"""
+        return self.redirect_to_bundle(request, get_bundle())
+
+    @action(
+        detail=False, methods=['get'], permission_classes=[AllowAny],
+        url_path=r'bundle/(?P<filename>[\w-]+\.zip)', url_name='bundle-file'
+    )
+    def bundle_file(self, request, filename=None):
+        """
+        Descarga el ZIP de documentos obligatorios. El nombre incluye la huella del
+        contenido, por lo que se sirve con caché de larga duración (immutable).
+        """
+        entry = get_bundle()
+        if filename != entry.filename:
+            return self.redirect_to_bundle(request, entry)
+        return serve_document(
+            request, entry,
+            content_type='application/zip',
+            accel_redirect='',
+            disposition='attachment',
+            max_age=365 * 24 * 60 * 60,
+            immutable=True,
+            file_iterator=aiter_file_range if is_asgi(request) else None
+        )
+
+    def redirect_to_bundle(self, request, entry):
+        response = HttpResponseRedirect(
+            reverse('mandatory-document-bundle-file', kwargs={'filename': entry.filename})
+        )
+        patch_cache_control(response, no_cache=True)
+        return response
@@ -0,0 +1,12 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+from api.functions.metrics import registry
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """Histogramas de las peticiones por vista en formato de texto de Prometheus."""
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
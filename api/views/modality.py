@@ -2,11 +2,13 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, AllowAny
 from api.models import Modality
 from api.serializers import ModalitySerializer
+from api.functions.conditional import ConditionalListMixin
 
 
-class ModalityViewSet(viewsets.ModelViewSet):
+class ModalityViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = Modality.objects.all()
     serializer_class = ModalitySerializer
+    version_models = (Modality,)
 
     def get_permissions(self):
         """Permitir lectura sin autenticación, pero requerir admin para modificaciones"""
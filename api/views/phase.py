@@ -1,9 +1,9 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAdminUser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from api.models import Phase, PhaseStage, PhaseAssignment
+from api.models import Phase, PhaseStage, PhaseAssignment, Modality, Level, CurricularArea
 from api.serializers.phase import (
     PhaseSerializer, 
     PhaseCreateSerializer, 
@@ -11,13 +11,21 @@ from api.serializers.phase import (
     PhaseAssignmentSerializer
 )
 from api.functions.pagination import StandardResultsSetPagination
+from api.functions.negotiation import FileActionNegotiationMixin
+from api.functions.metrics import SerializationTimingMixin
+from api.functions.reports import REPORT_KINDS, request_report
+from api.functions.events import event_stream_response, phase_assignment_events
+from api.functions.streaming import file_response
+from api.functions.conditional import ConditionalListMixin
 
 
-class PhaseViewSet(viewsets.ModelViewSet):
+class PhaseViewSet(ConditionalListMixin, SerializationTimingMixin, FileActionNegotiationMixin, viewsets.ModelViewSet):
     queryset = Phase.objects.prefetch_related('stages', 'assignments').all()
     serializer_class = PhaseSerializer
+    version_models = (Phase, PhaseStage, PhaseAssignment, Modality, Level, CurricularArea)
     permission_classes = [IsAdminUser]
     pagination_class = StandardResultsSetPagination
+    file_actions = ('report',)
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -66,6 +74,49 @@ class PhaseViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+    @action(detail=True, methods=['get'])
+    def report(self, request, pk=None):
+        """
+        Reporte PDF de la fase
+        
+        GET /api/phases/<id>/report/?kind=vacancies|adjudication
+        
+        Si el PDF de la versión actual de los datos ya existe se descarga; si no,
+        se encola su generación y se responde 202 para volver a consultar.
+        """
+        phase = self.get_object()
+        kind = request.query_params.get('kind', 'vacancies')
+        
+        if kind not in REPORT_KINDS:
+            return Response(
+                {'error': f'Tipo de reporte no válido. Opciones: {", ".join(REPORT_KINDS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        state, result, version = request_report(phase, kind)
+        
+        if state == 'failed':
+            return Response(
+                {'status': state, 'error': f'Error generando el reporte: {result}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        if state == 'pending':
+            response = Response({'status': state, 'kind': kind, 'version': version}, status=status.HTTP_202_ACCEPTED)
+            response['Retry-After'] = '2'
+            return response
+        
+        response = file_response(
+            request,
+            open(result, 'rb'),
+            as_attachment=True,
+            filename=f'{kind}_fase_{phase.id}.pdf',
+            content_type='application/pdf'
+        )
+        response['ETag'] = f'"{version}"'
+        return response
+
+
 class PhaseStageViewSet(viewsets.ModelViewSet):
     queryset = PhaseStage.objects.select_related('phase').all()
     serializer_class = PhaseStageSerializer
@@ -79,12 +130,13 @@ class PhaseStageViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class PhaseAssignmentViewSet(viewsets.ModelViewSet):
+class PhaseAssignmentViewSet(FileActionNegotiationMixin, viewsets.ModelViewSet):
     queryset = PhaseAssignment.objects.select_related(
         'phase', 'modality', 'level', 'curricular_area'
     ).all()
     serializer_class = PhaseAssignmentSerializer
     permission_classes = [IsAdminUser]
+    file_actions = ('events',)
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -92,3 +144,10 @@ class PhaseAssignmentViewSet(viewsets.ModelViewSet):
         if phase_id:
             queryset = queryset.filter(phase_id=phase_id)
         return queryset
+
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def events(self, request, pk=None):
+        """Server-sent events con las vacantes tomadas/liberadas del grupo de la adjudicación."""
+        assignment = self.get_object()
+        last_event_id = request.META.get('HTTP_LAST_EVENT_ID') or request.query_params.get('last_event_id')
+        return event_stream_response(request, phase_assignment_events(assignment, last_event_id))
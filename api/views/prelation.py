@@ -1,28 +1,60 @@
+import os
+
+from django.http import Http404, HttpResponseRedirect
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser, AllowAny
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 
-from api.models import Prelation
+from api.models import CurricularArea, Level, Modality, Prelation, PrelationOrder, PrelationRequirement
 from api.serializers import PrelationSerializer
 from api.functions.pagination import StandardResultsSetPagination
+from api.functions.metrics import SerializationTimingMixin
+from api.functions.conditional import CachedListMixin, ConditionalListMixin
+from api.functions.prelation_tree import LATEST_FILENAME, current_snapshot, tree_root, tree_url
+from api.functions.streaming import file_response
 
 
-class PrelationViewSet(viewsets.ModelViewSet):
+class PrelationViewSet(ConditionalListMixin, CachedListMixin, SerializationTimingMixin, viewsets.ModelViewSet):
     queryset = Prelation.objects.select_related(
         'modality', 'curricular_area', 'order'
     ).prefetch_related('level', 'requirements').order_by('id')
     serializer_class = PrelationSerializer
+    version_models = (Prelation, PrelationRequirement, Modality, Level, CurricularArea, PrelationOrder)
     pagination_class = StandardResultsSetPagination
 
     def get_permissions(self):
         """Permitir lectura sin autenticación, pero requerir admin para modificaciones"""
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'tree']:
             permission_classes = [AllowAny]
         else:
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        Redirige al árbol de prelaciones exportado como archivo estático
+        (modalidad → nivel → área curricular → prelaciones → requisitos).
+
+        GET /api/prelations/tree/                 Índice de modalidades
+        GET /api/prelations/tree/?modality=<id>   Árbol de una modalidad
+        """
+        snapshot = current_snapshot()
+        modality = request.query_params.get('modality')
+        if modality:
+            filename = snapshot['modalities'].get(modality)
+            if filename is None:
+                return Response({'error': 'Modalidad no encontrada'}, status=status.HTTP_404_NOT_FOUND)
+        else:
+            filename = snapshot['index']
+        response = HttpResponseRedirect(tree_url(filename))
+        # La redirección cambia con los datos; el archivo de destino no
+        patch_cache_control(response, no_cache=True)
+        return response
+
     def destroy(self, request, *args, **kwargs):
         """
         Validar que no se pueda eliminar una prelación si hay prelaciones posteriores.
@@ -62,3 +94,25 @@ class PrelationViewSet(viewsets.ModelViewSet):
         # Si llegamos aquí, es seguro eliminar
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def prelation_tree_file(request, filename):
+    """
+    Sirve un archivo del árbol de prelaciones exportado (comprimido con gzip
+    si el cliente lo acepta).
+    """
+    if filename == LATEST_FILENAME or not filename.endswith('.json'):
+        raise Http404
+    path = os.path.join(tree_root(), os.path.basename(filename))
+    gzipped = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '') and os.path.exists(f'{path}.gz')
+    try:
+        handle = open(f'{path}.gz' if gzipped else path, 'rb')
+    except OSError:
+        raise Http404
+    response = file_response(request, handle, content_type='application/json', filename=os.path.basename(path))
+    if gzipped:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ['Accept-Encoding'])
+    # El nombre lleva la huella del contenido: no cambia nunca
+    patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+    return response
@@ -2,11 +2,13 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAdminUser, AllowAny
 from api.models import PrelationOrder
 from api.serializers import PrelationOrderSerializer
+from api.functions.conditional import ConditionalListMixin
 
 
-class PrelationOrderViewSet(viewsets.ModelViewSet):
+class PrelationOrderViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     queryset = PrelationOrder.objects.all()
     serializer_class = PrelationOrderSerializer
+    version_models = (PrelationOrder,)
 
     def get_permissions(self):
         """Permitir lectura sin autenticación, pero requerir admin para modificaciones"""
@@ -0,0 +1,49 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from api.functions.uploads import (
+    UploadError, create_upload, delete_upload, finalize_upload, get_upload, upload_status, write_chunk
+)
+
+
+class UploadViewSet(viewsets.ViewSet):
+    """
+    Subida de archivos grandes por partes, reanudable (para las importaciones)
+    
+    POST   /api/uploads/                    {"filename", "size"} -> {"upload_id", "chunk_size", ...}
+    PUT    /api/uploads/<id>/               Cuerpo binario + Content-Range: bytes inicio-fin/total
+    GET    /api/uploads/<id>/               Rangos recibidos y "offset" desde donde reanudar
+    POST   /api/uploads/<id>/finalize/      {"sha256"} -> une las partes y verifica el archivo
+    DELETE /api/uploads/<id>/               Cancelar
+    
+    El archivo finalizado se importa enviando "upload_id" en lugar de "file".
+    """
+    permission_classes = [IsAdminUser]
+    lookup_value_regex = '[0-9a-f]{32}'
+
+    def handle_exception(self, exc):
+        if isinstance(exc, UploadError):
+            return Response({'error': str(exc)}, status=exc.status)
+        return super().handle_exception(exc)
+
+    def create(self, request):
+        data = create_upload(request.user, request.data.get('filename'), request.data.get('size'))
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def retrieve(self, request, pk=None):
+        return Response(upload_status(get_upload(pk, request.user)))
+
+    def update(self, request, pk=None):
+        meta = get_upload(pk, request.user)
+        # El cuerpo se copia por bloques a disco sin pasar por los parsers
+        return Response(write_chunk(meta, request.META.get('HTTP_CONTENT_RANGE'), request.stream))
+
+    def destroy(self, request, pk=None):
+        delete_upload(get_upload(pk, request.user))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        return Response(finalize_upload(get_upload(pk, request.user), request.data.get('sha256')))
@@ -7,6 +7,7 @@ from api.models import User
 from api.serializers.user import (
     UserSerializer, UserCreateSerializer, UserUpdateSerializer, GroupSerializer
 )
+from api.functions.metrics import SerializationTimingMixin
 
 
 class GroupViewSet(viewsets.ReadOnlyModelViewSet):
@@ -27,7 +28,7 @@ class GroupViewSet(viewsets.ReadOnlyModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SerializationTimingMixin, viewsets.ModelViewSet):
     """
     ViewSet para gestión completa de usuarios.
     Incluye creación con Person y perfiles específicos.
@@ -2,44 +2,134 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, models
+from django.utils.cache import patch_cache_control
 from api.models import EducationalInstitution, Vacancy, Phase, Modality, Level, CurricularArea
 from api.serializers.vacancy import (
     EducationalInstitutionSerializer,
-    VacancySerializer,
-    VacancyBulkCreateSerializer
+    VacancySerializer
 )
+from api.db_router import use_primary
 from api.functions.pagination import StandardResultsSetPagination
-import pandas as pd
-import io
+from api.functions.negotiation import FileActionNegotiationMixin
+from api.functions.cache import make_cache_key, make_etag, etag_matches
+from api.functions.excel_templates import template_response
+from api.functions.export import VACANCY_EXPORT_COLUMNS, iter_vacancy_rows, stream_csv, write_xlsx
+from api.functions.streaming import file_response, streaming_response
+from api.functions.metrics import SerializationTimingMixin
+from api.functions.conditional import ConditionalListMixin
+from api.functions.versions import versions_of
+from api.functions.vacancy_import import import_vacancies, validate_sheet, write_rows
+from api.functions.uploads import UploadError, upload_path
+from api.functions.import_reports import create_report
+from api.views.import_report import report_summary
+from openpyxl.utils.exceptions import InvalidFileException
+from zipfile import BadZipFile
+import os
+import tempfile
 
 
-class EducationalInstitutionViewSet(viewsets.ModelViewSet):
+class EducationalInstitutionViewSet(SerializationTimingMixin, viewsets.ModelViewSet):
     queryset = EducationalInstitution.objects.all()
     serializer_class = EducationalInstitutionSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
     pagination_class = StandardResultsSetPagination
 
 
-class VacancyViewSet(viewsets.ModelViewSet):
+class VacancyViewSet(ConditionalListMixin, SerializationTimingMixin, FileActionNegotiationMixin, viewsets.ModelViewSet):
     queryset = Vacancy.objects.all()
     serializer_class = VacancySerializer
+    version_models = (Vacancy, EducationalInstitution, Phase, Modality, Level, CurricularArea)
     permission_classes = [IsAuthenticated, IsAdminUser]
     pagination_class = StandardResultsSetPagination
+    # En la exportación ?format= elige csv/xlsx, no el renderer de DRF
+    file_actions = ('export',)
     
     def get_queryset(self):
         queryset = Vacancy.objects.all().select_related(
-            'phase', 'educational_institution', 'curricular_area',
-            'educational_institution__modality', 'educational_institution__level'
+            'phase', 'educational_institution', 'curricular_area', 'modality', 'level'
         )
         
-        # Filtrar por fase si se proporciona
-        phase_id = self.request.query_params.get('phase', None)
-        if phase_id:
-            queryset = queryset.filter(phase_id=phase_id)
+        # Filtros sobre columnas propias de la vacante (índice compuesto fase/modalidad/nivel/área)
+        for param in ('phase', 'modality', 'level', 'curricular_area'):
+            value = self.request.query_params.get(param, None)
+            if value:
+                queryset = queryset.filter(**{f'{param}_id': value})
         
         return queryset
     
+    @action(detail=False, methods=['get'], url_path='for-me', permission_classes=[IsAuthenticated])
+    def for_me(self, request):
+        """
+        Vacantes activas que corresponden al perfil del docente autenticado
+        (modalidad, nivel y área curricular; también las vacantes sin área).
+        
+        La respuesta se cachea por grupo (fase, modalidad, nivel, área): todos los
+        docentes con el mismo perfil comparten la misma entrada. Soporta GET
+        condicional con If-None-Match.
+        """
+        profile = getattr(request.user, 'teacher_profile', None)
+        if profile is None:
+            return Response(
+                {'error': 'El usuario no tiene un perfil de docente'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        phase_id = request.query_params.get('phase')
+        if phase_id:
+            try:
+                phase_id = int(phase_id)
+            except ValueError:
+                return Response({'error': 'ID de fase no válido'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            phase_id = Phase.objects.filter(is_active=True).values_list('id', flat=True).first()
+        if not phase_id:
+            return Response({'count': 0, 'next': None, 'previous': None, 'results': []})
+        
+        queryset = self.get_for_me_queryset(phase_id, profile)
+        
+        # Versión de los modelos serializados: cambia al crear, editar, desactivar o
+        # mover vacantes, sin consultar la tabla de vacantes
+        bucket = (phase_id, profile.modality_id, profile.level_id, profile.curricular_area_id)
+        page_params = (request.query_params.get('page', 1), request.query_params.get('page_size', ''))
+        cache_key = make_cache_key(
+            'vacancies-for-me', *bucket, *page_params, *versions_of(*self.version_models)
+        )
+        etag = make_etag(cache_key)
+        
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = cache.get(cache_key)
+            if data is None:
+                # Del primario: filas de una réplica atrasada quedarían cacheadas con la versión nueva
+                with use_primary():
+                    page = self.paginate_queryset(queryset.select_related(
+                        'phase', 'educational_institution', 'curricular_area', 'modality', 'level'
+                    ))
+                    serializer = self.get_serializer(page, many=True)
+                    data = self.get_paginated_response(serializer.data).data
+                cache.set(cache_key, data, settings.VACANCY_FEED_CACHE_TIMEOUT)
+            response = Response(data)
+        
+        response['ETag'] = etag
+        # Contenido compartido entre docentes pero tras autenticación: revalidar siempre
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    def get_for_me_queryset(self, phase_id, profile):
+        return Vacancy.objects.filter(
+            phase_id=phase_id,
+            is_active=True,
+            modality_id=profile.modality_id,
+            level_id=profile.level_id,
+        ).filter(
+            models.Q(curricular_area_id=profile.curricular_area_id) |
+            models.Q(curricular_area__isnull=True)
+        ).order_by('educational_institution__code', 'nexus_code')
+    
     @action(detail=False, methods=['post'], url_path='preview')
     def preview(self, request):
         """
@@ -47,8 +137,16 @@ class VacancyViewSet(viewsets.ModelViewSet):
         """
         try:
             file = request.FILES.get('file')
+            filename = file.name if file else ''
             phase_id = request.data.get('phase_id')
             
+            # Archivo subido por partes (POST /api/uploads/)
+            if not file and request.data.get('upload_id'):
+                try:
+                    file, filename = upload_path(request.data.get('upload_id'), request.user)
+                except UploadError as e:
+                    return Response({'error': str(e)}, status=e.status)
+            
             if not file:
                 return Response(
                     {'error': 'No se proporcionó ningún archivo'},
@@ -61,79 +159,28 @@ class VacancyViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Leer archivo Excel
-            df = pd.read_excel(file)
-            
-            # Validar columnas requeridas
-            required_columns = ['ie_code', 'ie_name', 'modality', 'level', 'nexus_code', 'position', 'vacancy_type', 'vacancy_reason']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
+            try:
+                phase_id = int(phase_id)
+            except (TypeError, ValueError):
                 return Response(
-                    {'error': f'Faltan columnas requeridas: {", ".join(missing_columns)}'},
+                    {'error': 'ID de fase no válido'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Validar cada fila
-            preview_data = []
-            errors = []
+            # Mismas validaciones que la importación, sin guardar
+            result, _ = validate_sheet(file, filename, phase_id)
+            if result['error']:
+                return Response({'error': result['error']}, status=status.HTTP_400_BAD_REQUEST)
+            rows = result['rows']
             
-            for idx, row in df.iterrows():
-                row_num = idx + 2  # +2 porque Excel empieza en 1 y tiene header
-                row_errors = []
-                
-                # Validar modalidad
-                modality = Modality.objects.filter(
-                    models.Q(abbreviature__iexact=str(row['modality'])) |
-                    models.Q(name__iexact=str(row['modality']))
-                ).first()
-                if not modality:
-                    row_errors.append(f"Modalidad '{row['modality']}' no encontrada")
-                
-                # Validar nivel
-                level = Level.objects.filter(name__iexact=str(row['level'])).first()
-                if not level:
-                    row_errors.append(f"Nivel '{row['level']}' no encontrado")
-                
-                # Validar área curricular si existe
-                area_name = row.get('curricular_area')
-                curricular_area_valid = True
-                if area_name and not (isinstance(area_name, float) and pd.isna(area_name)):
-                    area = CurricularArea.objects.filter(name__iexact=str(area_name)).first()
-                    if not area:
-                        row_errors.append(f"Área curricular '{area_name}' no encontrada")
-                        curricular_area_valid = False
-                
-                preview_data.append({
-                    'row': row_num,
-                    'ie_code': str(row['ie_code']) if not pd.isna(row['ie_code']) else '',
-                    'ie_name': str(row['ie_name']) if not pd.isna(row['ie_name']) else '',
-                    'modality': str(row['modality']) if not pd.isna(row['modality']) else '',
-                    'level': str(row['level']) if not pd.isna(row['level']) else '',
-                    'nexus_code': str(row['nexus_code']) if not pd.isna(row['nexus_code']) else '',
-                    'position': str(row['position']) if not pd.isna(row['position']) else '',
-                    'vacancy_type': str(row['vacancy_type']) if not pd.isna(row['vacancy_type']) else '',
-                    'vacancy_reason': str(row['vacancy_reason']) if not pd.isna(row['vacancy_reason']) else '',
-                    'curricular_area': str(area_name) if area_name and not pd.isna(area_name) else None,
-                    'errors': row_errors,
-                    'valid': len(row_errors) == 0
-                })
-                
-                if row_errors:
-                    errors.append({
-                        'row': row_num,
-                        'errors': row_errors
-                    })
-            
-            valid_count = sum(1 for item in preview_data if item['valid'])
-            invalid_count = len(preview_data) - valid_count
+            # Las filas quedan en el reporte: la respuesta solo lleva el resumen
+            report = create_report(request.user, 'PREVIEW', rows, filename=filename, phase_id=phase_id, dry_run=True)
             
             return Response({
-                'total': len(preview_data),
-                'valid_count': valid_count,
-                'invalid_count': invalid_count,
-                'preview': preview_data,
-                'errors': errors
+                'total': report.total,
+                'valid_count': report.valid_count,
+                'invalid_count': report.invalid_count,
+                **report_summary(report, request),
             })
             
         except Exception as e:
@@ -159,8 +206,16 @@ class VacancyViewSet(viewsets.ModelViewSet):
         """
         try:
             file = request.FILES.get('file')
+            filename = file.name if file else ''
             phase_id = request.data.get('phase_id')
             
+            # Archivo subido por partes (POST /api/uploads/)
+            if not file and request.data.get('upload_id'):
+                try:
+                    file, filename = upload_path(request.data.get('upload_id'), request.user)
+                except UploadError as e:
+                    return Response({'error': str(e)}, status=e.status)
+            
             if not file:
                 return Response(
                     {'error': 'No se proporcionó ningún archivo'},
@@ -182,39 +237,29 @@ class VacancyViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Leer archivo Excel
-            df = pd.read_excel(file)
-            
-            # Validar columnas requeridas
-            required_columns = ['ie_code', 'ie_name', 'modality', 'level', 'nexus_code', 'position', 'vacancy_type', 'vacancy_reason']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
+            # Mismas validaciones que la importación: las filas válidas se guardan
+            # en una transacción y las demás quedan en el reporte con sus errores
+            result, valid_rows = validate_sheet(file, filename, phase.id)
+            if result['error']:
+                return Response({'error': result['error']}, status=status.HTTP_400_BAD_REQUEST)
+            if not result['rows']:
                 return Response(
-                    {'error': f'Faltan columnas requeridas: {", ".join(missing_columns)}'},
+                    {'error': 'Debe proporcionar al menos una vacante'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            _, created_count = write_rows(valid_rows)
             
-            # Convertir DataFrame a lista de diccionarios
-            vacancies_data = df.to_dict('records')
-            
-            # Usar el serializer de bulk create
-            serializer = VacancyBulkCreateSerializer(data={
-                'phase_id': phase_id,
-                'vacancies': vacancies_data
-            })
-            
-            if serializer.is_valid():
-                result = serializer.save()
-                
-                return Response({
-                    'message': f'Se crearon {result["created_count"]} vacantes exitosamente',
-                    'created_count': result['created_count'],
-                    'error_count': result['error_count'],
-                    'errors': result['errors']
-                }, status=status.HTTP_201_CREATED)
+            report = create_report(
+                request.user, 'BULK_UPLOAD', result['rows'],
+                filename=filename, phase_id=phase.id, created_count=created_count
+            )
             
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'message': f'Se crearon {created_count} vacantes exitosamente',
+                'created_count': created_count,
+                'error_count': report.invalid_count,
+                **report_summary(report, request),
+            }, status=status.HTTP_201_CREATED)
             
         except Exception as e:
             return Response(
@@ -222,43 +267,140 @@ class VacancyViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_sheets(self, request):
+        """
+        Importar vacantes desde uno o varios libros Excel, leyendo todas sus hojas
+        (p. ej. una hoja por modalidad)
+        
+        POST /api/vacancies/import/  (multipart)
+        - files: uno o más archivos .xlsx (también se acepta "file")
+        - upload_id: uno o más archivos subidos por partes (POST /api/uploads/)
+        - phase_id: fase de las filas que no traen la columna phase_id
+        - dry_run: "true" para solo validar
+        
+        Las hojas se validan en paralelo; las filas válidas de todas ellas se
+        guardan en una sola transacción. Los códigos Nexus repetidos entre hojas
+        se reportan como error (se conserva la primera aparición).
+        """
+        files = request.FILES.getlist('files') or request.FILES.getlist('file')
+        upload_ids = (
+            request.data.getlist('upload_id') if hasattr(request.data, 'getlist') else request.data.get('upload_id')
+        ) or []
+        try:
+            uploaded = [
+                upload_path(upload_id, request.user)
+                for upload_id in ([upload_ids] if isinstance(upload_ids, str) else upload_ids)
+            ]
+        except UploadError as e:
+            return Response({'error': str(e)}, status=e.status)
+        if not files and not uploaded:
+            return Response(
+                {'error': 'No se proporcionó ningún archivo'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        phase_id = request.data.get('phase_id') or None
+        if phase_id is not None:
+            try:
+                phase_id = int(phase_id)
+            except ValueError:
+                return Response({'error': 'ID de fase no válido'}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+        
+        with tempfile.TemporaryDirectory() as directory:
+            sources = []
+            for index, upload in enumerate(files):
+                # Los procesos del pool leen el archivo desde disco
+                path = os.path.join(directory, f'{index}.xlsx')
+                with open(path, 'wb') as handle:
+                    for chunk in upload.chunks():
+                        handle.write(chunk)
+                sources.append((path, upload.name))
+            sources.extend(uploaded)
+            try:
+                result = import_vacancies(sources, phase_id, dry_run=dry_run)
+            except (InvalidFileException, BadZipFile, ValueError) as e:
+                return Response(
+                    {'error': f'Error leyendo el archivo: {str(e)}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            except IntegrityError as e:
+                return Response(
+                    {'error': f'No se guardó ninguna vacante: {str(e)}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        # Las filas de todas las hojas quedan en el reporte; la respuesta lleva los conteos
+        report = create_report(
+            request.user, 'IMPORT', result.pop('rows'),
+            filename=', '.join(name for _, name in sources), phase_id=phase_id,
+            dry_run=dry_run, created_count=result['created_count']
+        )
+        result.update(report_summary(report, request))
+        if not dry_run:
+            result['message'] = f'Se crearon {result["created_count"]} vacantes exitosamente'
+        return Response(result, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['get'], url_path='export-template')
     def export_template(self, request):
         """
         Descargar plantilla Excel para subir vacantes
         """
-        from django.http import HttpResponse
+        return template_response(request, 'vacancies')
+    
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Exportar las vacantes de una fase
+        
+        GET /api/vacancies/export/?phase=<id>&format=csv|xlsx
+        
+        El CSV se envía en streaming a medida que se leen las filas; el XLSX se
+        genera en modo write-only sobre un archivo temporal. En ambos casos la
+        memoria usada es constante respecto al número de vacantes.
+        """
+        phase_id = request.query_params.get('phase')
+        export_format = request.query_params.get('format', 'csv').lower()
+        
+        if not phase_id:
+            return Response(
+                {'error': 'No se proporcionó el ID de la fase'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            phase_id = int(phase_id)
+        except ValueError:
+            return Response({'error': 'ID de fase no válido'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Crear DataFrame con la estructura
-        df = pd.DataFrame(columns=[
-            'ie_code', 'ie_name', 'modality', 'level', 'nexus_code',
-            'position', 'vacancy_type', 'vacancy_reason', 'curricular_area'
-        ])
+        if export_format not in ('csv', 'xlsx'):
+            return Response(
+                {'error': 'Formato no soportado. Use csv o xlsx'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Agregar una fila de ejemplo
-        df.loc[0] = [
-            '0123456',
-            'I.E. María Auxiliadora',
-            'EBR',
-            'Secundaria',
-            'NEX001',
-            'DOCENTE',
-            'ORGANICA',
-            'LICENCIA',
-            'Matemática'
-        ]
+        if not Phase.objects.filter(id=phase_id).exists():
+            return Response(
+                {'error': 'La fase especificada no existe'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        # Crear archivo Excel en memoria
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Vacantes')
+        rows = iter_vacancy_rows(phase_id)
+        filename = f'vacantes_fase_{phase_id}.{export_format}'
         
-        output.seek(0)
+        if export_format == 'csv':
+            response = streaming_response(
+                request,
+                stream_csv(rows, VACANCY_EXPORT_COLUMNS),
+                content_type='text/csv; charset=utf-8'
+            )
+            response['Content-Disposition'] = f'attachment; filename={filename}'
+            return response
         
-        response = HttpResponse(
-            output.read(),
+        return file_response(
+            request,
+            write_xlsx(rows, VACANCY_EXPORT_COLUMNS, 'Vacantes'),
+            as_attachment=True,
+            filename=filename,
             content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
         )
-        response['Content-Disposition'] = 'attachment; filename=plantilla_vacantes.xlsx'
-        
-        return response
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+from importlib.util import find_spec
 from dotenv import load_dotenv
 import dj_database_url
 
@@ -48,11 +49,23 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
 ]
 
+# JSON con orjson; MessagePack para consumidores internos si está instalado el
+# paquete msgpack; la vista navegable de DRF solo con DEBUG
+API_RENDERER_CLASSES = ['api.functions.renderers.ORJSONRenderer']
+API_PARSER_CLASSES = [
+    'api.functions.renderers.ORJSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+if find_spec('msgpack') is not None:
+    API_RENDERER_CLASSES.append('api.functions.renderers.MessagePackRenderer')
+    API_PARSER_CLASSES.append('api.functions.renderers.MessagePackParser')
+if DEBUG:
+    API_RENDERER_CLASSES.append('rest_framework.renderers.BrowsableAPIRenderer')  # Esto habilita la vista web
+
 REST_FRAMEWORK = {
-    'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',  # Esto habilita la vista web
-    ],
+    'DEFAULT_RENDERER_CLASSES': API_RENDERER_CLASSES,
+    'DEFAULT_PARSER_CLASSES': API_PARSER_CLASSES,
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
@@ -66,6 +79,9 @@ REST_FRAMEWORK = {
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Para servir archivos estáticos en producción
+    'api.middleware.CompressionMiddleware',
+    'api.middleware.RequestMetricsMiddleware',
+    'api.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -98,13 +114,16 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# Usar DATABASE_URL de Render o configuración local
+# Usar DATABASE_URL de Render o configuración local.
+# Bajo ASGI cada petición usa su propia conexión: conviene DATABASE_CONN_MAX_AGE=0
+# (o un pooler como PgBouncer) para no acumular conexiones abiertas.
+DATABASE_CONN_MAX_AGE = int(os.environ.get('DATABASE_CONN_MAX_AGE', '600'))
 database_url = os.environ.get('DATABASE_URL', '')
 if database_url and database_url.strip():
     DATABASES = {
         'default': dj_database_url.config(
             default=database_url,
-            conn_max_age=600,
+            conn_max_age=DATABASE_CONN_MAX_AGE,
             conn_health_checks=True,
         )
     }
@@ -120,6 +139,64 @@ else:
         }
     }
 
+# Réplica de solo lectura opcional: las peticiones GET/HEAD/OPTIONS leen de ella
+# (ver api/db_router.py). Sin DATABASE_REPLICA_URL todo va a 'default'.
+database_replica_url = os.environ.get('DATABASE_REPLICA_URL', '')
+if database_replica_url and database_replica_url.strip():
+    DATABASES['replica'] = dj_database_url.config(
+        default=database_replica_url,
+        conn_max_age=DATABASE_CONN_MAX_AGE,
+        conn_health_checks=True,
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['api.db_router.ReplicaRouter']
+
+# Segundos que un cliente sigue leyendo del primario después de escribir
+READ_REPLICA_STICKY_SECONDS = int(os.environ.get('READ_REPLICA_STICKY_SECONDS', '10'))
+# Cookie de lectura del primario con SameSite=None; Secure (el frontend está en otro
+# sitio y solo la envía así). Sin HTTPS (desarrollo) se usa SameSite=Lax
+READ_REPLICA_COOKIE_SECURE = os.environ.get('READ_REPLICA_COOKIE_SECURE', str(not DEBUG)) == 'True'
+
+
+# Cache
+# Con REDIS_URL la caché se comparte entre workers; si no, memoria local por proceso
+redis_url = os.environ.get('REDIS_URL', '')
+if redis_url and redis_url.strip():
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': redis_url,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Versiones por modelo (api/functions/versions.py): con la caché compartida se
+# guardan sin expiración; con caché local cada worker las relee de la tabla
+# cada pocos segundos para ver los cambios hechos en otros workers
+MODEL_VERSION_CACHE_TIMEOUT = None if redis_url.strip() else int(os.environ.get('MODEL_VERSION_CACHE_TIMEOUT', '2'))
+
+# Segundos que se conservan los listados públicos cacheados (prelaciones); la
+# clave incluye la versión de los modelos, así que un cambio no espera a que expire
+LIST_CACHE_TIMEOUT = int(os.environ.get('LIST_CACHE_TIMEOUT', '600'))
+
+# Recálculo single-flight (api.functions.cache.get_or_compute): duración máxima
+# del candado, espera máxima de las demás peticiones y frecuencia de sondeo (segundos)
+CACHE_LOCK_TIMEOUT = int(os.environ.get('CACHE_LOCK_TIMEOUT', '30'))
+CACHE_LOCK_WAIT = float(os.environ.get('CACHE_LOCK_WAIT', '5'))
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+# Segundos que se conserva en caché cada grupo del listado de vacantes por docente
+VACANCY_FEED_CACHE_TIMEOUT = int(os.environ.get('VACANCY_FEED_CACHE_TIMEOUT', '300'))
+
+# Segundos que se conserva el alcance (modalidades/niveles/áreas) de cada evaluador
+EVALUATOR_SCOPE_CACHE_TIMEOUT = int(os.environ.get('EVALUATOR_SCOPE_CACHE_TIMEOUT', '3600'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -158,14 +235,89 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Archivos con huella de 12 caracteres (los de collectstatic): WhiteNoise los
+# sirve con caché de un año
+WHITENOISE_IMMUTABLE_FILE_TEST = r'\.[0-9a-f]{12}\.\w+$'
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Árbol de prelaciones exportado (export_prelation_tree). Va fuera de STATIC_ROOT:
+# WhiteNoise indexa ese directorio al arrancar y fallaría con los archivos que
+# una exportación posterior reemplace; estos los sirve prelation_tree_file
+PRELATION_TREE_ROOT = os.path.join(MEDIA_ROOT, 'prelations')
+PRELATION_TREE_URL = '/prelations/'
+
 # Mandatory documents
 MANDATORY_DOCUMENTS_URL = '/mandatory_documents/'
 MANDATORY_DOCUMENTS_ROOT = os.path.join(BASE_DIR, 'mandatory_documents')
+# Segundos de caché en clientes/CDN para las descargas de documentos (se revalidan por ETag)
+MANDATORY_DOCUMENTS_MAX_AGE = int(os.environ.get('MANDATORY_DOCUMENTS_MAX_AGE', '3600'))
+# Prefijo interno de nginx para delegar el envío con X-Accel-Redirect (vacío = servir desde Django)
+MANDATORY_DOCUMENTS_ACCEL_REDIRECT = os.environ.get('MANDATORY_DOCUMENTS_ACCEL_REDIRECT', '')
+# Directorio donde se guarda el ZIP con huella de los documentos obligatorios
+MANDATORY_DOCUMENTS_BUNDLE_ROOT = os.path.join(MEDIA_ROOT, 'bundles')
+
+# Filas leídas por bloque del cursor al exportar vacantes
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '2000'))
+
+# Segundos que se conservan en caché las plantillas Excel (la clave incluye la versión de catálogos)
+EXCEL_TEMPLATE_CACHE_TIMEOUT = int(os.environ.get('EXCEL_TEMPLATE_CACHE_TIMEOUT', '86400'))
+
+# Reportes PDF: directorio de salida, procesos de renderizado y tiempos de espera (segundos)
+REPORTS_ROOT = os.path.join(MEDIA_ROOT, 'reports')
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', '2'))
+REPORT_RENDER_TIMEOUT = int(os.environ.get('REPORT_RENDER_TIMEOUT', '600'))
+REPORT_ERROR_TIMEOUT = int(os.environ.get('REPORT_ERROR_TIMEOUT', '60'))
+
+# Server-sent events de adjudicación: sondeo entre workers, duración máxima de cada conexión
+# (el navegador reconecta con Last-Event-ID), reintento sugerido y cambios por consulta
+SSE_POLL_INTERVAL = float(os.environ.get('SSE_POLL_INTERVAL', '2'))
+SSE_MAX_DURATION = int(os.environ.get('SSE_MAX_DURATION', '300'))
+SSE_RETRY_MS = int(os.environ.get('SSE_RETRY_MS', '3000'))
+SSE_BATCH_SIZE = int(os.environ.get('SSE_BATCH_SIZE', '500'))
+# Ventana (segundos) que se vuelve a leer detrás del cursor: una transacción que confirma
+# tarde deja filas con un updated_at anterior al último evento enviado
+SSE_OVERLAP_SECONDS = float(os.environ.get('SSE_OVERLAP_SECONDS', '10'))
+
+# Importación de vacantes por hojas: procesos que leen las hojas en paralelo
+# (1 = sin pool) y filas por consulta/inserción
+IMPORT_WORKERS = int(os.environ.get('IMPORT_WORKERS', str(min(4, os.cpu_count() or 1))))
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '1000'))
+
+# Subidas por partes (api/functions/uploads.py): directorio, tamaño máximo del
+# archivo, tamaño sugerido y máximo de cada parte (bytes) y vida de una subida (segundos)
+UPLOAD_ROOT = os.path.join(MEDIA_ROOT, 'uploads')
+UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', str(100 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', str(1024 * 1024)))
+UPLOAD_MAX_CHUNK_SIZE = int(os.environ.get('UPLOAD_MAX_CHUNK_SIZE', str(8 * 1024 * 1024)))
+UPLOAD_EXPIRATION = int(os.environ.get('UPLOAD_EXPIRATION', '86400'))
+
+# Reportes de importación (api/functions/import_reports.py): vida de un reporte
+# (segundos) y errores que se incluyen en la respuesta de la carga
+IMPORT_REPORT_EXPIRATION = int(os.environ.get('IMPORT_REPORT_EXPIRATION', str(7 * 86400)))
+IMPORT_REPORT_SAMPLE_SIZE = int(os.environ.get('IMPORT_REPORT_SAMPLE_SIZE', '20'))
+
+# Tiempo máximo en caché del cronograma del proceso de contratación (además
+# expira en el siguiente cambio de fecha de sus etapas)
+TIMELINE_CACHE_TIMEOUT = int(os.environ.get('TIMELINE_CACHE_TIMEOUT', '3600'))
+
+# Métricas por petición (consultas SQL, tiempos, tamaño) en /api/_metrics/ y cabecera
+# Server-Timing. REQUEST_METRICS_SLOW_MS vacío desactiva el registro de peticiones lentas.
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS_ENABLED', 'True') == 'True'
+# Server-Timing se envía a los usuarios staff; a todos solo con esta opción (por defecto, en DEBUG)
+REQUEST_METRICS_SERVER_TIMING = os.environ.get('REQUEST_METRICS_SERVER_TIMING', str(DEBUG)) == 'True'
+REQUEST_METRICS_SLOW_MS = os.environ.get('REQUEST_METRICS_SLOW_MS', '1000')
+REQUEST_METRICS_SLOW_MS = int(REQUEST_METRICS_SLOW_MS) if REQUEST_METRICS_SLOW_MS else None
+REQUEST_METRICS_SLOW_SQL_LIMIT = int(os.environ.get('REQUEST_METRICS_SLOW_SQL_LIMIT', '10'))
+# Sentencias SQL distintas que se guardan por petición para el registro de peticiones lentas
+REQUEST_METRICS_MAX_STATEMENTS = int(os.environ.get('REQUEST_METRICS_MAX_STATEMENTS', '200'))
+
+# Compresión (brotli o gzip) de respuestas de la API a partir de este tamaño en bytes
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_CONTENT_TYPES = ('application/json', 'application/msgpack')
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -15,13 +15,20 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from api.views.prelation import prelation_tree_file
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('api.urls')),
+    # Archivos del árbol de prelaciones exportado (ver api.functions.prelation_tree)
+    re_path(
+        rf'^{settings.PRELATION_TREE_URL.lstrip("/")}(?P<filename>[^/]+)$',
+        prelation_tree_file, name='prelation-tree-file'
+    ),
 ]
 
 # Servir archivos de mandatory_documents en desarrollo
@@ -13,4 +13,7 @@ python manage.py collectstatic --no-input
 echo "Running migrations..."
 python manage.py migrate
 
+echo "Exporting prelation tree..."
+python manage.py export_prelation_tree
+
 echo "Build completed successfully!"